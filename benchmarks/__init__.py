@@ -0,0 +1 @@
+"""Database benchmarks (run through ``bench.py``)."""
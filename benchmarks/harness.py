@@ -0,0 +1,286 @@
+"""
+Benchmark runner, statistics and output.
+
+A ``Driver`` knows one backend: how to connect, how to prepare a scenario
+(e.g. with or without indexes) and which operations make up one round for
+a data size ``n``. ``run`` executes ``warmup`` unrecorded rounds and then
+``repeats`` recorded ones per (scenario, size), timing every operation
+separately (``Driver.observe`` may add measurements of its own);
+``summarize`` turns the samples into one row per (backend, scenario, n, op)
+with mean, spread and tail percentiles.
+
+Optional client-side probes (``Config``), reported next to the latency:
+
+    cpu           ``cpu_ms`` – process CPU time of the op; ``ms - cpu_ms`` is
+                  roughly time spent waiting for the server
+    rss           ``rss_peak_mb`` – process peak RSS after the op (a
+                  high-water mark: it only grows, look at where it jumps)
+    tracemalloc   ``alloc_peak_kb`` / ``alloc_retained_kb`` – Python heap
+                  peak during the op and what it still holds afterwards
+    profile_dir   one cProfile dump per (backend, scenario) aggregated over
+                  the recorded ops: ``<dir>/<backend>-<scenario>.prof``
+
+tracemalloc and cProfile slow Python code down several times – compare
+latencies only between runs with the same probes. cProfile sees the
+calling thread only (not the fan-out / pool threads).
+"""
+from __future__ import annotations
+
+import cProfile
+import csv
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence, TextIO
+
+Op = tuple[str, Callable[[], Any]]
+
+
+@dataclass
+class Sample:
+    db: str
+    scenario: str
+    n: int
+    repeat: int
+    op: str
+    ms: float
+    extra: dict[str, float] = field(default_factory=dict)
+
+
+class Driver:
+    """One backend under test. Subclasses set ``name``/``scenarios`` and implement the hooks."""
+
+    name = ""
+    scenarios: tuple[str, ...] = ("default",)
+
+    def connect(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def setup(self, scenario: str) -> None:
+        """Called once per scenario, before any round."""
+
+    def round(self, n: int) -> Sequence[Op]:
+        """
+        Operations of one round for data size ``n``, executed and timed in order
+        (later ones may depend on earlier ones). Input data is built here, so
+        generating it is not part of the measured time.
+        """
+        raise NotImplementedError
+
+    @contextmanager
+    def observe(self, op: str) -> Iterator[dict[str, float]]:
+        """
+        Extra per-op measurements (round trips, CPU time...): fill the yielded
+        dict after the op has run. Reported as means next to the latency.
+        """
+        yield {}
+
+
+@dataclass
+class Config:
+    sizes: Sequence[int]
+    repeats: int = 10
+    warmup: int = 1
+    scenarios: Optional[Sequence[str]] = None    # None = wszystkie scenariusze drivera
+    ops: Optional[Sequence[str]] = None          # None = wszystkie operacje rundy
+    cpu: bool = False
+    rss: bool = False
+    tracemalloc: bool = False
+    profile_dir: Optional[str] = None
+
+
+def _peak_rss_mb() -> float:
+    import resource    # tylko Unix – import dopiero przy --rss
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: bajty
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@contextmanager
+def _probe(config: Config, profiler: Optional[cProfile.Profile]) -> Iterator[dict[str, float]]:
+    """Client-side measurements around one op; the op's own timing runs inside."""
+    out: dict[str, float] = {}
+    if config.tracemalloc:
+        tracemalloc.reset_peak()
+        heap = tracemalloc.get_traced_memory()[0]
+    cpu = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield out
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if config.cpu:
+            out["cpu_ms"] = (time.process_time() - cpu) * 1000.0
+        if config.tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            out["alloc_peak_kb"] = (peak - heap) / 1024
+            out["alloc_retained_kb"] = (current - heap) / 1024
+        if config.rss:
+            out["rss_peak_mb"] = _peak_rss_mb()
+
+
+def log(message: str) -> None:
+    """Progress goes to stderr – stdout is for results (``python bench.py > results.csv``)."""
+    print(message, file=sys.stderr, flush=True)
+
+
+def run(driver: Driver, config: Config) -> list[Sample]:
+    samples: list[Sample] = []
+    scenarios = [s for s in driver.scenarios if config.scenarios is None or s in config.scenarios]
+    started_tracemalloc = config.tracemalloc and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    driver.connect()
+    try:
+        for scenario in scenarios:
+            driver.setup(scenario)
+            profiler = cProfile.Profile() if config.profile_dir else None
+            for n in config.sizes:
+                log(f"{driver.name}/{scenario}/n={n}: {config.warmup} warmup + {config.repeats} rounds")
+                for repeat in range(-config.warmup + 1, config.repeats + 1):
+                    for op, fn in driver.round(n):
+                        # repeat <= 0: rozgrzewka (cache, plany zapytań, połączenia) – nie liczymy
+                        recorded = repeat > 0 and (config.ops is None or op in config.ops)
+                        with driver.observe(op) as extra, _probe(config, profiler if recorded else None) as probed:
+                            start = time.perf_counter()
+                            fn()
+                            ms = (time.perf_counter() - start) * 1000.0
+                        if recorded:
+                            samples.append(Sample(driver.name, scenario, n, repeat, op, ms, {**extra, **probed}))
+            if profiler is not None:
+                os.makedirs(config.profile_dir, exist_ok=True)
+                path = os.path.join(config.profile_dir, f"{driver.name}-{scenario}.prof".replace(":", "_"))
+                profiler.dump_stats(path)
+                log(f"{driver.name}/{scenario}: cProfile -> {path} (python -m pstats {path})")
+    finally:
+        driver.close()
+        if started_tracemalloc:
+            tracemalloc.stop()
+    return samples
+
+
+# ---- statystyki ----
+# wartości krytyczne t-Studenta (dwustronnie, 95%) dla df = 1..30; powyżej – rozkład normalny
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """``q``-th percentile (0..100) of sorted data, linear interpolation between ranks."""
+    if not ordered:
+        return math.nan
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def ci95(values: Sequence[float]) -> float:
+    """Half-width of the 95% confidence interval of the mean."""
+    if len(values) < 2:
+        return math.nan
+    df = len(values) - 1
+    t = _T95[df - 1] if df <= len(_T95) else 1.96
+    return t * statistics.stdev(values) / math.sqrt(len(values))
+
+
+@dataclass
+class Summary:
+    db: str
+    scenario: str
+    n: int
+    op: str
+    avg_ms: float
+    samples: int
+    stdev_ms: float
+    ci95_ms: float
+    min_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def summarize(samples: Iterable[Sample]) -> list[Summary]:
+    """One row per (db, scenario, n, op), in first-seen order."""
+    groups: dict[tuple, list[Sample]] = {}
+    for s in samples:
+        groups.setdefault((s.db, s.scenario, s.n, s.op), []).append(s)
+    out = []
+    for (db, scenario, n, op), group in groups.items():
+        ms = [s.ms for s in group]
+        ordered = sorted(ms)
+        extra: dict[str, list[float]] = {}
+        for s in group:
+            for key, value in s.extra.items():
+                extra.setdefault(key, []).append(value)
+        out.append(Summary(
+            db, scenario, n, op,
+            avg_ms=statistics.fmean(ms),
+            samples=len(ms),
+            stdev_ms=statistics.stdev(ms) if len(ms) > 1 else 0.0,
+            ci95_ms=ci95(ms),
+            min_ms=ordered[0],
+            p50_ms=percentile(ordered, 50),
+            p95_ms=percentile(ordered, 95),
+            p99_ms=percentile(ordered, 99),
+            max_ms=ordered[-1],
+            extra={key: statistics.fmean(values) for key, values in extra.items()},
+        ))
+    return out
+
+
+# ---- wyjście ----
+# wiersze: Summary albo inny dataclass z opcjonalnym słownikiem ``extra`` (np. load.LoadResult)
+def _columns(rows: Sequence[Any]) -> list[str]:
+    base = [f.name for f in fields(rows[0]) if f.name != "extra"] if rows else [
+        f.name for f in fields(Summary) if f.name != "extra"]
+    extra: list[str] = []
+    for r in rows:
+        extra += [k for k in getattr(r, "extra", {}) if k not in extra]
+    return base + extra
+
+
+def _round(value: Any) -> Any:
+    return round(value, 3) if isinstance(value, float) and math.isfinite(value) else value
+
+
+def write_csv(rows: Sequence[Any], out: TextIO) -> None:
+    # pierwsze kolumny jak w starym bench.py: db,scenario,n,op,avg_ms
+    columns = _columns(rows)
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    for r in rows:
+        data = asdict(r)
+        data.update(data.pop("extra", {}))
+        writer.writerow(["" if (v := _round(data.get(c))) is None else v for c in columns])
+
+
+def write_json(rows: Sequence[Any], out: TextIO, *, meta: Optional[dict] = None,
+               samples: Optional[Sequence[Sample]] = None) -> None:
+    def row(r: Any) -> dict:
+        data = asdict(r)
+        data.update(data.pop("extra", {}))
+        return {k: (None if isinstance(v, float) and not math.isfinite(v) else _round(v)) for k, v in data.items()}
+    doc: dict[str, Any] = {"meta": meta or {}, "results": [row(r) for r in rows]}
+    if samples is not None:
+        doc["samples"] = [{**{k: v for k, v in asdict(s).items() if k != "extra"}, **s.extra} for s in samples]
+    json.dump(doc, out, indent=2, ensure_ascii=False, default=str)
+    out.write("\n")
+
+
+WRITERS = {"csv": write_csv, "json": write_json}
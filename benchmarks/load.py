@@ -0,0 +1,416 @@
+"""
+Load benchmark: throughput and latency versus the number of concurrent clients.
+
+For every client count of the sweep (1, 4, 16, 64 by default) ``sweep``
+starts that many clients – threads of this process or separate processes –
+each issuing requests back to back (closed loop) for ``warmup + duration``
+seconds; only requests started after the warmup are recorded. Targets:
+
+    raw:<db>     single-row ``get`` / ``bump`` on ``bench_items``, one
+                 connection per client
+    repo:<db>    LeagueRepo calls through ``get_repo()`` – threads share the
+                 process's connection pool (as request threads of one app
+                 process do), processes have a pool each
+    views:<db>   Django pages, through the test client in process or over
+                 HTTP against a running server (``base_url``)
+
+Scenarios: ``read`` and ``write`` – updates of a few hot rows, so clients
+queue on row locks. Views are read-only.
+
+The saturation point of a (target, scenario) series is the first client
+count whose throughput is less than ``gain`` above the best lower count:
+from there on more clients only add latency (or errors – pool timeouts
+are counted, not raised).
+"""
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import random
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterator, Optional, Sequence
+from urllib.parse import quote
+
+from .harness import log, percentile
+
+CLIENTS = (1, 4, 16, 64)
+WORKERS = ("thread", "process")
+RAW_ROWS = 10_000
+HOT_ROWS = 4
+# klienci czekają na siebie przed startem (połączenia, django.setup() w procesach)
+START_TIMEOUT = 120.0
+
+Request = Callable[[], Any]
+
+
+class Workload:
+    """What the clients hit. Subclasses set ``name``/``scenarios`` and implement ``client``."""
+
+    name = ""
+    scenarios: tuple[str, ...] = ("read", "write")
+
+    def connect(self) -> None:
+        """Once per process: in the parent before ``setup``, in every process worker before its client."""
+
+    def close(self) -> None:
+        pass
+
+    def setup(self, scenario: str) -> None:
+        """Once per scenario, in the parent, before any client starts."""
+
+    def teardown(self, scenario: str) -> None:
+        pass
+
+    def client(self, scenario: str, index: int) -> ContextManager[Request]:
+        """One client (context manager): yields the callable that performs one request."""
+        raise NotImplementedError
+
+    def __getstate__(self) -> dict:
+        # do procesów trafiają tylko dane (id, parametry); połączenia (atrybuty z "_") otwierają same
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
+
+
+class RawWorkload(Workload):
+    def __init__(self, db: str, rows: int = RAW_ROWS):
+        self.name = f"raw:{db}"
+        self.db = db
+        self.rows = rows
+
+    def _driver(self):
+        from .drivers import DRIVERS
+
+        driver = DRIVERS[self.db]()
+        driver.connect()
+        return driver
+
+    def setup(self, scenario: str) -> None:
+        driver = self._driver()
+        try:
+            driver.setup("with_index")
+            driver.fill(self.rows)
+        finally:
+            driver.close()
+
+    @contextmanager
+    def client(self, scenario: str, index: int) -> Iterator[Request]:
+        driver = self._driver()
+        rnd = random.Random(index)
+        try:
+            if scenario == "write":
+                yield lambda: driver.bump(rnd.randint(1, HOT_ROWS))
+            else:
+                yield lambda: driver.get(rnd.randint(1, self.rows))
+        finally:
+            driver.close()
+
+
+class RepoWorkload(Workload):
+    def __init__(self, db: str, *, cache: bool = False):
+        self.name = f"repo:{db}"
+        self.db = db
+        self.cache = cache
+        self.hot: list[str] = []
+
+    def connect(self) -> None:
+        from .repo import RepoDriver
+
+        self._driver = RepoDriver(self.db, cache=self.cache)
+        self._driver.connect()
+
+    def close(self) -> None:
+        self._driver.close()
+
+    def setup(self, scenario: str) -> None:
+        self._driver.setup(scenario)
+        self.ids, self.term = self._driver.ids, self._driver.term
+        if scenario == "write":
+            repo = self._driver.repo
+            self.hot = [repo.create_team({"name": f"Load Team {i}", "founded_year": "1900"})["id"]
+                        for i in range(HOT_ROWS)]
+
+    def teardown(self, scenario: str) -> None:
+        for team_id in self.hot:
+            self._driver.repo.delete_team(team_id)
+        self.hot = []
+
+    @contextmanager
+    def client(self, scenario: str, index: int) -> Iterator[Request]:
+        repo, ids, rnd = self._driver.repo, self.ids, random.Random(index)
+        if scenario == "write":
+            def request():
+                repo.update_team(rnd.choice(self.hot), {"name": "Load Team", "founded_year": str(rnd.randint(1850, 2000))})
+            yield request
+            return
+        reads = (
+            lambda: repo.list_matches(limit=50),
+            lambda: repo.get_team(rnd.choice(ids["teams"])),
+            lambda: repo.team_players(rnd.choice(ids["teams"])),
+            lambda: repo.get_match(rnd.choice(ids["matches"])),
+            lambda: repo.get_players_many(rnd.sample(ids["players"], min(20, len(ids["players"])))),
+            lambda: repo.search(self.term),
+        )
+        yield lambda: rnd.choice(reads)()
+
+
+class ViewsWorkload(Workload):
+    scenarios = ("read",)
+
+    def __init__(self, db: str, *, cache: bool = False, base_url: Optional[str] = None):
+        self.name = f"views:{db}"
+        self.db = db
+        self.cache = cache
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+    def connect(self) -> None:
+        # także przy base_url: id do adresów czytamy z tej samej bazy, na której stoi serwer
+        from .repo import RepoDriver
+
+        self._driver = RepoDriver(self.db, cache=self.cache)
+        self._driver.connect()
+
+    def close(self) -> None:
+        self._driver.close()
+
+    def setup(self, scenario: str) -> None:
+        self._driver.setup(scenario)
+        ids = self._driver.ids
+        self.paths = ["/", "/leagues/", "/teams/", "/players/", "/matches/", f"/search/?q={quote(self._driver.term)}"]
+        for entity in ("leagues", "teams", "players", "matches"):
+            self.paths += [f"/{entity}/{i}/" for i in ids[entity][:20]]
+
+    @contextmanager
+    def client(self, scenario: str, index: int) -> Iterator[Request]:
+        rnd = random.Random(index)
+        if self.base_url:
+            def request():
+                # HTTPError (>= 400) liczy się jako błąd
+                with urllib.request.urlopen(self.base_url + rnd.choice(self.paths), timeout=30) as resp:
+                    resp.read()
+        else:
+            from django.test import Client
+
+            http = Client()
+
+            def request():
+                resp = http.get(rnd.choice(self.paths))
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"HTTP {resp.status_code}")
+        yield request
+
+
+TARGETS: dict[str, Callable[..., Workload]] = {
+    "raw": lambda db, **opts: RawWorkload(db),
+    "repo": lambda db, **opts: RepoWorkload(db, cache=opts.get("cache", False)),
+    "views": lambda db, **opts: ViewsWorkload(db, cache=opts.get("cache", False), base_url=opts.get("base_url")),
+}
+
+
+def parse_target(spec: str) -> tuple[str, str]:
+    """``repo:postgres`` -> ``("repo", "postgres")``; a bare backend name means ``repo``."""
+    from .drivers import DRIVERS
+    from .repo import BACKENDS
+
+    kind, _, db = spec.rpartition(":")
+    kind = kind or "repo"
+    available = DRIVERS if kind == "raw" else BACKENDS
+    if kind not in TARGETS or db not in available:
+        raise ValueError(f"nieznany cel: {spec} (raw:<{'|'.join(DRIVERS)}>, "
+                         f"repo:<{'|'.join(BACKENDS)}>, views:<{'|'.join(BACKENDS)}>)")
+    return kind, db
+
+
+def make_workload(spec: str, **opts: Any) -> Workload:
+    kind, db = parse_target(spec)
+    return TARGETS[kind](db, **opts)
+
+
+# ---- pomiar ----
+@dataclass
+class ClientResult:
+    latencies: list[float] = field(default_factory=list)
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+def _loop(request: Request, warmup: float, duration: float) -> ClientResult:
+    result = ClientResult()
+    measure_from = time.perf_counter() + warmup
+    end = measure_from + duration
+    while (start := time.perf_counter()) < end:
+        error = None
+        try:
+            request()
+        except Exception as e:
+            error = type(e).__name__
+        if start < measure_from:
+            continue
+        if error:
+            result.errors[error] = result.errors.get(error, 0) + 1
+        else:
+            result.latencies.append((time.perf_counter() - start) * 1000.0)
+    return result
+
+
+def _client(workload: Workload, scenario: str, index: int, barrier, warmup: float, duration: float) -> ClientResult:
+    try:
+        with workload.client(scenario, index) as request:
+            barrier.wait(START_TIMEOUT)
+            return _loop(request, warmup, duration)
+    except BaseException:
+        barrier.abort()    # pozostali klienci nie czekają na tego, który nie wystartował
+        raise
+
+
+def _process_main(workload: Workload, scenario: str, index: int, barrier, warmup: float, duration: float,
+                  results) -> None:
+    try:
+        workload.connect()
+        try:
+            results.put((index, _client(workload, scenario, index, barrier, warmup, duration)))
+        finally:
+            workload.close()
+    except BaseException as e:
+        barrier.abort()
+        results.put((index, f"{type(e).__name__}: {e}"))
+
+
+def _run_threads(workload: Workload, scenario: str, clients: int, warmup: float, duration: float) -> list[ClientResult]:
+    barrier = threading.Barrier(clients)
+    with ThreadPoolExecutor(max_workers=clients, thread_name_prefix="load") as pool:
+        futures = [pool.submit(_client, workload, scenario, i, barrier, warmup, duration) for i in range(clients)]
+        return [f.result() for f in futures]
+
+
+def _run_processes(workload: Workload, scenario: str, clients: int, warmup: float, duration: float) -> list[ClientResult]:
+    # spawn: dziecko nie dziedziczy połączeń ani wątków puli rodzica
+    ctx = multiprocessing.get_context("spawn")
+    barrier, results = ctx.Barrier(clients), ctx.Queue()
+    procs = [ctx.Process(target=_process_main, args=(workload, scenario, i, barrier, warmup, duration, results),
+                         name=f"load-{i}", daemon=True) for i in range(clients)]
+    for p in procs:
+        p.start()
+    out: list[ClientResult] = []
+    failures: list[str] = []
+    try:
+        for _ in procs:
+            try:
+                _, result = results.get(timeout=START_TIMEOUT + warmup + duration)
+            except queue.Empty:
+                failures.append("brak wyniku (timeout)")
+                break
+            if isinstance(result, ClientResult):
+                out.append(result)
+            else:
+                failures.append(result)
+    finally:
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+    if failures:
+        raise RuntimeError(f"{workload.name}/{scenario}: klient nie wystartował – {failures[0]}")
+    return out
+
+
+RUNNERS = {"thread": _run_threads, "process": _run_processes}
+
+
+@dataclass
+class LoadResult:
+    target: str
+    scenario: str
+    workers: str
+    clients: int
+    requests: int
+    errors: int
+    rps: float
+    avg_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    saturated: bool = False
+    top_error: str = ""
+
+
+def combine(target: str, scenario: str, workers: str, clients: int, duration: float,
+            results: Sequence[ClientResult]) -> LoadResult:
+    ordered = sorted(ms for r in results for ms in r.latencies)
+    errors: dict[str, int] = {}
+    for r in results:
+        for name, n in r.errors.items():
+            errors[name] = errors.get(name, 0) + n
+    nan = float("nan")
+    return LoadResult(
+        target, scenario, workers, clients,
+        requests=len(ordered),
+        errors=sum(errors.values()),
+        rps=len(ordered) / duration,
+        avg_ms=statistics.fmean(ordered) if ordered else nan,
+        p50_ms=percentile(ordered, 50),
+        p95_ms=percentile(ordered, 95),
+        p99_ms=percentile(ordered, 99),
+        max_ms=ordered[-1] if ordered else nan,
+        top_error=max(errors, key=errors.get) if errors else "",
+    )
+
+
+def mark_saturation(series: Sequence[LoadResult], gain: float = 0.1) -> Optional[LoadResult]:
+    """
+    Flags ``saturated`` from the first client count whose throughput is less
+    than ``gain`` (fraction) above the best lower count; returns that row.
+    """
+    best: Optional[LoadResult] = None
+    point: Optional[LoadResult] = None
+    for r in sorted(series, key=lambda r: r.clients):
+        if point is None and best is not None and r.rps < best.rps * (1 + gain):
+            point = r
+        r.saturated = point is not None
+        if best is None or r.rps > best.rps:
+            best = r
+    return point
+
+
+@dataclass
+class LoadConfig:
+    clients: Sequence[int] = CLIENTS
+    duration: float = 10.0
+    warmup: float = 2.0
+    workers: str = "thread"
+    scenarios: Optional[Sequence[str]] = None    # None = wszystkie scenariusze celu
+    gain: float = 0.1
+
+
+def sweep(workload: Workload, config: LoadConfig) -> list[LoadResult]:
+    runner = RUNNERS[config.workers]
+    rows: list[LoadResult] = []
+    scenarios = [s for s in workload.scenarios if config.scenarios is None or s in config.scenarios]
+    workload.connect()
+    try:
+        for scenario in scenarios:
+            workload.setup(scenario)
+            series: list[LoadResult] = []
+            try:
+                for clients in config.clients:
+                    log(f"{workload.name}/{scenario}: {clients} {config.workers}(s), "
+                        f"{config.warmup:g}s warmup + {config.duration:g}s")
+                    row = combine(workload.name, scenario, config.workers, clients, config.duration,
+                                  runner(workload, scenario, clients, config.warmup, config.duration))
+                    log(f"  {row.rps:.1f} req/s, p50 {row.p50_ms:.2f} ms, p95 {row.p95_ms:.2f} ms, "
+                        f"errors {row.errors}{f' ({row.top_error})' if row.errors else ''}")
+                    series.append(row)
+            finally:
+                workload.teardown(scenario)
+            point = mark_saturation(series, config.gain)
+            if point is not None:
+                log(f"{workload.name}/{scenario}: saturation at {point.clients} clients "
+                    f"({point.rps:.1f} req/s, p95 {point.p95_ms:.2f} ms)")
+            rows += series
+    finally:
+        workload.close()
+    return rows
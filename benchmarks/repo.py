@@ -0,0 +1,164 @@
+"""
+Application-level benchmark: every ``LeagueRepo`` method through ``get_repo()``.
+
+One driver per ``DATA_BACKEND``, run against whatever the backend already
+holds (the ``infra/*/init`` seed or a generated dataset). ``n`` is the page
+size of the list calls and the number of ids of the ``get_*_many`` calls.
+
+    read     lists (plain, ``q``, filters), get / get_many, team_players,
+             counts, search, dropdown option lists
+    write    create -> update -> delete of a throwaway league, team, player
+             and match (the dataset is left as it was)
+
+Besides latency every op reports ``round_trips`` – statements/commands the
+adapter sent to the database (``instrument.round_trip``), which is where
+N+1 patterns and extra ``$lookup`` stages show up.
+"""
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import Any, Iterator, Sequence
+
+from .harness import Driver, Op
+
+BACKENDS = ("postgres", "mysql", "mongo", "mock")
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "league_manager.settings")
+    import django
+    django.setup()
+
+
+class RepoDriver(Driver):
+    scenarios = ("read", "write")
+
+    def __init__(self, backend: str, *, cache: bool = False):
+        self.name = backend
+        self.cache = cache
+
+    def connect(self) -> None:
+        setup_django()
+        from django.test.utils import override_settings
+
+        from core.repositories import factory
+
+        # cache domyślnie wyłączony – mierzymy adapter, nie LRU; bez busa unieważnień
+        self._settings = override_settings(
+            DATA_BACKEND=self.name,
+            REPO_CACHE={"enabled": self.cache},
+            REPO_BUS={},
+            REFERENCE_CACHE={"warmup": False},
+        )
+        self._settings.enable()
+        factory._repo_singleton = None
+        self.repo = factory.get_repo()
+
+    def close(self) -> None:
+        from core.repositories import factory
+
+        factory._repo_singleton = None
+        self._settings.disable()
+
+    def setup(self, scenario: str) -> None:
+        self.scenario = scenario
+        repo = self.repo
+        self.ids: dict[str, list] = {}
+        for entity in ("leagues", "teams", "players", "matches"):
+            items = getattr(repo, f"list_{entity}")(limit=500)
+            if not items:
+                raise RuntimeError(f"{self.name}: brak danych ({entity}) – załaduj seed albo wygenerowany zbiór")
+            self.ids[entity] = [i["id"] for i in items]
+        team = repo.get_team(self.ids["teams"][0])
+        self.term = (team.get("name") or "a").split()[0][:6]
+        self.league_id = self.ids["leagues"][0]
+        seasons = repo.season_options()
+        self.season_id = seasons[0][0] if seasons else None
+        countries = repo.country_options()
+        self.country_id = countries[0][0] if countries else None
+
+    def _sample(self, entity: str, n: int) -> list:
+        ids = self.ids[entity]
+        return (ids * (n // len(ids) + 1))[:n]
+
+    def round(self, n: int) -> Sequence[Op]:
+        return self._reads(n) if self.scenario == "read" else self._writes()
+
+    def _reads(self, n: int) -> Sequence[Op]:
+        r, ids = self.repo, self.ids
+        league, team, player, match = ids["leagues"][0], ids["teams"][0], ids["players"][0], ids["matches"][0]
+        return (
+            ("list_leagues", lambda: r.list_leagues(limit=n)),
+            ("list_leagues_q", lambda: r.list_leagues(q=self.term, limit=n)),
+            ("get_league", lambda: r.get_league(league)),
+            ("get_leagues_many", lambda: r.get_leagues_many(self._sample("leagues", n))),
+            ("list_teams", lambda: r.list_teams(limit=n)),
+            ("list_teams_q", lambda: r.list_teams(q=self.term, limit=n)),
+            ("list_teams_league", lambda: r.list_teams(filters={"league_id": self.league_id}, limit=n)),
+            ("get_team", lambda: r.get_team(team)),
+            ("get_teams_many", lambda: r.get_teams_many(self._sample("teams", n))),
+            ("team_players", lambda: r.team_players(team)),
+            ("list_players", lambda: r.list_players(limit=n)),
+            ("list_players_q", lambda: r.list_players(q=self.term, limit=n)),
+            ("get_player", lambda: r.get_player(player)),
+            ("get_players_many", lambda: r.get_players_many(self._sample("players", n))),
+            ("list_matches", lambda: r.list_matches(limit=n)),
+            ("list_matches_q", lambda: r.list_matches(q=self.term, limit=n)),
+            ("list_matches_season", lambda: r.list_matches(filters={"season_id": self.season_id}, limit=n)),
+            ("get_match", lambda: r.get_match(match)),
+            ("get_matches_many", lambda: r.get_matches_many(self._sample("matches", n))),
+            ("count_leagues", r.count_leagues),
+            ("count_teams", r.count_teams),
+            ("count_players", r.count_players),
+            ("count_matches", r.count_matches),
+            ("search", lambda: r.search(self.term)),
+            ("team_options", r.team_options),
+            ("country_options", r.country_options),
+            ("coach_options", r.coach_options),
+            ("stadium_options", r.stadium_options),
+            ("season_options", r.season_options),
+        )
+
+    def _writes(self) -> Sequence[Op]:
+        r, ids = self.repo, self.ids
+        created: dict[str, Any] = {}
+        home, away = (self.ids["teams"] * 2)[:2]
+
+        def create(entity: str, method, data: dict):
+            def op():
+                created[entity] = method(data)["id"]
+            return op
+
+        # kolejność: mecz i zawodnik przed drużyną i ligą, którą mogłyby skasować kaskadowo
+        return (
+            ("create_league", create("league", r.create_league, {"name": "Bench League", "country_id": self.country_id})),
+            ("update_league", lambda: r.update_league(created["league"], {"name": "Bench League 2", "country_id": self.country_id})),
+            ("create_team", create("team", r.create_team, {"name": "Bench Team", "founded_year": "1900"})),
+            ("update_team", lambda: r.update_team(created["team"], {"name": "Bench Team 2", "founded_year": "1901"})),
+            ("create_player", create("player", r.create_player, {"name": "Bench Player", "position": "FW", "team_id": ids["teams"][0]})),
+            ("update_player", lambda: r.update_player(created["player"], {"name": "Bench Player 2", "position": "MF", "team_id": ids["teams"][0]})),
+            ("create_match", create("match", r.create_match, {
+                "season_id": self.season_id, "matchday": "1", "utc_date": "2030-01-01T12:00",
+                "home_team_id": home, "away_team_id": away,
+            })),
+            ("update_match", lambda: r.update_match(created["match"], {
+                "season_id": self.season_id, "matchday": "2", "utc_date": "2030-01-02T12:00",
+                "home_team_id": home, "away_team_id": away,
+            })),
+            ("delete_match", lambda: r.delete_match(created["match"])),
+            ("delete_player", lambda: r.delete_player(created["player"])),
+            ("delete_team", lambda: r.delete_team(created["team"])),
+            ("delete_league", lambda: r.delete_league(created["league"])),
+        )
+
+    @contextmanager
+    def observe(self, op: str) -> Iterator[dict[str, float]]:
+        from core.repositories import instrument
+
+        with instrument.tracing() as trace:
+            extra: dict[str, float] = {}
+            yield extra
+        extra["calls"] = trace.count
+        extra["round_trips"] = trace.round_trips
+
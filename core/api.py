@@ -0,0 +1,94 @@
+"""
+Read-only JSON API over ``LeagueRepo``.
+
+    GET /api/<entity>/                      list (q, limit, cursor, filters from the query string)
+    GET /api/<entity>/batch/?ids=1,2,3      many by id: {"items": {id: item | null}}
+    GET /api/<entity>/<id>/                 one item
+
+Every 200 carries a strong ETag built from ``DataVersions`` – the versions
+of the entities the response reads plus the request path and query – so a
+matching ``If-None-Match`` is answered with 304 before the repository is
+touched.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+from .repositories.factory import get_repo, get_versions
+from .repositories.filters import FilterError
+from .repositories.pagination import DEFAULT_LIMIT, MAX_LIMIT, clamp_limit
+
+ENTITIES = ("leagues", "teams", "players", "matches")
+
+
+class ApiEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)    # ObjectId z dokumentów Mongo
+
+
+def _json(data, status=200):
+    return JsonResponse(data, status=status, encoder=ApiEncoder,
+                        json_dumps_params={"ensure_ascii": False, "sort_keys": True})
+
+
+def _error(status, message):
+    return _json({"error": message}, status=status)
+
+
+def conditional(view):
+    """ETag from data versions; If-None-Match hit -> 304 without calling ``view``."""
+    @wraps(view)
+    def wrapper(request, entity, *args, **kwargs):
+        if entity not in ENTITIES:
+            return _error(404, f"Nieznany zasób: {entity}")
+        etag = get_versions().etag(entity, request.path, sorted(request.GET.lists()))
+        sent = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in sent or "*" in sent:
+            response = HttpResponseNotModified()
+        else:
+            # wersje czytane przed zapytaniem: zapis w trakcie zmieni ETag, więc klient nie utknie na starych danych
+            response = view(request, entity, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response["ETag"] = etag
+        patch_cache_control(response, no_cache=True)
+        return response
+    return require_safe(wrapper)
+
+
+@conditional
+def list_items(request, entity):
+    params = {k: (v.split(",") if k.endswith("__in") else v) for k, v in request.GET.items()}
+    q = params.pop("q", None)
+    limit = clamp_limit(params.pop("limit", None), getattr(settings, "LIST_PAGE_SIZE", DEFAULT_LIMIT))
+    cursor = params.pop("cursor", None)
+    try:
+        page = getattr(get_repo(), f"list_{entity}")(q=q, filters=params, limit=limit, cursor=cursor)
+    except FilterError as e:
+        return _error(400, str(e))
+    return _json({"items": list(page), "next_cursor": page.next_cursor})
+
+
+@conditional
+def batch(request, entity):
+    ids = [i for i in request.GET.get("ids", "").split(",") if i]
+    if len(ids) > MAX_LIMIT:
+        return _error(400, f"Maksymalnie {MAX_LIMIT} id w jednym zapytaniu")
+    found = getattr(get_repo(), f"get_{entity}_many")(ids)
+    return _json({"items": {i: found.get(i) for i in ids}})
+
+
+@conditional
+def detail(request, entity, obj_id):
+    item = getattr(get_repo(), f"get_{entity}_many")([obj_id]).get(obj_id)
+    if item is None:
+        return _error(404, "Nie znaleziono")
+    return _json(item)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.repositories.factory import get_repo
+from core.repositories.search import provision
+
+
+class Command(BaseCommand):
+    help = ("Zakłada brakujące indeksy wyszukiwania (pg_trgm / FULLTEXT) dla bieżącego DATA_BACKEND; "
+            "w Mongo usuwa nieużywane indeksy $text.")
+
+    def handle(self, *args, **options):
+        done = provision(get_repo())
+        for statement in done:
+            self.stdout.write(f"  {statement}")
+        self.stdout.write(self.style.SUCCESS(f"OK: {len(done)} poleceń"))
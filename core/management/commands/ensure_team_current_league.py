@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.repositories.factory import get_repo
+from core.repositories.projections import provision
+
+
+class Command(BaseCommand):
+    help = (
+        "Zakłada lub aktualizuje projekcję team_current_league (tabela, procedura odświeżania, triggery) "
+        "w istniejącej bazie Postgres/MySQL i wypełnia ją z tabel ligowych. Można uruchamiać wielokrotnie."
+    )
+
+    def handle(self, *args, **options):
+        done = provision(get_repo())
+        for statement in done:
+            self.stdout.write(f"  {statement.splitlines()[0]}")
+        self.stdout.write(self.style.SUCCESS(f"OK: {len(done)} poleceń"))
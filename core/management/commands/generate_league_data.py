@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.repositories import bulk
+from core.repositories.dataset import Dataset
+from core.repositories.factory import get_repo
+
+
+class Command(BaseCommand):
+    help = (
+        "Generuje deterministyczny syntetyczny zbiór (kraje, ligi, sezony, drużyny, zawodnicy, sędziowie, mecze "
+        "z wynikami, tabele, strzelcy) w skali SF (SF1 = 38 tys. meczów, SF100 = 3,8 mln) i ładuje go importem "
+        "masowym do bieżącego DATA_BACKEND albo zapisuje do plików dla import_league_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sf", type=float, default=1.0, help="współczynnik skali (1..100)")
+        parser.add_argument("--seed", type=int, default=0, help="ziarno – ten sam SF i seed dają te same dane")
+        parser.add_argument("--entities", default=None,
+                            help=f"encje po przecinku (domyślnie wszystkie: {','.join(bulk.ENTITIES)})")
+        parser.add_argument("--output", default=None, help="katalog na pliki zamiast ładowania do bazy")
+        parser.add_argument("--format", choices=("csv", "ndjson"), default="csv", help="format plików (--output)")
+        parser.add_argument("--chunk-size", type=int, default=bulk.CHUNK_SIZE, help="wierszy na paczkę")
+        parser.add_argument("--workers", type=int, default=bulk.WORKERS,
+                            help="równoległe paczki na encję (standings zawsze po jednej)")
+
+    def handle(self, *args, **options):
+        entities = bulk.ENTITIES
+        if options["entities"]:
+            entities = tuple(e.strip() for e in options["entities"].split(",") if e.strip())
+            unknown = [e for e in entities if e not in bulk.ENTITIES]
+            if unknown:
+                raise CommandError(f"Nieznane encje: {', '.join(unknown)}")
+        try:
+            dataset = Dataset(options["sf"], options["seed"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        scale = dataset.scale
+        self.stdout.write(f"SF{options['sf']:g} seed={options['seed']}: {scale.leagues} lig, "
+                          f"{scale.leagues * scale.teams_per_league} drużyn, {scale.matches} meczów")
+
+        if options["output"]:
+            for entity, n in dataset.write(options["output"], options["format"], entities).items():
+                self.stdout.write(f"{entity}: {n} wierszy")
+            self.stdout.write(self.style.SUCCESS(f"Zapisano w {options['output']}"))
+            return
+
+        try:
+            importer = bulk.Importer(get_repo(), chunk_size=options["chunk_size"], workers=options["workers"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        sources = dataset.sources(entities)
+        if "countries" in entities:
+            # kraje mają unikalne nazwy, a seed bazy zwykle zawiera część z nich
+            existing = importer.adapter.natural_keys("countries")
+            sources = [(e, (r for r in rows if r["name"] not in existing) if e == "countries" else rows)
+                       for e, rows in sources]
+
+        bulk.report(importer.run(sources), self.stdout, self.stderr, self.style, "Generowanie zakończone z błędami")
@@ -0,0 +1,40 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.repositories import bulk
+from core.repositories.factory import get_repo
+
+
+class Command(BaseCommand):
+    help = (
+        "Import masowy CSV/NDJSON (countries, leagues, seasons, teams, players, referees, matches, scores, "
+        "match_referees, standings, scorers) "
+        "do bieżącego DATA_BACKEND. Encja z nazwy pliku (teams.csv, matches-2024.ndjson) lub --entity; "
+        "katalog = wszystkie pliki w środku. Klucze obce po nazwach (kraj, liga, drużyna, sezon)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="pliki .csv/.ndjson lub katalogi")
+        parser.add_argument("--entity", choices=bulk.ENTITIES, help="encja, gdy nie wynika z nazwy pliku")
+        parser.add_argument("--chunk-size", type=int, default=bulk.CHUNK_SIZE, help="wierszy na paczkę")
+        parser.add_argument("--workers", type=int, default=bulk.WORKERS,
+                            help="równoległe paczki na encję (standings zawsze po jednej)")
+
+    def handle(self, *args, **options):
+        files = []
+        for path in options["paths"]:
+            if os.path.isdir(path):
+                files += sorted(os.path.join(path, n) for n in os.listdir(path)
+                                if n.lower().endswith((".csv", ".ndjson", ".jsonl")))
+            elif os.path.isfile(path):
+                files.append(path)
+            else:
+                raise CommandError(f"Brak pliku: {path}")
+        try:
+            sources = [(options["entity"] or bulk.entity_of(f), bulk.read_rows(f)) for f in files]
+            importer = bulk.Importer(get_repo(), chunk_size=options["chunk_size"], workers=options["workers"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        bulk.report(importer.run(sources), self.stdout, self.stderr, self.style, "Import zakończony z błędami")
@@ -0,0 +1,84 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .repositories import instrument, metrics
+
+
+class RepoTimingMiddleware:
+    """
+    Traces the ``LeagueRepo`` calls of each request (``instrument.tracing``).
+
+    The trace is available to templates as ``request.repo_trace`` (admin debug
+    panel in base.html), summarised in a ``Server-Timing`` header and logged
+    when the request goes over ``REPO_BUDGET``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with instrument.tracing() as trace:
+            request.repo_trace = trace
+            response = self.get_response(request)
+        return self._finish(request, trace, response)
+
+    async def __acall__(self, request):
+        with instrument.tracing() as trace:
+            request.repo_trace = trace
+            response = await self.get_response(request)
+        return self._finish(request, trace, response)
+
+    def _finish(self, request, trace, response):
+        if trace.calls:
+            response["Server-Timing"] = instrument.server_timing(trace)
+        budget = getattr(settings, "REPO_BUDGET", None) or {}
+        instrument.check_budget(trace, f"{request.method} {request.path}", budget.get("calls"), budget.get("ms"))
+        return response
+
+
+class MetricsMiddleware:
+    """Request count, latency and unhandled exceptions per URL name (``repositories.metrics``)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        return self._finish(request, response, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        return self._finish(request, response, start)
+
+    def process_exception(self, request, exception):
+        metrics.http_exceptions.inc(_view_name(request), type(exception).__name__)
+
+    def _finish(self, request, response, start):
+        view = _view_name(request)
+        metrics.http_latency.observe(time.perf_counter() - start, view)
+        metrics.http_requests.inc(view, request.method, response.status_code)
+        return response
+
+
+def _view_name(request) -> str:
+    # nazwa z urls.py zamiast ścieżki – ograniczona liczba serii (id w URL-u by ją rozsadziły)
+    match = getattr(request, "resolver_match", None)
+    return (match.view_name if match else None) or "unresolved"
@@ -1,60 +1,118 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Sequence
+import threading
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
 
 from ..base import LeagueRepo, Payload
+from ..counters import CounterStore
+from ..filters import matches
+from ..instrument import traced
+from .. import export, search
+from ..pagination import clamp_limit, decode_cursor, make_page
+from ..signals import notify
 from .. import mock_repo
 
 
+def _by_name(item) -> tuple:
+    return (str(item.get("name", "")), str(item["id"]))
+
+
+def _by_date(item) -> tuple:
+    return (str(item.get("utc_date") or ""), str(item["id"]))
+
+
+@traced("mock")
 class MockAdapter(LeagueRepo):
     """Mock adapter using in-memory list."""
 
-
-    def list_leagues(self, *, q: Optional[str] = None, filters=None) -> Sequence[Mapping[str, Any]]:
-        return mock_repo.list_leagues(q=q)
+    # _next_id liczy z zawartości list – równoległe paczki importu muszą dopisywać po kolei
+    _import_lock = threading.Lock()
+
+    def __init__(self):
+        self.counters = CounterStore(self)
+
+    @staticmethod
+    def _where(entity: str, items, filters):
+        if not filters:
+            return items
+        return [x for x in items if matches(entity, filters, x)]
+
+    @staticmethod
+    def _page(items, *, limit, cursor, key, desc=False):
+        """Same keyset contract as the DB adapters, evaluated in Python."""
+        if not limit:
+            return items
+        limit = clamp_limit(limit)
+        items = sorted(items, key=key, reverse=desc)
+        after = decode_cursor(cursor, str, str)
+        if after:
+            items = [x for x in items if (key(x) < after if desc else key(x) > after)]
+        return make_page(items[:limit + 1], limit, key)
+
+    @staticmethod
+    def _many(get, ids: Iterable[str]) -> dict[str, Any]:
+        found = (get(str(i)) for i in ids)
+        return {str(x["id"]): x for x in found if x}
+
+    def list_leagues(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None) -> Sequence[Mapping[str, Any]]:
+        return self._page(self._where("leagues", mock_repo.list_leagues(q=q), filters), limit=limit, cursor=cursor, key=_by_name)
 
     def get_league(self, league_id: int):
         return mock_repo.get_league(league_id)
 
-    def list_teams(self, *, q: Optional[str] = None, filters=None):
-        return mock_repo.list_teams(q=q)
+    def get_leagues_many(self, ids: Iterable[str]) -> dict[str, Any]:
+        return self._many(mock_repo.get_league, ids)
+
+    def list_teams(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
+        return self._page(self._where("teams", mock_repo.list_teams(q=q), filters), limit=limit, cursor=cursor, key=_by_name)
 
     def get_team(self, team_id: int):
         return mock_repo.get_team(team_id)
 
-    def list_players(self, *, q: Optional[str] = None, filters=None):
-        return mock_repo.list_players(q=q)
+    def get_teams_many(self, ids: Iterable[str]) -> dict[str, Any]:
+        return self._many(mock_repo.get_team, ids)
+
+    def list_players(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
+        return self._page(self._where("players", mock_repo.list_players(q=q), filters), limit=limit, cursor=cursor, key=_by_name)
 
     def get_player(self, player_id: int):
         return mock_repo.get_player(player_id)
 
+    def get_players_many(self, ids: Iterable[str]) -> dict[str, Any]:
+        return self._many(mock_repo.get_player, ids)
+
     def team_players(self, team_id: int):
         return mock_repo.team_players(team_id)
 
-    def list_matches(self, *, q: Optional[str] = None, filters=None):
+    def list_matches(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
 
         out = []
-        for m in mock_repo.list_matches(q=q):
+        for m in self._where("matches", mock_repo.list_matches(q=q), filters):
             m2 = dict(m)
             m2["label"] = mock_repo.match_label(m)
             out.append(m2)
-        return out
+        return self._page(out, limit=limit, cursor=cursor, key=_by_date, desc=True)
 
     def get_match(self, match_id: int):
         return mock_repo.get_match(match_id)
 
+    def get_matches_many(self, ids: Iterable[str]) -> dict[str, Any]:
+        return self._many(mock_repo.get_match, ids)
+
     def match_label(self, match: Mapping[str, Any]) -> str:
         return mock_repo.match_label(match)
 
 
-    def _next_id(self, items, key="id") -> int:
-        return (max((x.get(key, 0) for x in items), default=0) + 1)
+    def _next_id(self, items, key="id") -> str:
+        # id w mocku to 24-znakowy hex (jak ObjectId), więc kolejne id liczymy w hex
+        return f"{max((int(str(x.get(key, 0)), 16) for x in items), default=0) + 1:024x}"
 
     def create_league(self, data: Payload):
         name = str(data.get("name", "")).strip() or "Nowa liga"
         country = str(data.get("country", "")).strip() or "Nieznany kraj"
         new_item = {"id": self._next_id(mock_repo.LEAGUES), "name": name, "country": country}
         mock_repo.LEAGUES.append(new_item)
+        notify(self, "leagues", "create", new_item["id"])
         return new_item
 
     def update_league(self, league_id: int, data: Payload):
@@ -63,19 +121,24 @@ class MockAdapter(LeagueRepo):
             return None
         item["name"] = str(data.get("name", item["name"])).strip() or item["name"]
         item["country"] = str(data.get("country", item["country"])).strip() or item["country"]
+        notify(self, "leagues", "update", league_id)
         return item
 
     def delete_league(self, league_id: int) -> bool:
         before = len(mock_repo.LEAGUES)
         mock_repo.LEAGUES[:] = [x for x in mock_repo.LEAGUES if x["id"] != league_id]
-        return len(mock_repo.LEAGUES) != before
+        deleted = len(mock_repo.LEAGUES) != before
+        if deleted:
+            notify(self, "leagues", "delete", league_id)
+        return deleted
 
     def create_team(self, data: Payload):
         name = str(data.get("name", "")).strip() or "Nowa drużyna"
         founded_year = int(data.get("founded_year") or 2000)
         coach = str(data.get("coach", "")).strip() or "Trener"
         stadium = str(data.get("stadium", "")).strip() or "Stadion"
-        league_id = int(data.get("league_id") or 1)
+        # id w mocku to napisy (jak ObjectId) – int() wywracał formularz z wybraną ligą/drużyną
+        league_id = str(data.get("league_id") or mock_repo.LEAGUES[0]["id"])
         new_item = {
             "id": self._next_id(mock_repo.TEAMS),
             "name": name,
@@ -85,6 +148,7 @@ class MockAdapter(LeagueRepo):
             "league_id": league_id,
         }
         mock_repo.TEAMS.append(new_item)
+        notify(self, "teams", "create", new_item["id"])
         return new_item
 
     def update_team(self, team_id: int, data: Payload):
@@ -95,18 +159,22 @@ class MockAdapter(LeagueRepo):
         item["founded_year"] = int(data.get("founded_year") or item.get("founded_year") or 2000)
         item["coach"] = str(data.get("coach", item["coach"])).strip() or item["coach"]
         item["stadium"] = str(data.get("stadium", item["stadium"])).strip() or item["stadium"]
+        notify(self, "teams", "update", team_id)
         return item
 
     def delete_team(self, team_id: int) -> bool:
         before = len(mock_repo.TEAMS)
         mock_repo.TEAMS[:] = [x for x in mock_repo.TEAMS if x["id"] != team_id]
-        return len(mock_repo.TEAMS) != before
+        deleted = len(mock_repo.TEAMS) != before
+        if deleted:
+            notify(self, "teams", "delete", team_id)
+        return deleted
 
     def create_player(self, data: Payload):
         name = str(data.get("name", "")).strip() or "Nowy zawodnik"
         position = str(data.get("position", "")).strip() or "MF"
         nationality = str(data.get("nationality", "")).strip() or "PL"
-        team_id = int(data.get("team_id") or 1)
+        team_id = str(data.get("team_id") or mock_repo.TEAMS[0]["id"])
         new_item = {
             "id": self._next_id(mock_repo.PLAYERS),
             "name": name,
@@ -115,6 +183,7 @@ class MockAdapter(LeagueRepo):
             "nationality": nationality,
         }
         mock_repo.PLAYERS.append(new_item)
+        notify(self, "players", "create", new_item["id"])
         return new_item
 
     def update_player(self, player_id: int, data: Payload):
@@ -124,12 +193,16 @@ class MockAdapter(LeagueRepo):
         item["name"] = str(data.get("name", item["name"])).strip() or item["name"]
         item["position"] = str(data.get("position", item["position"])).strip() or item["position"]
         item["nationality"] = str(data.get("nationality", item["nationality"])).strip() or item["nationality"]
+        notify(self, "players", "update", player_id)
         return item
 
     def delete_player(self, player_id: int) -> bool:
         before = len(mock_repo.PLAYERS)
         mock_repo.PLAYERS[:] = [x for x in mock_repo.PLAYERS if x["id"] != player_id]
-        return len(mock_repo.PLAYERS) != before
+        deleted = len(mock_repo.PLAYERS) != before
+        if deleted:
+            notify(self, "players", "delete", player_id)
+        return deleted
 
     def create_match(self, data: Payload):
 
@@ -139,6 +212,7 @@ class MockAdapter(LeagueRepo):
             "matchday": int(data.get("matchday") or 1),
             "league_id": 1,
             "season": "2024/2025",
+            "season_id": str(data.get("season_id") or 2),
             "home_team_id": 1,
             "away_team_id": 2,
             "score": {"half_time": {"home": 0, "away": 0}, "full_time": {"home": 0, "away": 0}},
@@ -146,6 +220,7 @@ class MockAdapter(LeagueRepo):
             "referees": [],
         }
         mock_repo.MATCHES.append(new_item)
+        notify(self, "matches", "create", new_item["id"])
         return new_item
 
     def update_match(self, match_id: int, data: Payload):
@@ -154,24 +229,32 @@ class MockAdapter(LeagueRepo):
             return None
         item["utc_date"] = str(data.get("utc_date", item.get("utc_date")))
         item["matchday"] = int(data.get("matchday") or item.get("matchday") or 1)
+        notify(self, "matches", "update", match_id)
         return item
 
     def delete_match(self, match_id: int) -> bool:
         before = len(mock_repo.MATCHES)
         mock_repo.MATCHES[:] = [x for x in mock_repo.MATCHES if x["id"] != match_id]
-        return len(mock_repo.MATCHES) != before
+        deleted = len(mock_repo.MATCHES) != before
+        if deleted:
+            notify(self, "matches", "delete", match_id)
+        return deleted
 
 
-    def list_countries(self) -> list[dict]:
+    def count_leagues(self) -> int:
+        return self.counters.get("leagues", lambda: len(mock_repo.LEAGUES))
 
-        return [
-            {"id": 1, "name": "England"},
-            {"id": 2, "name": "Spain"},
-            {"id": 3, "name": "Poland"},
-            {"id": 4, "name": "Germany"},
-            {"id": 5, "name": "France"},
-            {"id": 6, "name": "Italy"},
-        ]
+    def count_teams(self) -> int:
+        return self.counters.get("teams", lambda: len(mock_repo.TEAMS))
+
+    def count_players(self) -> int:
+        return self.counters.get("players", lambda: len(mock_repo.PLAYERS))
+
+    def count_matches(self) -> int:
+        return self.counters.get("matches", lambda: len(mock_repo.MATCHES))
+
+    def list_countries(self) -> list[dict]:
+        return [dict(c) for c in mock_repo.COUNTRIES]
 
     def list_stadiums(self) -> list[dict]:
         return [
@@ -190,7 +273,123 @@ class MockAdapter(LeagueRepo):
         ]
 
     def list_seasons(self) -> list[dict]:
-        return [
-            {"id": 1, "year": "2023-2024", "league_name": "Premier League"},
-            {"id": 2, "year": "2024-2025", "league_name": "Premier League"},
-        ]
+        return [dict(x) for x in mock_repo.SEASONS]
+
+    def team_options(self) -> list[tuple[str, str]]:
+        return [(str(t["id"]), t["name"]) for t in sorted(mock_repo.TEAMS, key=_by_name)]
+
+    def country_options(self) -> list[tuple[str, str]]:
+        return [(str(c["id"]), c["name"]) for c in self.list_countries()]
+
+    def coach_options(self) -> list[tuple[str, str]]:
+        return [(str(c["id"]), f'{c["name"]} ({c["nationality"]})' if c.get("nationality") else c["name"])
+                for c in self.list_coaches()]
+
+    def stadium_options(self) -> list[tuple[str, str]]:
+        return [(str(s["id"]), f'{s["name"]} - {s["location"]}' if s.get("location") else s["name"])
+                for s in self.list_stadiums()]
+
+    def season_options(self) -> list[tuple[str, str]]:
+        return [(str(s["id"]), f'{s["year"]} - {s["league_name"]}') for s in self.list_seasons()]
+
+    def search(self, q: str, *, entities: Sequence[str] = search.ENTITIES,
+               limit: int = search.DEFAULT_LIMIT) -> list[dict]:
+        if not q or not q.strip():
+            return []
+        fields = {
+            "leagues": (mock_repo.LEAGUES, ("name", "country")),
+            "teams": (mock_repo.TEAMS, ("name", "coach", "stadium")),
+            "players": (mock_repo.PLAYERS, ("name", "position", "nationality")),
+        }
+        hits = []
+        for entity in entities:
+            items, keys = fields[entity]
+            for x in items:
+                rank = search.rank_text(q, *(x.get(k) for k in keys))
+                if rank:
+                    hits.append({"entity": entity, "id": str(x["id"]), "label": x["name"], "rank": rank})
+        hits.sort(key=lambda h: (-h["rank"], h["label"]))
+        return hits[:clamp_limit(limit)]
+
+    def stream(self, entity: str, *, filters=None, batch_size: int = export.BATCH_SIZE) -> Iterator[dict]:
+        sources = {"leagues": mock_repo.LEAGUES, "teams": mock_repo.TEAMS,
+                   "players": mock_repo.PLAYERS, "matches": mock_repo.MATCHES}
+        for x in self._where(entity, sources[entity], filters):
+            yield dict(x)
+
+    def natural_keys(self, kind: str) -> dict[Any, str]:
+        # mock trzyma nazwy krajów/trenerów/stadionów zamiast id – kluczem i wartością jest nazwa
+        if kind == "countries":
+            names = [c["name"] for c in self.list_countries()] + [l["country"] for l in mock_repo.LEAGUES]
+            return {n: n for n in names}
+        if kind in ("leagues", "teams"):
+            return {x["name"]: x["id"] for x in getattr(mock_repo, kind.upper())}
+        if kind == "seasons":
+            leagues = {l["name"]: l["id"] for l in mock_repo.LEAGUES}
+            return {(leagues.get(s["league_name"]), s["year"]): str(s["id"]) for s in self.list_seasons()}
+        if kind == "matches":
+            return {(m.get("season_id"), m["home_team_id"], m["away_team_id"]): m["id"] for m in mock_repo.MATCHES}
+        if kind == "players":
+            return {(p["name"], p["team_id"]): p["id"] for p in mock_repo.PLAYERS}
+        if kind == "referees":
+            return {r["name"]: r["id"] for r in mock_repo.REFEREES}
+        return {}
+
+    def _new_ids(self, items, n: int) -> list[str]:
+        # jedno przejście po liście na paczkę zamiast _next_id na wiersz (duże zbiory z dataset.py)
+        first = int(self._next_id(items), 16)
+        return [f"{first + i:024x}" for i in range(n)]
+
+    def bulk_insert(self, entity: str, rows: Sequence[Mapping[str, Any]]) -> int:
+        with self._import_lock:
+            if entity in ("countries", "seasons"):
+                items = getattr(mock_repo, entity.upper())
+                first = max((x["id"] for x in items), default=0) + 1
+                leagues = {l["id"]: l["name"] for l in mock_repo.LEAGUES}
+                for i, r in enumerate(rows):
+                    if entity == "countries":
+                        items.append({"id": first + i, "name": r["name"]})
+                    else:
+                        items.append({"id": first + i, "year": r["year"], "league_name": leagues.get(r["league_id"])})
+            elif entity in ("scores", "match_referees"):
+                matches = {m["id"]: m for m in mock_repo.MATCHES}
+                referees = {x["id"]: x["name"] for x in mock_repo.REFEREES}
+                for r in rows:
+                    match = matches[r["match_id"]]
+                    if entity == "scores":
+                        match["score"] = {
+                            "half_time": {"home": r["half_time_home"], "away": r["half_time_away"]},
+                            "full_time": {"home": r["full_time_home"], "away": r["full_time_away"]},
+                        }
+                    else:
+                        match["referees"].append({"name": referees.get(r["referee_id"]), "role": r["role"]})
+            elif entity in ("standings", "scorers"):
+                # mock ich nie wyświetla – trzymamy wiersze, żeby zbiór miał pełny rozmiar
+                getattr(mock_repo, entity.upper()).extend(dict(r) for r in rows)
+            else:
+                items = getattr(mock_repo, entity.upper())
+                for new_id, r in zip(self._new_ids(items, len(rows)), rows):
+                    if entity == "leagues":
+                        items.append({"id": new_id, "name": r["name"], "country": r["country_id"]})
+                    elif entity == "teams":
+                        items.append({"id": new_id, "name": r["name"], "founded_year": r["founded_year"],
+                                      "coach": r["coach"], "stadium": r["stadium"], "league_id": None})
+                    elif entity == "players":
+                        items.append({"id": new_id, "name": r["name"], "position": r["position"],
+                                      "team_id": r["team_id"], "nationality": r["nationality_id"]})
+                    elif entity == "referees":
+                        items.append({"id": new_id, "name": r["name"], "nationality": r["nationality_id"]})
+                    else:
+                        items.append({
+                            "id": new_id,
+                            "utc_date": r["utc_date"].isoformat(),
+                            "matchday": r["matchday"],
+                            "season_id": r["season_id"],
+                            "home_team_id": r["home_team_id"],
+                            "away_team_id": r["away_team_id"],
+                            "score": {"half_time": {"home": None, "away": None},
+                                      "full_time": {"home": None, "away": None}},
+                            "statistics": {},
+                            "referees": [],
+                        })
+        return len(rows)
@@ -1,61 +1,196 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Sequence
-from datetime import datetime
+import logging
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence
+from datetime import date, datetime
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 
 from ..base import LeagueRepo, Payload
+from ..counters import CounterStore
+from ..filters import to_mongo
+from ..instrument import traced
+from .. import bulk, export, search
+from ..pagination import clamp_limit, decode_cursor, make_page
+from ..signals import notify
+from .. import slowlog
+
+logger = logging.getLogger(__name__)
 
 
 def oid(s: str) -> ObjectId:
     return ObjectId(s)
 
 
+def oids(ids: Iterable[Any]) -> list[ObjectId]:
+    return [ObjectId(str(i)) for i in ids if ObjectId.is_valid(str(i))]
+
+
+def _day(value: Optional[date]) -> Optional[datetime]:
+    return datetime(value.year, value.month, value.day) if value else None
+
+
+def _import_doc(entity: str, r: Mapping[str, Any]) -> dict[str, Any]:
+    """Row resolved by bulk.RESOLVERS -> document; defaults as in create_*."""
+    if entity == "countries":
+        return {"name": r["name"], "flagUrl": r["flag_url"] or "-"}
+    if entity == "leagues":
+        return {
+            "name": r["name"],
+            "countryId": r["country_id"],
+            "iconUrl": r["icon_url"] or "",
+            "europeanSpots": {
+                "championsLeague": r["cl_spot"] or 0,
+                "europaLeague": r["uel_spot"] or 0,
+                "relegation": r["relegation_spot"] or 0,
+            },
+        }
+    if entity == "seasons":
+        return {"leagueId": r["league_id"], "year": r["year"], "standings": [], "topScorers": []}
+    if entity == "teams":
+        return {
+            "name": r["name"],
+            "foundedYear": r["founded_year"] or 1900,
+            "crestUrl": r["crest_url"] or "",
+            "countryId": r["country_id"],
+            "leagueId": None,
+            "stadium": {"name": r["stadium"] or "Unknown", "location": "Unknown", "capacity": 0},
+            "coach": {"name": r["coach"] or "Unknown", "nationalityId": r["country_id"]},
+        }
+    if entity == "players":
+        return {
+            "name": r["name"],
+            "position": r["position"],
+            "dateOfBirth": _day(r["date_of_birth"]),
+            "nationalityId": r["nationality_id"],
+            "currentTeamId": r["team_id"],
+        }
+    if entity == "matches":
+        return {
+            "seasonId": r["season_id"],
+            "matchday": r["matchday"] or 1,
+            "utcDate": _day(r["utc_date"]),
+            "homeTeamId": r["home_team_id"],
+            "awayTeamId": r["away_team_id"],
+            "score": {"fullTime": {"home": None, "away": None}, "halfTime": {"home": None, "away": None},
+                      "winner": r["winner"]},
+            "statistics": None,
+            "referees": [],
+        }
+    if entity == "referees":
+        return {"name": r["name"], "nationalityId": r["nationality_id"]}
+    raise ValueError(f"Nieznana encja importu: {entity}")
+
+
+# encje osadzone: encja -> (kolekcja, pole klucza w wierszu, tablica w dokumencie, wiersz -> element)
+_EMBEDDED: dict[str, tuple[str, str, str, Callable[[Mapping[str, Any]], dict]]] = {
+    "match_referees": ("matches", "match_id", "referees",
+                       lambda r: {"role": r["role"], "refereeId": r["referee_id"]}),
+    "standings": ("seasons", "season_id", "standings", lambda r: {
+        "teamId": r["team_id"], "position": r["position"], "playedGames": r["played_games"], "won": r["won"],
+        "draw": r["draw"], "lost": r["lost"], "points": r["points"], "goalsFor": r["goals_for"],
+        "goalsAgainst": r["goals_against"], "goalDifference": r["goal_difference"], "form": r["form"],
+    }),
+    "scorers": ("seasons", "season_id", "topScorers", lambda r: {
+        "playerId": r["player_id"], "teamId": r["team_id"], "goals": r["goals"] or 0,
+        "assists": r["assists"] or 0, "penalties": r["penalties"] or 0,
+    }),
+}
+
+
 def str_id(doc: Mapping[str, Any]) -> dict[str, Any]:
     d = dict(doc)
     d["id"] = str(d.pop("_id"))
     return d
 
 
+@traced("mongo")
 class MongoAdapter(LeagueRepo):
     def __init__(self, uri: str, db_name: str):
-        self.client = MongoClient(uri)
+        # czasy komend i explain() dla slow-query logu
+        self.slow_commands = slowlog.MongoSlowCommands()
+        self.client = MongoClient(uri, event_listeners=[self.slow_commands])
+        self.slow_commands.client = self.client
         self.db = self.client[db_name]
+        self.counters = CounterStore(self)
+
+    def _list(self, collection, match: dict, sort: dict, stages: list, *,
+              limit: Optional[int] = None, key=None, convert=str_id):
+        """
+        Sort (and limit) before the joining ``stages`` so that $lookup runs only
+        for the returned page; with ``limit`` fetches one extra doc and returns a Page.
+        """
+        pipeline = [{"$match": match}, {"$sort": sort}]
+        if limit:
+            limit = clamp_limit(limit)
+            pipeline.append({"$limit": limit + 1})
+        docs = list(collection.aggregate(pipeline + stages))
+        if limit:
+            return make_page(docs, limit, key, convert)
+        return [convert(x) for x in docs]
+
+    @staticmethod
+    def _match(entity: str, filters) -> dict[str, Any]:
+        conds = to_mongo(entity, filters, oid)
+        return {"$and": conds} if conds else {}
+
+    def _search(self, entity: str, q: str) -> dict[str, Any]:
+        """``search.mongo_match`` with related ids looked up by name (SQL: ``fk IN (SELECT ...)``)."""
+        pattern = search.mongo_pattern(q)
+        related = {field: [d["_id"] for d in self.db[collection].find({"name": pattern}, {"_id": 1})]
+                   for field, collection in search.MONGO_SPECS[entity].related}
+        return search.mongo_match(entity, q, related)
+
+    @staticmethod
+    def _seek(match: dict, cursor: Optional[str], field: str, cast=str, desc: bool = False) -> None:
+        """Keyset condition for lists ordered by (field, _id)."""
+        after = decode_cursor(cursor, cast, oid)
+        if after:
+            value, last_id = after
+            op = "$lt" if desc else "$gt"
+            match.setdefault("$and", []).append(
+                {"$or": [{field: {op: value}}, {field: value, "_id": {op: last_id}}]}
+            )
 
     # ---- Leagues ----
-    def list_leagues(self, *, q: Optional[str] = None, filters=None) -> Sequence[Mapping[str, Any]]:
-        match: dict[str, Any] = {}
+    def list_leagues(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None) -> Sequence[Mapping[str, Any]]:
+        match: dict[str, Any] = self._match("leagues", filters)
         if q:
-            match["name"] = {"$regex": q, "$options": "i"}
+            match.update(self._search("leagues", q))
+        if limit:
+            self._seek(match, cursor, "name")
 
-        pipeline = [
-            {"$match": match},
+        stages = [
             {"$lookup": {"from": "countries", "localField": "countryId", "foreignField": "_id", "as": "country"}},
             {"$unwind": {"path": "$country", "preserveNullAndEmptyArrays": True}},
             {"$project": {"_id": 1, "name": 1, "country": "$country.name"}},
         ]
-        return [str_id(x) for x in self.db.leagues.aggregate(pipeline)]
+        return self._list(self.db.leagues, match, {"name": 1, "_id": 1}, stages,
+                          limit=limit, key=lambda x: (x["name"], str(x["_id"])))
 
-    def get_league(self, league_id: str):
+    def get_leagues_many(self, ids: Iterable[str]) -> dict[str, dict]:
         pipeline = [
-            {"$match": {"_id": oid(league_id)}},
+            {"$match": {"_id": {"$in": oids(ids)}}},
             {"$lookup": {"from": "countries", "localField": "countryId", "foreignField": "_id", "as": "country"}},
             {"$unwind": {"path": "$country", "preserveNullAndEmptyArrays": True}},
             {"$project": {"_id": 1, "name": 1, "country": "$country.name"}},
         ]
-        out = list(self.db.leagues.aggregate(pipeline))
-        return str_id(out[0]) if out else None
+        return {str(x["_id"]): str_id(x) for x in self.db.leagues.aggregate(pipeline)}
+
+    def get_league(self, league_id: str):
+        return next(iter(self.get_leagues_many([league_id]).values()), None)
 
     # ---- Teams ----
-    def list_teams(self, *, q: Optional[str] = None, filters=None):
-        match: dict[str, Any] = {}
+    def list_teams(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
+        match: dict[str, Any] = self._match("teams", filters)
         if q:
-            match["name"] = {"$regex": q, "$options": "i"}
+            match.update(self._search("teams", q))
+        if limit:
+            self._seek(match, cursor, "name")
 
-        pipeline = [
-            {"$match": match},
+        stages = [
             {
                 "$project": {
                     "_id": 1,
@@ -66,46 +201,48 @@ class MongoAdapter(LeagueRepo):
                     "stadium": "$stadium.name",
                 }
             },
-            {"$sort": {"name": 1}},
         ]
 
-        out = []
-        for x in self.db.teams.aggregate(pipeline):
+        def convert(x):
             x = str_id(x)
-            out.append(
-                {
-                    "id": x["id"],
-                    "name": x.get("name"),
-                    "founded_year": x.get("foundedYear"),
-                    "coach": x.get("coach"),
-                    "stadium": x.get("stadium"),
-                    "league_id": str(x.get("leagueId")) if x.get("leagueId") else None,
-                }
-            )
+            return {
+                "id": x["id"],
+                "name": x.get("name"),
+                "founded_year": x.get("foundedYear"),
+                "coach": x.get("coach"),
+                "stadium": x.get("stadium"),
+                "league_id": str(x.get("leagueId")) if x.get("leagueId") else None,
+            }
+
+        return self._list(self.db.teams, match, {"name": 1, "_id": 1}, stages,
+                          limit=limit, key=lambda x: (x["name"], str(x["_id"])), convert=convert)
+
+    def get_teams_many(self, ids: Iterable[str]) -> dict[str, dict]:
+        out = {}
+        for doc in self.db.teams.find({"_id": {"$in": oids(ids)}}):
+            d = str_id(doc)
+            out[d["id"]] = {
+                "id": d["id"],
+                "name": d.get("name"),
+                "founded_year": d.get("foundedYear"),
+                "coach": (d.get("coach") or {}).get("name"),
+                "stadium": (d.get("stadium") or {}).get("name"),
+                "league_id": str(d.get("leagueId")) if d.get("leagueId") else None,
+            }
         return out
 
     def get_team(self, team_id: str):
-        doc = self.db.teams.find_one({"_id": oid(team_id)})
-        if not doc:
-            return None
-        d = str_id(doc)
-        return {
-            "id": d["id"],
-            "name": d.get("name"),
-            "founded_year": d.get("foundedYear"),
-            "coach": (d.get("coach") or {}).get("name"),
-            "stadium": (d.get("stadium") or {}).get("name"),
-            "league_id": str(d.get("leagueId")) if d.get("leagueId") else None,
-        }
+        return next(iter(self.get_teams_many([team_id]).values()), None)
 
     # ---- Players ----
-    def list_players(self, *, q: Optional[str] = None, filters=None):
-        match: dict[str, Any] = {}
+    def list_players(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
+        match: dict[str, Any] = self._match("players", filters)
         if q:
-            match["name"] = {"$regex": q, "$options": "i"}
+            match.update(self._search("players", q))
+        if limit:
+            self._seek(match, cursor, "name")
 
-        pipeline = [
-            {"$match": match},
+        stages = [
             {"$lookup": {"from": "countries", "localField": "nationalityId", "foreignField": "_id", "as": "nat"}},
             {"$unwind": {"path": "$nat", "preserveNullAndEmptyArrays": True}},
             {
@@ -117,89 +254,104 @@ class MongoAdapter(LeagueRepo):
                     "nationality": "$nat.name",
                 }
             },
-            {"$sort": {"name": 1}},
         ]
 
-        out = []
-        for x in self.db.players.aggregate(pipeline):
+        def convert(x):
             x = str_id(x)
-            out.append(
-                {
-                    "id": x["id"],
-                    "name": x.get("name"),
-                    "position": x.get("position"),
-                    "nationality": x.get("nationality"),
-                    "team_id": str(x.get("currentTeamId")) if x.get("currentTeamId") else None,
-                    "currentTeamId": x.get("currentTeamId"),  # dla zgodności z view
-                }
-            )
-        return out
-
-    def get_player(self, player_id: str):
+            return {
+                "id": x["id"],
+                "name": x.get("name"),
+                "position": x.get("position"),
+                "nationality": x.get("nationality"),
+                "team_id": str(x.get("currentTeamId")) if x.get("currentTeamId") else None,
+                "currentTeamId": x.get("currentTeamId"),  # dla zgodności z view
+            }
+
+        return self._list(self.db.players, match, {"name": 1, "_id": 1}, stages,
+                          limit=limit, key=lambda x: (x["name"], str(x["_id"])), convert=convert)
+
+    def get_players_many(self, ids: Iterable[str]) -> dict[str, dict]:
         pipeline = [
-            {"$match": {"_id": oid(player_id)}},
+            {"$match": {"_id": {"$in": oids(ids)}}},
             {"$lookup": {"from": "countries", "localField": "nationalityId", "foreignField": "_id", "as": "nat"}},
             {"$unwind": {"path": "$nat", "preserveNullAndEmptyArrays": True}},
             {"$project": {"_id": 1, "name": 1, "position": 1, "currentTeamId": 1, "nationality": "$nat.name"}},
         ]
-        out = list(self.db.players.aggregate(pipeline))
-        if not out:
-            return None
-        x = str_id(out[0])
-        return {
-            "id": x["id"],
-            "name": x.get("name"),
-            "position": x.get("position"),
-            "nationality": x.get("nationality"),
-            "currentTeamId": x.get("currentTeamId"),
-            "team_id": str(x.get("currentTeamId")) if x.get("currentTeamId") else None,
-        }
+        out = {}
+        for doc in self.db.players.aggregate(pipeline):
+            x = str_id(doc)
+            out[x["id"]] = {
+                "id": x["id"],
+                "name": x.get("name"),
+                "position": x.get("position"),
+                "nationality": x.get("nationality"),
+                "currentTeamId": x.get("currentTeamId"),
+                "team_id": str(x.get("currentTeamId")) if x.get("currentTeamId") else None,
+            }
+        return out
+
+    def get_player(self, player_id: str):
+        return next(iter(self.get_players_many([player_id]).values()), None)
 
     def team_players(self, team_id: str):
         return [str_id(x) for x in self.db.players.find({"currentTeamId": oid(team_id)}, {"name": 1, "position": 1})]
 
     # ---- Matches ----
-    def list_matches(self, *, q: Optional[str] = None, filters=None):
-        pipeline = [
+    def list_matches(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
+        match: dict[str, Any] = self._match("matches", filters)
+        if q:
+            # nazwy drużyn nie są osadzone w meczu – najpierw id drużyn po nazwie (jak SPECS["matches"] w SQL)
+            team_ids = [d["_id"] for d in self.db.teams.find({"name": search.mongo_pattern(q)}, {"_id": 1})]
+            match.setdefault("$and", []).append(
+                {"$or": [{"homeTeamId": {"$in": team_ids}}, {"awayTeamId": {"$in": team_ids}}]}
+            )
+        if limit:
+            self._seek(match, cursor, "utcDate", cast=datetime.fromisoformat, desc=True)
+
+        # lookupy dopiero po $sort/$limit – łączymy tylko zwracaną stronę
+        stages = [
             {"$lookup": {"from": "teams", "localField": "homeTeamId", "foreignField": "_id", "as": "home"}},
             {"$lookup": {"from": "teams", "localField": "awayTeamId", "foreignField": "_id", "as": "away"}},
-            {"$unwind": "$home"},
-            {"$unwind": "$away"},
+            {"$unwind": {"path": "$home", "preserveNullAndEmptyArrays": True}},
+            {"$unwind": {"path": "$away", "preserveNullAndEmptyArrays": True}},
             {"$project": {"_id": 1, "utcDate": 1, "matchday": 1, "homeName": "$home.name", "awayName": "$away.name"}},
-            {"$sort": {"utcDate": -1}},
         ]
-        out = []
-        for x in self.db.matches.aggregate(pipeline):
+
+        def convert(x):
             x = str_id(x)
-            out.append(
-                {
-                    "id": x["id"],
-                    "utc_date": x["utcDate"].date().isoformat() if isinstance(x["utcDate"], datetime) else str(x["utcDate"]),
-                    "matchday": x["matchday"],
-                    "label": f'{x.get("homeName","HOME")} vs {x.get("awayName","AWAY")}',
-                }
-            )
+            return {
+                "id": x["id"],
+                "utc_date": x["utcDate"].date().isoformat() if isinstance(x["utcDate"], datetime) else str(x["utcDate"]),
+                "matchday": x["matchday"],
+                "label": f'{x.get("homeName","HOME")} vs {x.get("awayName","AWAY")}',
+            }
+
+        return self._list(self.db.matches, match, {"utcDate": -1, "_id": -1}, stages,
+                          limit=limit, key=lambda x: (x["utcDate"], str(x["_id"])), convert=convert)
+
+    def get_matches_many(self, ids: Iterable[str]) -> dict[str, dict]:
+        out = {}
+        for doc in self.db.matches.find({"_id": {"$in": oids(ids)}}):
+            d = str_id(doc)
+            out[d["id"]] = {
+                "id": d["id"],
+                "utc_date": d["utcDate"].date().isoformat(),
+                "matchday": d["matchday"],
+                "season": str(d.get("seasonId")),
+                "season_id": str(d.get("seasonId")),
+                "home_team_id": str(d["homeTeamId"]),
+                "away_team_id": str(d["awayTeamId"]),
+                "score": {
+                    "half_time": {"home": d["score"]["halfTime"]["home"], "away": d["score"]["halfTime"]["away"]},
+                    "full_time": {"home": d["score"]["fullTime"]["home"], "away": d["score"]["fullTime"]["away"]},
+                },
+                "statistics": d.get("statistics") or {},
+                "referees": [],
+            }
         return out
 
     def get_match(self, match_id: str):
-        doc = self.db.matches.find_one({"_id": oid(match_id)})
-        if not doc:
-            return None
-        d = str_id(doc)
-        return {
-            "id": d["id"],
-            "utc_date": d["utcDate"].date().isoformat(),
-            "matchday": d["matchday"],
-            "season": str(d.get("seasonId")),
-            "home_team_id": str(d["homeTeamId"]),
-            "away_team_id": str(d["awayTeamId"]),
-            "score": {
-                "half_time": {"home": d["score"]["halfTime"]["home"], "away": d["score"]["halfTime"]["away"]},
-                "full_time": {"home": d["score"]["fullTime"]["home"], "away": d["score"]["fullTime"]["away"]},
-            },
-            "statistics": d.get("statistics") or {},
-            "referees": [],
-        }
+        return next(iter(self.get_matches_many([match_id]).values()), None)
 
     def match_label(self, match: Mapping[str, Any]) -> str:
         return str(match.get("label") or "")
@@ -218,6 +370,7 @@ class MongoAdapter(LeagueRepo):
             },
         }
         res = self.db.leagues.insert_one(doc)
+        notify(self, "leagues", "create", res.inserted_id)
         return {**data, "id": str(res.inserted_id)}
 
     def update_league(self, league_id: str, data: Payload):
@@ -232,10 +385,12 @@ class MongoAdapter(LeagueRepo):
             {"_id": oid(league_id)},
             {"$set": update}
         )
+        notify(self, "leagues", "update", league_id)
         return self.get_league(league_id)
 
     def delete_league(self, league_id: str) -> bool:
-        self.db.leagues.delete_one({"_id": oid(league_id)})
+        if self.db.leagues.delete_one({"_id": oid(league_id)}).deleted_count:
+            notify(self, "leagues", "delete", league_id)
         return True
 
     def create_team(self, data: Payload):
@@ -278,6 +433,7 @@ class MongoAdapter(LeagueRepo):
                 doc["countryId"] = league.get("countryId")
 
         res = self.db.teams.insert_one(doc)
+        notify(self, "teams", "create", res.inserted_id)
         return {**data, "id": str(res.inserted_id)}
 
     def update_team(self, team_id: str, data: Payload):
@@ -315,10 +471,12 @@ class MongoAdapter(LeagueRepo):
         }
         
         self.db.teams.update_one({"_id": oid(team_id)}, {"$set": update})
+        notify(self, "teams", "update", team_id)
         return self.get_team(team_id)
 
     def delete_team(self, team_id: str) -> bool:
-        self.db.teams.delete_one({"_id": oid(team_id)})
+        if self.db.teams.delete_one({"_id": oid(team_id)}).deleted_count:
+            notify(self, "teams", "delete", team_id)
         return True
 
     def create_player(self, data: Payload):
@@ -330,6 +488,7 @@ class MongoAdapter(LeagueRepo):
             "currentTeamId": oid(data.get("team_id")) if data.get("team_id") else None,
         }
         res = self.db.players.insert_one(doc)
+        notify(self, "players", "create", res.inserted_id)
         return {**data, "id": str(res.inserted_id)}
 
     def update_player(self, player_id: str, data: Payload):
@@ -340,10 +499,12 @@ class MongoAdapter(LeagueRepo):
             "currentTeamId": oid(data.get("team_id")) if data.get("team_id") else None,
         }
         self.db.players.update_one({"_id": oid(player_id)}, {"$set": update})
+        notify(self, "players", "update", player_id)
         return self.get_player(player_id)
 
     def delete_player(self, player_id: str) -> bool:
-        self.db.players.delete_one({"_id": oid(player_id)})
+        if self.db.players.delete_one({"_id": oid(player_id)}).deleted_count:
+            notify(self, "players", "delete", player_id)
         return True
 
     def create_match(self, data: Payload):
@@ -362,6 +523,7 @@ class MongoAdapter(LeagueRepo):
             "referees": []
         }
         res = self.db.matches.insert_one(doc)
+        notify(self, "matches", "create", res.inserted_id)
         return {**data, "id": str(res.inserted_id)}
 
     def update_match(self, match_id: str, data: Payload):
@@ -375,12 +537,27 @@ class MongoAdapter(LeagueRepo):
             update["awayTeamId"] = oid(data.get("away_team_id"))
             
         self.db.matches.update_one({"_id": oid(match_id)}, {"$set": update})
+        notify(self, "matches", "update", match_id)
         return self.get_match(match_id)
 
     def delete_match(self, match_id: str) -> bool:
-        self.db.matches.delete_one({"_id": oid(match_id)})
+        if self.db.matches.delete_one({"_id": oid(match_id)}).deleted_count:
+            notify(self, "matches", "delete", match_id)
         return True
 
+    # ---- Counters (dashboard) ----
+    def count_leagues(self) -> int:
+        return self.counters.get("leagues", self.db.leagues.estimated_document_count)
+
+    def count_teams(self) -> int:
+        return self.counters.get("teams", self.db.teams.estimated_document_count)
+
+    def count_players(self) -> int:
+        return self.counters.get("players", self.db.players.estimated_document_count)
+
+    def count_matches(self) -> int:
+        return self.counters.get("matches", self.db.matches.estimated_document_count)
+
     # Helper methods for form dropdowns
     def list_countries(self) -> list[dict]:
         out = []
@@ -431,3 +608,83 @@ class MongoAdapter(LeagueRepo):
              l_name = x.get("league", {}).get("name", "Unknown")
              out.append({"id": x["id"], "year": x.get("year"), "league_name": l_name})
         return out
+
+    # opcje z pełnych list – coach/stadium są osadzone w drużynach, więc i tak potrzebny $group;
+    # wynik trzyma ReferenceCache, więc to koszt raz na unieważnienie
+    def team_options(self) -> list[tuple[str, str]]:
+        return [(str(t["_id"]), t.get("name", "")) for t in self.db.teams.find({}, {"name": 1}).sort("name", 1)]
+
+    def country_options(self) -> list[tuple[str, str]]:
+        return [(str(c["id"]), c["name"]) for c in self.list_countries()]
+
+    def coach_options(self) -> list[tuple[str, str]]:
+        return [(str(c["id"]), f'{c["name"]} ({c["nationality"]})' if c.get("nationality") else c["name"])
+                for c in self.list_coaches()]
+
+    def stadium_options(self) -> list[tuple[str, str]]:
+        return [(str(s["id"]), f'{s["name"]} - {s["location"]}' if s.get("location") else s["name"])
+                for s in self.list_stadiums()]
+
+    def season_options(self) -> list[tuple[str, str]]:
+        return [(str(s["id"]), f'{s["year"]} - {s["league_name"]}') for s in self.list_seasons()]
+
+    def search(self, q: str, *, entities: Sequence[str] = search.ENTITIES,
+               limit: int = search.DEFAULT_LIMIT) -> list[dict]:
+        if not q or not q.strip():
+            return []
+        limit = clamp_limit(limit)
+        hits = []
+        for entity in entities:
+            pipeline = [
+                {"$match": self._search(entity, q)},
+                {"$project": {"name": 1, "rank": search.mongo_rank(q)}},
+                {"$sort": {"rank": -1, "name": 1}},
+                {"$limit": limit},
+            ]
+            hits += [{"entity": entity, "id": str(x["_id"]), "label": x.get("name"), "rank": x["rank"]}
+                     for x in self.db[entity].aggregate(pipeline)]
+        hits.sort(key=lambda h: (-h["rank"], h["label"] or ""))
+        return hits[:limit]
+
+    def stream(self, entity: str, *, filters=None, batch_size: int = export.BATCH_SIZE) -> Iterator[dict]:
+        collection, stages, _ = export.MONGO[entity]
+        pipeline = [{"$match": self._match(entity, filters)}, {"$sort": {"_id": 1}}, *stages]
+        with self.db[collection].aggregate(pipeline, batchSize=batch_size) as cursor:
+            for doc in cursor:
+                yield export.from_mongo(entity, doc)
+
+    def natural_keys(self, kind: str) -> dict[Any, ObjectId]:
+        fields = bulk.NATURAL_KEYS_MONGO.get(kind)
+        if fields is None:
+            return {}
+        docs = self.db[kind].find({}, {f: 1 for f in fields})
+        return bulk.key_map((*(d.get(f) for f in fields), d["_id"]) for d in docs)
+
+    def bulk_insert(self, entity: str, rows: Sequence[Mapping[str, Any]]) -> int:
+        if entity == "scores":
+            # wynik jest osadzony w meczu
+            ops = [UpdateOne({"_id": r["match_id"]}, {"$set": {
+                "score.fullTime": {"home": r["full_time_home"], "away": r["full_time_away"]},
+                "score.halfTime": {"home": r["half_time_home"], "away": r["half_time_away"]},
+            }}) for r in rows]
+            return self.db.matches.bulk_write(ops, ordered=False).matched_count
+        if entity in _EMBEDDED:
+            collection, key, field, to_doc = _EMBEDDED[entity]
+            # jedno $push z $each na dokument nadrzędny zamiast aktualizacji per wiersz
+            grouped: dict[Any, list[dict]] = {}
+            for r in rows:
+                grouped.setdefault(r[key], []).append(to_doc(r))
+            ops = [UpdateOne({"_id": parent}, {"$push": {field: {"$each": items}}}) for parent, items in grouped.items()]
+            matched = self.db[collection].bulk_write(ops, ordered=False).matched_count
+            # brak części dokumentów nadrzędnych: raportujemy dopasowane dokumenty, nie wiersze
+            return len(rows) if matched == len(ops) else matched
+        docs = [_import_doc(entity, r) for r in rows]
+        try:
+            return len(self.db[entity].insert_many(docs, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            # ordered=False: reszta paczki jest zapisana, odrzucone (duplikaty, walidator) tylko raportujemy
+            errors = e.details.get("writeErrors", [])
+            if errors:
+                logger.warning("import %s: %d documents rejected, first: %s",
+                               entity, len(errors), errors[0].get("errmsg"))
+            return e.details.get("nInserted", 0)
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Mapping, Optional, Sequence
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
 from urllib.parse import urlparse
 import mysql.connector
 
 from ..base import LeagueRepo, Payload
+from ..counters import CounterStore
+from ..filters import to_sql
+from ..instrument import traced
+from .. import bulk, export, search
+from ..pagination import clamp_limit, decode_cursor, make_page
+from ..pool import ConnectionPool
+from ..signals import notify
+from .. import slowlog
 
 
+def _ping(conn) -> bool:
+    return conn.is_connected()
+
+
+def _reset(conn) -> None:
+    # nie oddajemy do puli połączenia z otwartą transakcją – kolejne
+    # wypożyczenie czytałoby stary snapshot (REPEATABLE READ) i trzymało locki
+    if conn.in_transaction:
+        conn.rollback()
+
+
+@traced("mysql")
 class MysqlAdapter(LeagueRepo):
-    def __init__(self, uri: str):
+    def __init__(self, uri: str, pool: Optional[Mapping[str, Any]] = None):
         parsed = urlparse(uri)
         self.config = {
             'user': parsed.username,
@@ -19,75 +40,141 @@ class MysqlAdapter(LeagueRepo):
             'database': parsed.path.lstrip('/'),
             'autocommit': False,
         }
+        self.counters = CounterStore(self)
+
+        # pool=None -> połączenie per zapytanie (stare zachowanie)
+        self.pool = None
+        if pool:
+            pool = dict(pool)
+            warmup = pool.pop("warmup", True)
+            # w puli SELECT-y nie mogą zostawiać otwartych transakcji;
+            # zapisy i tak są pojedynczymi instrukcjami z commit w _execute
+            self.config['autocommit'] = True
+            self.pool = ConnectionPool(self._connect, check=_ping, reset=_reset, name="mysql", **pool)
+            if warmup:
+                # nie blokujemy startu workera – połączenia otwierają się w tle
+                self.pool.warmup(background=True)
+
+    def _connect(self):
+        return mysql.connector.connect(**self.config)
 
+    @contextmanager
+    def _get_connection(self):
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+            return
+        conn = self._connect()
         try:
-            conn = self._get_connection()
+            yield conn
+        finally:
             conn.close()
-            print(f"Connected to MySQL: {parsed.hostname}")
-        except Exception as e:
-            print(f"MySQL connection failed: {e}")
 
-    def _get_connection(self):
-        return mysql.connector.connect(**self.config)
+    def pool_stats(self) -> Optional[dict[str, Any]]:
+        return self.pool.stats() if self.pool is not None else None
 
     def _fetchall(self, query: str, params: tuple = None) -> list[dict]:
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor(dictionary=True) as cur:
-                cur.execute(query, params or ())
-                return cur.fetchall()
-        finally:
-            conn.close()
+                with slowlog.timed("mysql", query, lambda: self._explain(query, params)):
+                    cur.execute(query, params or ())
+                    return cur.fetchall()
 
     def _fetchone(self, query: str, params: tuple = None) -> dict | None:
-        conn = self._get_connection()
-        try:
+        with self._get_connection() as conn:
             with conn.cursor(dictionary=True) as cur:
-                cur.execute(query, params or ())
-                return cur.fetchone()
-        finally:
-            conn.close()
+                with slowlog.timed("mysql", query, lambda: self._explain(query, params)):
+                    cur.execute(query, params or ())
+                    return cur.fetchone()
 
-    def _execute(self, query: str, params: tuple = None) -> int:
-        """Executes query, commits, and returns lastrowid (for auto_increment)."""
-        conn = self._get_connection()
-        try:
+    def _explain(self, query: str, params: tuple = None) -> str:
+        """Plan for the slow-query log (slowlog): EXPLAIN ANALYZE (MySQL 8.0.18+), tree format."""
+        with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, params or ())
-                last_id = cur.lastrowid
-            conn.commit()
-            return last_id
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+                cur.execute("EXPLAIN ANALYZE " + query, params or ())
+                return "\n".join(str(r[0]) for r in cur.fetchall())
 
-    def list_leagues(self, *, q: Optional[str] = None, filters=None) -> Sequence[Mapping[str, Any]]:
+    def _execute(self, query: str, params: tuple = None, *, rowcount: bool = False) -> int:
+        """Executes query, commits, and returns lastrowid (for auto_increment) or rowcount."""
+        with self._get_connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    with slowlog.timed("mysql", query):
+                        cur.execute(query, params or ())
+                    result = cur.rowcount if rowcount else cur.lastrowid
+                conn.commit()
+                return result
+            except Exception:
+                conn.rollback()
+                raise
+
+    def _list(self, sql: str, where: list[str], params: list, *, order_by: str,
+              limit: Optional[int] = None, key=None, convert=None):
+        """Runs a list query; with ``limit`` fetches one extra row and returns a Page."""
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + order_by
+        if limit:
+            limit = clamp_limit(limit)
+            sql += " LIMIT %s"
+            rows = self._fetchall(sql, (*params, limit + 1))
+            return make_page(rows, limit, key, convert or (lambda r: r))
+        rows = self._fetchall(sql, tuple(params))
+        return [convert(r) for r in rows] if convert else rows
+
+    @staticmethod
+    def _seek_name(where: list[str], params: list, cursor: Optional[str], name_col: str, id_col: str) -> None:
+        """Keyset condition for lists ordered by (name, id).
+
+        Spelled out instead of a row comparison so MySQL can use a range scan.
+        """
+        after = decode_cursor(cursor, str, int)
+        if after:
+            name, last_id = after
+            where.append(f"({name_col} > %s OR ({name_col} = %s AND {id_col} > %s))")
+            params.extend([name, name, last_id])
+
+    def _many(self, sql: str, id_col: str, ids: Iterable[Any], convert=dict) -> dict[str, Any]:
+        """One round trip for many ids: ``WHERE id_col IN (...)``, result keyed by str id."""
+        int_ids = []
+        for i in ids:
+            try:
+                int_ids.append(int(i))
+            except (TypeError, ValueError):
+                continue
+        if not int_ids:
+            return {}
+        marks = ", ".join(["%s"] * len(int_ids))
+        rows = self._fetchall(f"{sql} WHERE {id_col} IN ({marks})", tuple(int_ids))
+        return {str(r["id"]): convert(r) for r in rows}
+
+    def list_leagues(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None) -> Sequence[Mapping[str, Any]]:
         sql = """
               SELECT l.league_id as id, l.name, c.name as country
               FROM leagues l
                        LEFT JOIN countries c ON l.country_id = c.country_id \
               """
-        params = []
+        where, params = to_sql("leagues", filters)
         if q:
-            sql += " WHERE l.name LIKE %s"
-            params.append(f"%{q}%")
+            clause, values = search.mysql_match("leagues", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "l.name", "l.league_id")
 
-        sql += " ORDER BY l.name"
-        return self._fetchall(sql, tuple(params))
+        return self._list(sql, where, params, order_by="l.name, l.league_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
 
-    def get_league(self, league_id: str):
+    def get_leagues_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT l.league_id as id, l.name, l.country_id, c.name as country
               FROM leagues l
-                       LEFT JOIN countries c ON l.country_id = c.country_id
-              WHERE l.league_id = %s \
+                       LEFT JOIN countries c ON l.country_id = c.country_id \
               """
-        try:
-            return self._fetchone(sql, (int(league_id),))
-        except ValueError:
-            return None
+        return self._many(sql, "l.league_id", ids)
+
+    def get_league(self, league_id: str):
+        return next(iter(self.get_leagues_many([league_id]).values()), None)
 
     def create_league(self, data: Payload):
         country_id = data.get("country_id")
@@ -97,7 +184,8 @@ class MysqlAdapter(LeagueRepo):
             country_id = None
 
         sql = "INSERT INTO leagues (name, country_id) VALUES (%s, %s)"
-        self._execute(sql, (data.get("name"), country_id))
+        new_id = self._execute(sql, (data.get("name"), country_id))
+        notify(self, "leagues", "create", new_id)
 
     def update_league(self, league_id: str, data: Payload):
         country_id = data.get("country_id")
@@ -108,36 +196,38 @@ class MysqlAdapter(LeagueRepo):
         
         sql = "UPDATE leagues SET name = %s, country_id = %s WHERE league_id = %s"
         self._execute(sql, (data.get("name"), country_id, int(league_id)))
+        notify(self, "leagues", "update", league_id)
 
     def delete_league(self, league_id: str) -> bool:
-        self._execute("DELETE FROM leagues WHERE league_id = %s", (int(league_id),))
+        if self._execute("DELETE FROM leagues WHERE league_id = %s", (int(league_id),), rowcount=True):
+            notify(self, "leagues", "delete", league_id)
         return True
 
-    def list_teams(self, *, q: Optional[str] = None, filters=None):
+    def list_teams(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT t.team_id as id, \
                      t.name, \
                      t.founded_year, \
                      c.name    as coach, \
                      s.name    as stadium, \
-                     (SELECT sn.league_id
-                      FROM standings st
-                               JOIN seasons sn ON st.season_id = sn.season_id
-                      WHERE st.team_id = t.team_id
-                      ORDER BY sn.year DESC
-                      LIMIT 1) as league_id
+                     tcl.league_id as league_id
               FROM teams t
                        LEFT JOIN coaches c ON t.coach_id = c.coach_id
-                       LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id \
+                       LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id
+                       LEFT JOIN team_current_league tcl ON tcl.team_id = t.team_id \
               """
-        params = []
+        where, params = to_sql("teams", filters)
         if q:
-            sql += " WHERE t.name LIKE %s"
-            params.append(f"%{q}%")
-        sql += " ORDER BY t.name"
-        return self._fetchall(sql, tuple(params))
+            clause, values = search.mysql_match("teams", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "t.name", "t.team_id")
 
-    def get_team(self, team_id: str):
+        return self._list(sql, where, params, order_by="t.name, t.team_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
+
+    def get_teams_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT t.team_id as id, \
                      t.name, \
@@ -146,21 +236,16 @@ class MysqlAdapter(LeagueRepo):
                      t.stadium_id, \
                      c.name    as coach, \
                      s.name    as stadium, \
-                     (SELECT sn.league_id
-                      FROM standings st
-                               JOIN seasons sn ON st.season_id = sn.season_id
-                      WHERE st.team_id = t.team_id
-                      ORDER BY sn.year DESC
-                      LIMIT 1) as league_id
+                     tcl.league_id as league_id
               FROM teams t
                        LEFT JOIN coaches c ON t.coach_id = c.coach_id
                        LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id
-              WHERE t.team_id = %s \
+                       LEFT JOIN team_current_league tcl ON tcl.team_id = t.team_id \
               """
-        try:
-            return self._fetchone(sql, (int(team_id),))
-        except ValueError:
-            return None
+        return self._many(sql, "t.team_id", ids)
+
+    def get_team(self, team_id: str):
+        return next(iter(self.get_teams_many([team_id]).values()), None)
 
     def create_team(self, data: Payload):
         founded = int(data["founded_year"]) if data.get("founded_year") else None
@@ -168,7 +253,8 @@ class MysqlAdapter(LeagueRepo):
         stadium_id = int(data["stadium_id"]) if data.get("stadium_id") else None
         
         sql = "INSERT INTO teams (name, founded_year, coach_id, stadium_id) VALUES (%s, %s, %s, %s)"
-        self._execute(sql, (data.get("name"), founded, coach_id, stadium_id))
+        new_id = self._execute(sql, (data.get("name"), founded, coach_id, stadium_id))
+        notify(self, "teams", "create", new_id)
 
     def update_team(self, team_id: str, data: Payload):
         founded = int(data["founded_year"]) if data.get("founded_year") else None
@@ -177,12 +263,14 @@ class MysqlAdapter(LeagueRepo):
         
         sql = "UPDATE teams SET name = %s, founded_year = %s, coach_id = %s, stadium_id = %s WHERE team_id = %s"
         self._execute(sql, (data.get("name"), founded, coach_id, stadium_id, int(team_id)))
+        notify(self, "teams", "update", team_id)
 
     def delete_team(self, team_id: str) -> bool:
-        self._execute("DELETE FROM teams WHERE team_id = %s", (int(team_id),))
+        if self._execute("DELETE FROM teams WHERE team_id = %s", (int(team_id),), rowcount=True):
+            notify(self, "teams", "delete", team_id)
         return True
 
-    def list_players(self, *, q: Optional[str] = None, filters=None):
+    def list_players(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT p.player_id as id, \
                      p.name, \
@@ -193,14 +281,18 @@ class MysqlAdapter(LeagueRepo):
               FROM players p
                        LEFT JOIN countries cn ON p.nationality_id = cn.country_id \
               """
-        params = []
+        where, params = to_sql("players", filters)
         if q:
-            sql += " WHERE p.name LIKE %s"
-            params.append(f"%{q}%")
-        sql += " ORDER BY p.name"
-        return self._fetchall(sql, tuple(params))
+            clause, values = search.mysql_match("players", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "p.name", "p.player_id")
 
-    def get_player(self, player_id: str):
+        return self._list(sql, where, params, order_by="p.name, p.player_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
+
+    def get_players_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT p.player_id as id, \
                      p.name, \
@@ -210,13 +302,12 @@ class MysqlAdapter(LeagueRepo):
                      p.team_id, \
                      p.team_id   as currentTeamId
               FROM players p
-                       LEFT JOIN countries cn ON p.nationality_id = cn.country_id
-              WHERE p.player_id = %s \
+                       LEFT JOIN countries cn ON p.nationality_id = cn.country_id \
               """
-        try:
-            return self._fetchone(sql, (int(player_id),))
-        except ValueError:
-            return None
+        return self._many(sql, "p.player_id", ids)
+
+    def get_player(self, player_id: str):
+        return next(iter(self.get_players_many([player_id]).values()), None)
 
     def team_players(self, team_id: str):
         sql = "SELECT player_id as id, name, position FROM players WHERE team_id = %s"
@@ -225,7 +316,7 @@ class MysqlAdapter(LeagueRepo):
         except ValueError:
             return []
 
-    def list_matches(self, *, q: Optional[str] = None, filters=None):
+    def list_matches(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT m.match_id as id, \
                      m.utc_date, \
@@ -236,27 +327,43 @@ class MysqlAdapter(LeagueRepo):
               FROM matches m
                        JOIN teams ht ON m.home_team_id = ht.team_id
                        JOIN teams at ON m.away_team_id = at.team_id
-                       JOIN seasons sn ON m.season_id = sn.season_id
-              ORDER BY m.utc_date DESC \
+                       JOIN seasons sn ON m.season_id = sn.season_id \
               """
-        rows = self._fetchall(sql)
-
-        out = []
-        for r in rows:
-            out.append({
+        where, params = to_sql("matches", filters)
+        if q:
+            # drużyny po nazwie, mecze przez (home|away_team_id, utc_date)
+            clause, values = search.mysql_match("matches", q)
+            where.append(clause)
+            params += values
+        after = decode_cursor(cursor, str, int) if limit else None
+        if after:
+            day, mid = after
+            # utc_date może być NULL – w MySQL przy DESC takie mecze są na końcu
+            if day is None:
+                where.append("(m.utc_date IS NULL AND m.match_id < %s)")
+                params.append(mid)
+            else:
+                where.append("(m.utc_date < %s OR (m.utc_date = %s AND m.match_id < %s) OR m.utc_date IS NULL)")
+                params.extend([day, day, mid])
+
+        def convert(r):
+            return {
                 "id": str(r["id"]),
                 "utc_date": str(r["utc_date"]) if r["utc_date"] else None,
                 "matchday": r["matchday"],
                 "label": f"[{r['season_name']}] {r['home_name']} vs {r['away_name']}",
-            })
-        return out
+            }
 
-    def get_match(self, match_id: str):
+        return self._list(sql, where, params, order_by="m.utc_date DESC, m.match_id DESC",
+                          limit=limit, key=lambda r: (r["utc_date"], r["id"]), convert=convert)
+
+    def get_matches_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT m.match_id                       as id, \
                      m.utc_date, \
                      m.matchday, \
                      sn.year                          as season_name, \
+                     m.season_id, \
                      m.home_team_id, \
                      m.away_team_id, \
 
@@ -283,46 +390,44 @@ class MysqlAdapter(LeagueRepo):
 
               FROM matches m
                        JOIN seasons sn ON m.season_id = sn.season_id
-                       LEFT JOIN scores s ON m.match_id = s.match_id
-              WHERE m.match_id = %s \
+                       LEFT JOIN scores s ON m.match_id = s.match_id \
               """
-        try:
-            mid = int(match_id)
-        except ValueError:
-            return None
 
-        row = self._fetchone(sql, (mid,))
-        if not row:
-            return None
+        def convert(row):
+            stats = row["statistics_data"]
+            if isinstance(stats, (str, bytes)):
+                try:
+                    stats = json.loads(stats)
+                except:
+                    stats = {}
+
+            refs = row["referees_data"]
+            if isinstance(refs, (str, bytes)):
+                try:
+                    refs = json.loads(refs)
+                except:
+                    refs = []
+
+            return {
+                "id": str(row["id"]),
+                "utc_date": str(row["utc_date"]) if row["utc_date"] else None,
+                "matchday": row["matchday"],
+                "season": row["season_name"],
+                "season_id": str(row["season_id"]),
+                "home_team_id": str(row["home_team_id"]),
+                "away_team_id": str(row["away_team_id"]),
+                "score": {
+                    "full_time": {"home": row["full_time_home"], "away": row["full_time_away"]},
+                    "half_time": {"home": row["half_time_home"], "away": row["half_time_away"]},
+                },
+                "statistics": stats or {},
+                "referees": refs or [],
+            }
+
+        return self._many(sql, "m.match_id", ids, convert)
 
-        stats = row["statistics_data"]
-        if isinstance(stats, (str, bytes)):
-            try:
-                stats = json.loads(stats)
-            except:
-                stats = {}
-
-        refs = row["referees_data"]
-        if isinstance(refs, (str, bytes)):
-            try:
-                refs = json.loads(refs)
-            except:
-                refs = []
-
-        return {
-            "id": str(row["id"]),
-            "utc_date": str(row["utc_date"]) if row["utc_date"] else None,
-            "matchday": row["matchday"],
-            "season": row["season_name"],
-            "home_team_id": str(row["home_team_id"]),
-            "away_team_id": str(row["away_team_id"]),
-            "score": {
-                "full_time": {"home": row["full_time_home"], "away": row["full_time_away"]},
-                "half_time": {"home": row["half_time_home"], "away": row["half_time_away"]},
-            },
-            "statistics": stats or {},
-            "referees": refs or [],
-        }
+    def get_match(self, match_id: str):
+        return next(iter(self.get_matches_many([match_id]).values()), None)
 
     def match_label(self, match: Mapping[str, Any]) -> str:
         return str(match.get("label", ""))
@@ -335,6 +440,7 @@ class MysqlAdapter(LeagueRepo):
         
         sql = "INSERT INTO players (name, position, team_id, nationality_id) VALUES (%s, %s, %s, %s)"
         new_id = self._execute(sql, (name, position, team_id, nationality_id))
+        notify(self, "players", "create", new_id)
         return {"id": str(new_id), "name": name, "position": position}
 
     def update_player(self, player_id: str, data: Payload):
@@ -345,10 +451,12 @@ class MysqlAdapter(LeagueRepo):
         
         sql = "UPDATE players SET name = %s, position = %s, team_id = %s, nationality_id = %s WHERE player_id = %s"
         self._execute(sql, (name, position, team_id, nationality_id, int(player_id)))
+        notify(self, "players", "update", player_id)
         return self.get_player(player_id)
 
     def delete_player(self, player_id: str) -> bool:
-        self._execute("DELETE FROM players WHERE player_id = %s", (int(player_id),))
+        if self._execute("DELETE FROM players WHERE player_id = %s", (int(player_id),), rowcount=True):
+            notify(self, "players", "delete", player_id)
         return True
 
     def create_match(self, data: Payload):
@@ -363,6 +471,7 @@ class MysqlAdapter(LeagueRepo):
               VALUES (%s, %s, %s, %s, %s)
               """
         new_id = self._execute(sql, (utc_date, matchday, home_team_id, away_team_id, season_id))
+        notify(self, "matches", "create", new_id)
         return {"id": str(new_id), "utc_date": utc_date, "matchday": matchday}
 
     def update_match(self, match_id: str, data: Payload):
@@ -381,14 +490,32 @@ class MysqlAdapter(LeagueRepo):
         else:
             sql = "UPDATE matches SET utc_date = %s, matchday = %s WHERE match_id = %s"
             self._execute(sql, (utc_date, matchday, int(match_id)))
+        notify(self, "matches", "update", match_id)
         return self.get_match(match_id)
 
     def delete_match(self, match_id: str) -> bool:
-        self._execute("DELETE FROM matches WHERE match_id = %s", (int(match_id),))
+        if self._execute("DELETE FROM matches WHERE match_id = %s", (int(match_id),), rowcount=True):
+            notify(self, "matches", "delete", match_id)
         return True
 
 
     
+    # ---- Counters (dashboard) ----
+    def _count(self, table: str) -> int:
+        return self._fetchone(f"SELECT COUNT(*) AS n FROM {table}")["n"]
+
+    def count_leagues(self) -> int:
+        return self.counters.get("leagues", lambda: self._count("leagues"))
+
+    def count_teams(self) -> int:
+        return self.counters.get("teams", lambda: self._count("teams"))
+
+    def count_players(self) -> int:
+        return self.counters.get("players", lambda: self._count("players"))
+
+    def count_matches(self) -> int:
+        return self.counters.get("matches", lambda: self._count("matches"))
+
     def list_countries(self) -> list[dict]:
         sql = "SELECT country_id as id, name FROM countries ORDER BY name"
         return self._fetchall(sql)
@@ -414,3 +541,89 @@ class MysqlAdapter(LeagueRepo):
               ORDER BY s.year DESC, l.name
               """
         return self._fetchall(sql)
+
+    def _options(self, sql: str) -> list[tuple[str, str]]:
+        return [(str(r["id"]), r["label"]) for r in self._fetchall(sql)]
+
+    def team_options(self) -> list[tuple[str, str]]:
+        return self._options("SELECT team_id AS id, name AS label FROM teams ORDER BY name")
+
+    def country_options(self) -> list[tuple[str, str]]:
+        return self._options("SELECT country_id AS id, name AS label FROM countries ORDER BY name")
+
+    def coach_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT c.coach_id AS id, CONCAT(c.name, COALESCE(CONCAT(' (', cn.name, ')'), '')) AS label
+            FROM coaches c
+            LEFT JOIN countries cn ON c.nationality_id = cn.country_id
+            ORDER BY c.name
+        """)
+
+    def stadium_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT stadium_id AS id, CONCAT(name, COALESCE(CONCAT(' - ', location), '')) AS label
+            FROM stadiums ORDER BY name
+        """)
+
+    def season_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT s.season_id AS id, CONCAT(s.year, ' - ', l.name) AS label
+            FROM seasons s
+            JOIN leagues l ON s.league_id = l.league_id
+            ORDER BY s.year DESC, l.name
+        """)
+
+    def search(self, q: str, *, entities: Sequence[str] = search.ENTITIES,
+               limit: int = search.DEFAULT_LIMIT) -> list[dict]:
+        if not q or not q.strip():
+            return []
+        sql, params = search.mysql_search(tuple(entities), q, clamp_limit(limit))
+        return [dict(r, rank=float(r["rank"])) for r in self._fetchall(sql, tuple(params))]
+
+    def stream(self, entity: str, *, filters=None, batch_size: int = export.BATCH_SIZE) -> Iterator[dict]:
+        query, params = export.sql(entity, filters)
+        # własne połączenie: przerwany eksport zostawia nieprzeczytany wynik,
+        # takiego połączenia nie można oddać do puli
+        conn = self._connect()
+        try:
+            cur = conn.cursor(dictionary=True, buffered=False)
+            cur.execute(query, params)
+            while rows := cur.fetchmany(batch_size):
+                yield from rows
+        finally:
+            conn.close()
+
+    def natural_keys(self, kind: str) -> dict[Any, int]:
+        return bulk.key_map(self._fetchall(bulk.NATURAL_KEYS_SQL[kind]))
+
+    @staticmethod
+    def _insert_form(cur, rows: Sequence[Mapping[str, Any]]) -> None:
+        """Form of freshly inserted standings -> ``standings_form`` rows (same transaction)."""
+        if not any(r["form"] for r in rows):
+            return
+        pairs = ", ".join(["(%s, %s)"] * len(rows))
+        cur.execute(f"SELECT season_id, team_id, standing_id FROM standings WHERE (season_id, team_id) IN ({pairs})",
+                    [v for r in rows for v in (r["season_id"], r["team_id"])])
+        ids = bulk.key_map(cur.fetchall())
+        form = [(ids[(r["season_id"], r["team_id"])], result, order)
+                for r in rows for order, result in enumerate(r["form"], 1)]
+        cur.executemany("INSERT INTO standings_form (standing_id, result, sequence_order) VALUES (%s, %s, %s)", form)
+
+    def bulk_insert(self, entity: str, rows: Sequence[Mapping[str, Any]]) -> int:
+        table, columns = bulk.TABLES[entity]
+        placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        query = (f"INSERT INTO {table} ({', '.join(f'`{c}`' for c in columns)}) VALUES "
+                 + ", ".join([placeholders] * len(rows)))
+        params = [r[c] for r in rows for c in columns]
+        # własne połączenie na paczkę (równoległe wątki importu), jeden commit na paczkę
+        conn = self._connect()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                inserted = cur.rowcount
+                if entity == "standings":
+                    self._insert_form(cur, rows)
+            conn.commit()
+            return inserted
+        finally:
+            conn.close()
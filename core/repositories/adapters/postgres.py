@@ -1,45 +1,135 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Sequence, cast
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, cast
 import psycopg2
 from psycopg2.extras import RealDictCursor
+import csv
+import io
 import json
 
 from ..base import LeagueRepo, Payload
+from ..counters import CounterStore
+from ..filters import to_sql
+from ..instrument import traced
+from .. import bulk, export, search
+from ..pagination import clamp_limit, decode_cursor, make_page
+from ..pool import ConnectionPool
+from ..signals import notify
+from .. import slowlog
 
 
+def _ping(conn) -> bool:
+    if conn.closed:
+        return False
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1")
+        cur.fetchone()
+    return True
+
+
+def _score(home: Optional[int], away: Optional[int]) -> Optional[str]:
+    if home is None and away is None:
+        return None
+    return f"({'' if home is None else home},{'' if away is None else away})"
+
+
+@traced("postgres")
 class PostgresAdapter(LeagueRepo):
-    def __init__(self, dsn: str):
+    def __init__(self, dsn: str, pool: Optional[Mapping[str, Any]] = None):
         self.dsn = dsn
+        # pool=None -> połączenie per zapytanie (stare zachowanie)
+        self.pool = ConnectionPool(self._connect, check=_ping, name="postgres", **pool) if pool else None
+        self.counters = CounterStore(self)
 
-    def _get_connection(self):
+    def _connect(self):
         conn = psycopg2.connect(self.dsn)
         conn.autocommit = True
         return conn
 
+    @contextmanager
+    def _get_connection(self):
+        if self.pool is not None:
+            with self.pool.connection() as conn:
+                yield conn
+            return
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def pool_stats(self) -> Optional[dict[str, Any]]:
+        return self.pool.stats() if self.pool is not None else None
+
     def _fetchall(self, query: str, params: tuple = None) -> list[dict]:
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params or ())
-                return cur.fetchall()
+                with slowlog.timed("postgres", query, lambda: self._explain(query, params)):
+                    cur.execute(query, params or ())
+                    return cur.fetchall()
 
     def _fetchone(self, query: str, params: tuple = None) -> dict | None:
         with self._get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, params or ())
-                return cur.fetchone()
+                with slowlog.timed("postgres", query, lambda: self._explain(query, params)):
+                    cur.execute(query, params or ())
+                    return cur.fetchone()
 
     def _execute(self, query: str, params: tuple = None) -> Any:
         """Executes query and returns the first column of the first row if available (e.g. ID)."""
         with self._get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, params or ())
+                with slowlog.timed("postgres", query):
+                    cur.execute(query, params or ())
                 try:
                     return cur.fetchone()[0]
                 except (psycopg2.ProgrammingError, TypeError):
                     return None
 
-    def list_leagues(self, *, q: Optional[str] = None, filters=None) -> Sequence[Mapping[str, Any]]:
+    def _explain(self, query: str, params: tuple = None) -> str:
+        """Plan for the slow-query log (slowlog): EXPLAIN (ANALYZE, BUFFERS), text format."""
+        with self._get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query, params or ())
+                return "\n".join(r[0] for r in cur.fetchall())
+
+    def _list(self, sql: str, where: list[str], params: list, *, order_by: str,
+              limit: Optional[int] = None, key=None, convert=None):
+        """Runs a list query; with ``limit`` fetches one extra row and returns a Page."""
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + order_by
+        if limit:
+            limit = clamp_limit(limit)
+            sql += " LIMIT %s"
+            rows = self._fetchall(sql, (*params, limit + 1))
+            return make_page(rows, limit, key, convert or (lambda r: r))
+        rows = self._fetchall(sql, tuple(params))
+        return [convert(r) for r in rows] if convert else rows
+
+    @staticmethod
+    def _seek_name(where: list[str], params: list, cursor: Optional[str], name_col: str, id_col: str) -> None:
+        """Keyset condition for lists ordered by (name, id)."""
+        after = decode_cursor(cursor, str, int)
+        if after:
+            where.append(f"({name_col}, {id_col}) > (%s, %s)")
+            params.extend(after)
+
+    def _many(self, sql: str, id_col: str, ids: Iterable[Any], convert=dict) -> dict[str, Any]:
+        """One round trip for many ids: ``WHERE id_col = ANY(%s)``, result keyed by str id."""
+        int_ids = []
+        for i in ids:
+            try:
+                int_ids.append(int(i))
+            except (TypeError, ValueError):
+                continue
+        if not int_ids:
+            return {}
+        rows = self._fetchall(f"{sql} WHERE {id_col} = ANY(%s)", (int_ids,))
+        return {str(r["id"]): convert(r) for r in rows}
+
+    def list_leagues(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None) -> Sequence[Mapping[str, Any]]:
         sql = """
             SELECT 
                 l.league_id as id, 
@@ -48,17 +138,19 @@ class PostgresAdapter(LeagueRepo):
             FROM leagues l
             LEFT JOIN countries c ON l.country_id = c.country_id
         """
-        params = []
+        where, params = to_sql("leagues", filters)
 
         if q:
-            sql += " WHERE l.name ILIKE %s"
-            params.append(f"%{q}%")
-
-        sql += " ORDER BY l.name"
+            clause, values = search.pg_match("leagues", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "l.name", "l.league_id")
 
-        return self._fetchall(sql, tuple(params))
+        return self._list(sql, where, params, order_by="l.name, l.league_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
 
-    def get_league(self, league_id: str):
+    def get_leagues_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
             SELECT 
                 l.league_id as id, 
@@ -67,14 +159,11 @@ class PostgresAdapter(LeagueRepo):
                 c.name as country
             FROM leagues l
             LEFT JOIN countries c ON l.country_id = c.country_id
-            WHERE l.league_id = %s
         """
-        try:
-            lid = int(league_id)
-        except ValueError:
-            return None
+        return self._many(sql, "l.league_id", ids)
 
-        return self._fetchone(sql, (lid,))
+    def get_league(self, league_id: str):
+        return next(iter(self.get_leagues_many([league_id]).values()), None)
 
     def create_league(self, data: Payload):
         country_id = data.get("country_id")
@@ -85,6 +174,7 @@ class PostgresAdapter(LeagueRepo):
 
         sql = "INSERT INTO leagues (name, country_id) VALUES (%s, %s) RETURNING league_id"
         new_id = self._execute(sql, (data.get("name"), country_id))
+        notify(self, "leagues", "create", new_id)
         return {**data, "id": str(new_id)}
 
     def update_league(self, league_id: str, data: Payload):
@@ -96,38 +186,40 @@ class PostgresAdapter(LeagueRepo):
         
         sql = "UPDATE leagues SET name = %s, country_id = %s WHERE league_id = %s"
         self._execute(sql, (data.get("name"), country_id, int(league_id)))
+        notify(self, "leagues", "update", league_id)
         return self.get_league(league_id)
 
     def delete_league(self, league_id: str) -> bool:
-        self._execute("DELETE FROM leagues WHERE league_id = %s", (int(league_id),))
+        deleted = self._execute("DELETE FROM leagues WHERE league_id = %s RETURNING league_id", (int(league_id),))
+        if deleted is not None:
+            notify(self, "leagues", "delete", league_id)
         return True
 
-    def list_teams(self, *, q: Optional[str] = None, filters=None):
+    def list_teams(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT t.team_id::text as id, t.name, \
                      t.founded_year, \
                      c.name as coach, \
                      s.name as stadium, \
-                     (SELECT sn.league_id::text
-                      FROM standings st
-                               JOIN seasons sn ON st.season_id = sn.season_id
-                      WHERE st.team_id = t.team_id
-                      ORDER BY sn.year DESC \
-                               LIMIT 1 ) as league_id
+                     tcl.league_id::text as league_id
               FROM teams t
                   LEFT JOIN coaches c \
               ON t.coach_id = c.coach_id
-                  LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id \
+                  LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id
+                  LEFT JOIN team_current_league tcl ON tcl.team_id = t.team_id \
               """
-        params = []
+        where, params = to_sql("teams", filters)
         if q:
-            sql += " WHERE t.name ILIKE %s"
-            params.append(f"%{q}%")
+            clause, values = search.pg_match("teams", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "t.name", "t.team_id")
 
-        sql += " ORDER BY t.name"
-        return self._fetchall(sql, tuple(params))
+        return self._list(sql, where, params, order_by="t.name, t.team_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
 
-    def get_team(self, team_id: str):
+    def get_teams_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT t.team_id::text as id, t.name, \
                      t.founded_year, \
@@ -135,24 +227,17 @@ class PostgresAdapter(LeagueRepo):
                      t.stadium_id, \
                      c.name as coach, \
                      s.name as stadium, \
-                     (SELECT sn.league_id::text
-                      FROM standings st
-                               JOIN seasons sn ON st.season_id = sn.season_id
-                      WHERE st.team_id = t.team_id
-                      ORDER BY sn.year DESC \
-                               LIMIT 1 ) as league_id
+                     tcl.league_id::text as league_id
               FROM teams t
                   LEFT JOIN coaches c \
               ON t.coach_id = c.coach_id
                   LEFT JOIN stadiums s ON t.stadium_id = s.stadium_id
-              WHERE t.team_id = %s \
+                  LEFT JOIN team_current_league tcl ON tcl.team_id = t.team_id \
               """
-        try:
-            tid = int(team_id)
-        except ValueError:
-            return None
+        return self._many(sql, "t.team_id", ids)
 
-        return self._fetchone(sql, (tid,))
+    def get_team(self, team_id: str):
+        return next(iter(self.get_teams_many([team_id]).values()), None)
 
     def create_team(self, data: Payload):
         founded = int(data["founded_year"]) if data.get("founded_year") else None
@@ -161,6 +246,7 @@ class PostgresAdapter(LeagueRepo):
         
         sql = "INSERT INTO teams (name, founded_year, coach_id, stadium_id) VALUES (%s, %s, %s, %s) RETURNING team_id"
         new_id = self._execute(sql, (data.get("name"), founded, coach_id, stadium_id))
+        notify(self, "teams", "create", new_id)
         return {**data, "id": str(new_id)}
 
     def update_team(self, team_id: str, data: Payload):
@@ -170,10 +256,13 @@ class PostgresAdapter(LeagueRepo):
         
         sql = "UPDATE teams SET name = %s, founded_year = %s, coach_id = %s, stadium_id = %s WHERE team_id = %s"
         self._execute(sql, (data.get("name"), founded, coach_id, stadium_id, int(team_id)))
+        notify(self, "teams", "update", team_id)
         return self.get_team(team_id)
 
     def delete_team(self, team_id: str) -> bool:
-        self._execute("DELETE FROM teams WHERE team_id = %s", (int(team_id),))
+        deleted = self._execute("DELETE FROM teams WHERE team_id = %s RETURNING team_id", (int(team_id),))
+        if deleted is not None:
+            notify(self, "teams", "delete", team_id)
         return True
 
     def team_players(self, team_id: str):
@@ -189,7 +278,7 @@ class PostgresAdapter(LeagueRepo):
             return []
         return self._fetchall(sql, (tid,))
 
-    def list_players(self, *, q: Optional[str] = None, filters=None):
+    def list_players(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT p.player_id::text as id, p.name, \
                      p.position, \
@@ -198,15 +287,18 @@ class PostgresAdapter(LeagueRepo):
               FROM players p
                        LEFT JOIN countries cn ON p.nationality_id = cn.country_id \
               """
-        params = []
+        where, params = to_sql("players", filters)
         if q:
-            sql += " WHERE p.name ILIKE %s"
-            params.append(f"%{q}%")
+            clause, values = search.pg_match("players", q)
+            where.append(clause)
+            params += values
+        if limit:
+            self._seek_name(where, params, cursor, "p.name", "p.player_id")
 
-        sql += " ORDER BY p.name"
-        return self._fetchall(sql, tuple(params))
+        return self._list(sql, where, params, order_by="p.name, p.player_id",
+                          limit=limit, key=lambda r: (r["name"], r["id"]))
 
-    def get_player(self, player_id: str):
+    def get_players_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT p.player_id::text as id, p.name, \
                      p.position, \
@@ -214,14 +306,12 @@ class PostgresAdapter(LeagueRepo):
                      cn.name as nationality, \
                      p.team_id::text as "team_id", p.team_id::text as "currentTeamId"
               FROM players p
-                       LEFT JOIN countries cn ON p.nationality_id = cn.country_id
-              WHERE p.player_id = %s \
+                       LEFT JOIN countries cn ON p.nationality_id = cn.country_id \
               """
-        try:
-            pid = int(player_id)
-        except ValueError:
-            return None
-        return self._fetchone(sql, (pid,))
+        return self._many(sql, "p.player_id", ids)
+
+    def get_player(self, player_id: str):
+        return next(iter(self.get_players_many([player_id]).values()), None)
 
     def create_player(self, data: Payload):
         name = data.get("name", "")
@@ -231,6 +321,7 @@ class PostgresAdapter(LeagueRepo):
         
         sql = "INSERT INTO players (name, position, team_id, nationality_id) VALUES (%s, %s, %s, %s) RETURNING player_id"
         new_id = self._execute(sql, (name, position, team_id, nationality_id))
+        notify(self, "players", "create", new_id)
         return {"id": str(new_id), "name": name, "position": position}
 
     def update_player(self, player_id: str, data: Payload):
@@ -241,13 +332,16 @@ class PostgresAdapter(LeagueRepo):
         
         sql = "UPDATE players SET name = %s, position = %s, team_id = %s, nationality_id = %s WHERE player_id = %s"
         self._execute(sql, (name, position, team_id, nationality_id, int(player_id)))
+        notify(self, "players", "update", player_id)
         return self.get_player(player_id)
 
     def delete_player(self, player_id: str) -> bool:
-        self._execute("DELETE FROM players WHERE player_id = %s", (int(player_id),))
+        deleted = self._execute("DELETE FROM players WHERE player_id = %s RETURNING player_id", (int(player_id),))
+        if deleted is not None:
+            notify(self, "players", "delete", player_id)
         return True
 
-    def list_matches(self, *, q: Optional[str] = None, filters=None):
+    def list_matches(self, *, q: Optional[str] = None, filters=None, limit=None, cursor=None):
         sql = """
               SELECT m.match_id::text as id, m.utc_date, \
                      m.matchday, \
@@ -258,26 +352,42 @@ class PostgresAdapter(LeagueRepo):
                        JOIN teams ht ON m.home_team_id = ht.team_id
                        JOIN teams at \
               ON m.away_team_id = at.team_id
-                  JOIN seasons sn ON m.season_id = sn.season_id
-              ORDER BY m.utc_date DESC \
+                  JOIN seasons sn ON m.season_id = sn.season_id \
               """
-        rows = self._fetchall(sql)
-
-        out = []
-        for r in rows:
-            out.append({
+        where, params = to_sql("matches", filters)
+        if q:
+            # drużyny po nazwie, mecze przez (home|away_team_id, utc_date)
+            clause, values = search.pg_match("matches", q)
+            where.append(clause)
+            params += values
+        after = decode_cursor(cursor, str, int) if limit else None
+        if after:
+            day, mid = after
+            # utc_date może być NULL – takie mecze są na końcu listy (NULLS LAST)
+            if day is None:
+                where.append("(m.utc_date IS NULL AND m.match_id < %s)")
+                params.append(mid)
+            else:
+                where.append("((m.utc_date, m.match_id) < (%s, %s) OR m.utc_date IS NULL)")
+                params.extend(after)
+
+        def convert(r):
+            return {
                 "id": r["id"],
                 "utc_date": r["utc_date"].isoformat() if r["utc_date"] else None,
                 "matchday": r["matchday"],
                 "label": f"[{r['season_name']}] {r['home_name']} vs {r['away_name']}",
-            })
-        return out
+            }
 
-    def get_match(self, match_id: str):
+        return self._list(sql, where, params, order_by="m.utc_date DESC NULLS LAST, m.match_id DESC",
+                          limit=limit, key=lambda r: (r["utc_date"], int(r["id"])), convert=convert)
+
+    def get_matches_many(self, ids: Iterable[str]) -> dict[str, dict]:
         sql = """
               SELECT m.match_id::text as id, m.utc_date, \
                      m.matchday, \
                      sn.year as "season_name", \
+                     m.season_id::text as "season_id", \
                      m.home_team_id::text as "home_team_id", m.away_team_id::text as "away_team_id", m.statistics, \
                      (s.full_time).home as ft_home,
                 (s.full_time).away as ft_away,
@@ -299,32 +409,30 @@ class PostgresAdapter(LeagueRepo):
               FROM matches m
                   JOIN seasons sn \
               ON m.season_id = sn.season_id
-                  LEFT JOIN scores s ON m.match_id = s.match_id
-              WHERE m.match_id = %s \
+                  LEFT JOIN scores s ON m.match_id = s.match_id \
               """
-        try:
-            mid = int(match_id)
-        except ValueError:
-            return None
-
-        row = self._fetchone(sql, (mid,))
-        if not row:
-            return None
-
-        return {
-            "id": row["id"],
-            "utc_date": row["utc_date"].isoformat() if row["utc_date"] else None,
-            "matchday": row["matchday"],
-            "season": row["season_name"],
-            "home_team_id": row["home_team_id"],
-            "away_team_id": row["away_team_id"],
-            "score": {
-                "full_time": {"home": row["ft_home"], "away": row["ft_away"]},
-                "half_time": {"home": row["ht_home"], "away": row["ht_away"]},
-            },
-            "statistics": row["statistics"] or {},
-            "referees": row["referees_data"] or [],
-        }
+
+        def convert(row):
+            return {
+                "id": row["id"],
+                "utc_date": row["utc_date"].isoformat() if row["utc_date"] else None,
+                "matchday": row["matchday"],
+                "season": row["season_name"],
+                "season_id": row["season_id"],
+                "home_team_id": row["home_team_id"],
+                "away_team_id": row["away_team_id"],
+                "score": {
+                    "full_time": {"home": row["ft_home"], "away": row["ft_away"]},
+                    "half_time": {"home": row["ht_home"], "away": row["ht_away"]},
+                },
+                "statistics": row["statistics"] or {},
+                "referees": row["referees_data"] or [],
+            }
+
+        return self._many(sql, "m.match_id", ids, convert)
+
+    def get_match(self, match_id: str):
+        return next(iter(self.get_matches_many([match_id]).values()), None)
 
     def match_label(self, match: Mapping[str, Any]) -> str:
         return str(match.get("label", ""))
@@ -342,6 +450,7 @@ class PostgresAdapter(LeagueRepo):
               RETURNING match_id
               """
         new_id = self._execute(sql, (utc_date, matchday, home_team_id, away_team_id, season_id))
+        notify(self, "matches", "create", new_id)
         return {"id": str(new_id), "utc_date": utc_date, "matchday": matchday}
 
     def update_match(self, match_id: str, data: Payload):
@@ -360,14 +469,33 @@ class PostgresAdapter(LeagueRepo):
         else:
             sql = "UPDATE matches SET utc_date = %s, matchday = %s WHERE match_id = %s"
             self._execute(sql, (utc_date, matchday, int(match_id)))
+        notify(self, "matches", "update", match_id)
         return self.get_match(match_id)
 
     def delete_match(self, match_id: str) -> bool:
-        self._execute("DELETE FROM matches WHERE match_id = %s", (int(match_id),))
+        deleted = self._execute("DELETE FROM matches WHERE match_id = %s RETURNING match_id", (int(match_id),))
+        if deleted is not None:
+            notify(self, "matches", "delete", match_id)
         return True
 
 
     
+    # ---- Counters (dashboard) ----
+    def _count(self, table: str) -> int:
+        return self._fetchone(f"SELECT COUNT(*) AS n FROM {table}")["n"]
+
+    def count_leagues(self) -> int:
+        return self.counters.get("leagues", lambda: self._count("leagues"))
+
+    def count_teams(self) -> int:
+        return self.counters.get("teams", lambda: self._count("teams"))
+
+    def count_players(self) -> int:
+        return self.counters.get("players", lambda: self._count("players"))
+
+    def count_matches(self) -> int:
+        return self.counters.get("matches", lambda: self._count("matches"))
+
     def list_countries(self) -> list[dict]:
         sql = "SELECT country_id as id, name FROM countries ORDER BY name"
         return self._fetchall(sql)
@@ -392,4 +520,82 @@ class PostgresAdapter(LeagueRepo):
               JOIN leagues l ON s.league_id = l.league_id
               ORDER BY s.year DESC, l.name
               """
-        return self._fetchall(sql)
\ No newline at end of file
+        return self._fetchall(sql)
+
+    def _options(self, sql: str) -> list[tuple[str, str]]:
+        return [(str(r["id"]), r["label"]) for r in self._fetchall(sql)]
+
+    def team_options(self) -> list[tuple[str, str]]:
+        return self._options("SELECT team_id AS id, name AS label FROM teams ORDER BY name")
+
+    def country_options(self) -> list[tuple[str, str]]:
+        return self._options("SELECT country_id AS id, name AS label FROM countries ORDER BY name")
+
+    def coach_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT c.coach_id AS id, c.name || COALESCE(' (' || cn.name || ')', '') AS label
+            FROM coaches c
+            LEFT JOIN countries cn ON c.nationality_id = cn.country_id
+            ORDER BY c.name
+        """)
+
+    def stadium_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT stadium_id AS id, name || COALESCE(' - ' || location, '') AS label
+            FROM stadiums ORDER BY name
+        """)
+
+    def season_options(self) -> list[tuple[str, str]]:
+        return self._options("""
+            SELECT s.season_id AS id, s.year || ' - ' || l.name AS label
+            FROM seasons s
+            JOIN leagues l ON s.league_id = l.league_id
+            ORDER BY s.year DESC, l.name
+        """)
+
+    def search(self, q: str, *, entities: Sequence[str] = search.ENTITIES,
+               limit: int = search.DEFAULT_LIMIT) -> list[dict]:
+        if not q or not q.strip():
+            return []
+        sql, params = search.pg_search(tuple(entities), q, clamp_limit(limit))
+        return [dict(r, rank=float(r["rank"])) for r in self._fetchall(sql, tuple(params))]
+
+    def stream(self, entity: str, *, filters=None, batch_size: int = export.BATCH_SIZE) -> Iterator[dict]:
+        query, params = export.sql(entity, filters)
+        # własne połączenie: nazwany kursor żyje w transakcji przez cały eksport
+        conn = psycopg2.connect(self.dsn)
+        try:
+            with conn.cursor(name=f"export_{entity}", cursor_factory=RealDictCursor) as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                yield from cur
+        finally:
+            conn.close()
+
+    def natural_keys(self, kind: str) -> dict[Any, int]:
+        return bulk.key_map(self._fetchall(bulk.NATURAL_KEYS_SQL[kind]))
+
+    def bulk_insert(self, entity: str, rows: Sequence[Mapping[str, Any]]) -> int:
+        table, columns = bulk.TABLES[entity]
+        values = ([r[c] for c in columns] for r in rows)
+        if entity == "scores":
+            # full_time/half_time to typ złożony score_result – w CSV literał "(home,away)"
+            columns = ("match_id", "full_time", "half_time")
+            values = ([r["match_id"], _score(r["full_time_home"], r["full_time_away"]),
+                       _score(r["half_time_home"], r["half_time_away"])] for r in rows)
+        elif entity == "standings":
+            # form to varchar(1)[] – w CSV literał tablicy "{W,D,L}"
+            columns = (*columns, "form")
+            values = ([*(r[c] for c in bulk.TABLES[entity][1]), "{" + ",".join(r["form"]) + "}"] for r in rows)
+        buf = io.StringIO()
+        csv.writer(buf).writerows(values)
+        buf.seek(0)
+        cols = ", ".join(f'"{c}"' for c in columns)
+        # własne połączenie na paczkę (równoległe wątki importu); COPY w autocommit = jedna transakcja
+        conn = self._connect()
+        try:
+            with conn.cursor() as cur:
+                cur.copy_expert(f"COPY {table} ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+            return len(rows)
+        finally:
+            conn.close()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from .base import LeagueRepo
+
+
+class ThreadedAsyncRepo:
+    """
+    ``AsyncLeagueRepo`` over any sync ``LeagueRepo``.
+
+    The drivers (psycopg2, mysql-connector, pymongo) are blocking, so every
+    call runs on ``executor`` (``sync_to_async(thread_sensitive=False)``):
+    the event loop stays free for other requests, and calls awaited together
+    with ``asyncio.gather`` hit the database concurrently. The executor –
+    together with the connection pool behind the adapter – bounds how many
+    queries are in flight; requests beyond that wait on the loop, not on a
+    worker thread.
+    """
+
+    def __init__(self, repo: LeagueRepo, executor: ThreadPoolExecutor):
+        self.repo = repo
+        self.executor = executor
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.repo, name)
+        if not callable(attr):
+            return attr
+        # bez cache'owania: atrybut czytany przy każdym wywołaniu (CachingRepo, mock.patch w testach)
+        return sync_to_async(attr, thread_sensitive=False, executor=self.executor)
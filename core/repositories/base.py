@@ -1,26 +1,35 @@
 from __future__ import annotations
-from typing import Protocol, Any, Optional, Sequence, Mapping
+from typing import Protocol, Any, Iterable, Iterator, Optional, Sequence, Mapping
 
 Filters = Mapping[str, Any]
 Payload = Mapping[str, Any]
 Id = str  # 24-char hex
+Option = tuple[str, str]
 
 class LeagueRepo(Protocol):
-    def list_leagues(self, *, q: Optional[str] = None, filters: Optional[Filters] = None) -> Sequence[Mapping[str, Any]]: ...
+    # list_*: limit=None zwraca wszystko; z limit zwracany jest pagination.Page
+    # (lista + next_cursor), a cursor wskazuje stronę (keyset po kluczu ORDER BY).
+    def list_leagues(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
     def get_league(self, league_id: Id) -> Optional[Mapping[str, Any]]: ...
 
-    def list_teams(self, *, q: Optional[str] = None, filters: Optional[Filters] = None) -> Sequence[Mapping[str, Any]]: ...
+    def list_teams(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
     def get_team(self, team_id: Id) -> Optional[Mapping[str, Any]]: ...
 
-    def list_players(self, *, q: Optional[str] = None, filters: Optional[Filters] = None) -> Sequence[Mapping[str, Any]]: ...
+    def list_players(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
     def get_player(self, player_id: Id) -> Optional[Mapping[str, Any]]: ...
     def team_players(self, team_id: Id) -> Sequence[Mapping[str, Any]]: ...
 
-    def list_matches(self, *, q: Optional[str] = None, filters: Optional[Filters] = None) -> Sequence[Mapping[str, Any]]: ...
+    def list_matches(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
     def get_match(self, match_id: Id) -> Optional[Mapping[str, Any]]: ...
 
     def match_label(self, match: Mapping[str, Any]) -> str: ...
 
+    # get_*_many: jedno zapytanie dla wielu id; wynik {str(id): obiekt}, brakujące id są pomijane.
+    def get_leagues_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    def get_teams_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    def get_players_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    def get_matches_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+
     def create_league(self, data: Payload) -> Mapping[str, Any]: ...
     def update_league(self, league_id: Id, data: Payload) -> Mapping[str, Any] | None: ...
     def delete_league(self, league_id: Id) -> bool: ...
@@ -37,8 +46,61 @@ class LeagueRepo(Protocol):
     def update_match(self, match_id: Id, data: Payload) -> Mapping[str, Any] | None: ...
     def delete_match(self, match_id: Id) -> bool: ...
 
+    # Liczniki dla dashboardu (COUNT(*) / estimated_document_count + cache liczników)
+    def count_leagues(self) -> int: ...
+    def count_teams(self) -> int: ...
+    def count_players(self) -> int: ...
+    def count_matches(self) -> int: ...
+
+    # Wyszukiwanie po wielu polach i encjach, posortowane malejąco po trafności:
+    # [{"entity", "id", "label", "rank"}]; entities z ("leagues", "teams", "players").
+    def search(self, q: str, *, entities: Sequence[str] = ..., limit: int = 20) -> Sequence[Mapping[str, Any]]: ...
+
+    # Eksport: płaskie wiersze (kolumny export.COLUMNS) czytane partiami, bez ładowania całej tabeli.
+    def stream(self, entity: str, *, filters: Optional[Mapping[str, Any]] = None,
+               batch_size: int = 1000) -> Iterator[Mapping[str, Any]]: ...
+
+    # Import masowy (core/repositories/bulk.py): mapa klucz naturalny -> id oraz zapis paczki
+    # wierszy w kształcie bulk.TABLES; zwraca liczbę zapisanych wierszy.
+    def natural_keys(self, kind: str) -> Mapping[Any, Any]: ...
+    def bulk_insert(self, entity: str, rows: Sequence[Mapping[str, Any]]) -> int: ...
+
     # Helper methods for form dropdowns
     def list_countries(self) -> Sequence[Mapping[str, Any]]: ...
     def list_stadiums(self) -> Sequence[Mapping[str, Any]]: ...
     def list_coaches(self) -> Sequence[Mapping[str, Any]]: ...
     def list_seasons(self) -> Sequence[Mapping[str, Any]]: ...
+
+    # Lekkie listy opcji do <select>: [(str(id), etykieta)], posortowane po etykiecie
+    # (sezony: najnowsze pierwsze). Widoki biorą je z reference.ReferenceCache.
+    def team_options(self) -> Sequence[Option]: ...
+    def country_options(self) -> Sequence[Option]: ...
+    def coach_options(self) -> Sequence[Option]: ...
+    def stadium_options(self) -> Sequence[Option]: ...
+    def season_options(self) -> Sequence[Option]: ...
+
+
+class AsyncLeagueRepo(Protocol):
+    # Odczyty LeagueRepo jako korutyny – widoki async (ASGI) uruchamiają niezależne
+    # zapytania równolegle przez asyncio.gather. Zapisy (panel admina) zostają synchroniczne.
+    async def list_leagues(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
+    async def get_league(self, league_id: Id) -> Optional[Mapping[str, Any]]: ...
+    async def list_teams(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
+    async def get_team(self, team_id: Id) -> Optional[Mapping[str, Any]]: ...
+    async def list_players(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
+    async def get_player(self, player_id: Id) -> Optional[Mapping[str, Any]]: ...
+    async def team_players(self, team_id: Id) -> Sequence[Mapping[str, Any]]: ...
+    async def list_matches(self, *, q: Optional[str] = None, filters: Optional[Filters] = None, limit: Optional[int] = None, cursor: Optional[str] = None) -> Sequence[Mapping[str, Any]]: ...
+    async def get_match(self, match_id: Id) -> Optional[Mapping[str, Any]]: ...
+
+    async def get_leagues_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    async def get_teams_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    async def get_players_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+    async def get_matches_many(self, ids: Iterable[Id]) -> Mapping[Id, Mapping[str, Any]]: ...
+
+    async def count_leagues(self) -> int: ...
+    async def count_teams(self) -> int: ...
+    async def count_players(self) -> int: ...
+    async def count_matches(self) -> int: ...
+
+    async def search(self, q: str, *, entities: Sequence[str] = ..., limit: int = 20) -> Sequence[Mapping[str, Any]]: ...
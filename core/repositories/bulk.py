@@ -0,0 +1,403 @@
+"""
+Bulk import for ``manage.py import_league_data``.
+
+Input rows (CSV or NDJSON) refer to other records by natural key – country,
+league and team names, ``(league, season)`` for seasons and
+``(league, season, home_team, away_team)`` for matches – never by database
+id. ``Importer`` loads each referenced key map once per entity
+(``repo.natural_keys(kind)``), resolves rows into table-shaped dicts
+(``TABLES``) and hands chunks of them to ``repo.bulk_insert(entity, rows)``
+on a small thread pool:
+
+- Postgres: ``COPY ... FROM STDIN (FORMAT csv)``,
+- MySQL: one multi-row ``INSERT`` per chunk,
+- Mongo: ``insert_many(ordered=False)``; what Mongo embeds (scores and
+  referees in the match, standings and scorers in the season) is a
+  ``bulk_write`` of updates.
+
+Entities run in dependency order (``ENTITIES``); chunks of one entity run
+in parallel, each on its own connection and in its own transaction, so a
+bad chunk is reported and skipped without rolling back the others.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
+
+from .signals import notify
+
+logger = logging.getLogger(__name__)
+
+# kolejność = zależności kluczy obcych
+ENTITIES = ("countries", "leagues", "seasons", "teams", "players", "referees", "matches", "scores",
+            "match_referees", "standings", "scorers")
+CHUNK_SIZE = 5000
+WORKERS = 4
+MAX_ERRORS = 20
+
+# encja -> (tabela, kolumny w kolejności INSERT/COPY)
+TABLES = {
+    "countries": ("countries", ("name", "flag_url")),
+    "leagues": ("leagues", ("name", "country_id", "icon_url", "cl_spot", "uel_spot", "relegation_spot")),
+    "seasons": ("seasons", ("league_id", "year")),
+    "teams": ("teams", ("name", "founded_year", "stadium_id", "coach_id", "crest_url")),
+    "players": ("players", ("name", "position", "date_of_birth", "team_id", "nationality_id")),
+    "matches": ("matches", ("season_id", "matchday", "utc_date", "home_team_id", "away_team_id", "winner")),
+    "scores": ("scores", ("match_id", "full_time_home", "full_time_away", "half_time_home", "half_time_away")),
+    "referees": ("referees", ("name", "nationality_id")),
+    "match_referees": ("match_referees", ("match_id", "referee_id", "role")),
+    # form (ostatnie wyniki) zapisuje adapter: tablica w Postgresie, standings_form w MySQL
+    "standings": ("standings", ("season_id", "team_id", "position", "played_games", "won", "draw", "lost",
+                                "points", "goals_for", "goals_against", "goal_difference")),
+    "scorers": ("scorers", ("player_id", "season_id", "goals", "assists", "penalties")),
+}
+
+# klucze naturalne w SQL: kolumny klucza..., id (klucz wielokolumnowy -> krotka)
+NATURAL_KEYS_SQL = {
+    "countries": "SELECT name, country_id FROM countries",
+    "leagues": "SELECT name, league_id FROM leagues",
+    "seasons": "SELECT league_id, year, season_id FROM seasons",
+    "teams": "SELECT name, team_id FROM teams",
+    "coaches": "SELECT name, coach_id FROM coaches",
+    "stadiums": "SELECT name, stadium_id FROM stadiums",
+    "matches": "SELECT season_id, home_team_id, away_team_id, match_id FROM matches",
+    # nazwisko nie jest unikalne – zawodnik po (nazwisko, drużyna)
+    "players": "SELECT name, team_id, player_id FROM players",
+    "referees": "SELECT name, referee_id FROM referees",
+}
+
+# Mongo: kolekcja -> pola klucza (trenerzy i stadiony są osadzone w drużynie – brak mapy)
+NATURAL_KEYS_MONGO = {
+    "countries": ("name",),
+    "leagues": ("name",),
+    "seasons": ("leagueId", "year"),
+    "teams": ("name",),
+    "matches": ("seasonId", "homeTeamId", "awayTeamId"),
+    "players": ("name", "currentTeamId"),
+    "referees": ("name",),
+}
+
+# encja importu -> mapy kluczy, których potrzebuje
+NEEDS = {
+    "countries": (),
+    "leagues": ("countries",),
+    "seasons": ("leagues",),
+    "teams": ("countries", "coaches", "stadiums"),
+    "players": ("teams", "countries"),
+    "matches": ("leagues", "seasons", "teams"),
+    "scores": ("leagues", "seasons", "teams", "matches"),
+    "referees": ("countries",),
+    "match_referees": ("leagues", "seasons", "teams", "matches", "referees"),
+    "standings": ("leagues", "seasons", "teams"),
+    "scorers": ("leagues", "seasons", "teams", "players"),
+}
+
+# po imporcie: encja, o której zmianie trzeba powiadomić cache (wynik i sędziowie są częścią meczu,
+# tabela wyznacza bieżącą ligę drużyny)
+NOTIFIES = {"scores": "matches", "match_referees": "matches", "standings": "teams", "scorers": "players"}
+
+# encje ładowane jedną paczką naraz: trigger na standings przelicza team_current_league z tego,
+# co widzi jego transakcja – równoległe paczki z sezonami tej samej drużyny nie widzą swoich wierszy
+# i mogłyby zostawić starszą ligę (albo zakleszczyć się na blokadach wierszy projekcji)
+SERIAL = frozenset({"standings"})
+
+
+class RowError(ValueError):
+    pass
+
+
+def key_map(rows: Iterable[Any]) -> dict[Any, Any]:
+    """Rows ``(k1, ..., id)`` -> ``{k1: id}`` or ``{(k1, k2, ...): id}``."""
+    out = {}
+    for r in rows:
+        r = tuple(r.values()) if isinstance(r, Mapping) else tuple(r)
+        out[r[0] if len(r) == 2 else r[:-1]] = r[-1]
+    return out
+
+
+# ---- czytanie plików ----
+def entity_of(path: str) -> str:
+    """``teams.csv``, ``teams-2024.ndjson`` -> ``teams``."""
+    stem = os.path.basename(path).split(".")[0].split("-")[0].lower()
+    if stem not in ENTITIES:
+        raise ValueError(f"Nie można ustalić encji z nazwy pliku: {path} (użyj --entity)")
+    return stem
+
+
+def read_rows(path: str) -> Iterator[dict[str, Any]]:
+    """Lazy row iterator; the format is checked right away, the file is read on demand."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in (".csv", ".ndjson", ".jsonl"):
+        raise ValueError(f"Nieobsługiwany format pliku: {path} (csv|ndjson)")
+    return _read(path, ext)
+
+
+def _read(path: str, ext: str) -> Iterator[dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if ext == ".csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ---- rozwiązywanie wierszy ----
+def _text(row: Mapping[str, Any], name: str, required: bool = False) -> Optional[str]:
+    value = row.get(name)
+    value = None if value is None else str(value).strip() or None
+    if required and value is None:
+        raise RowError(f"brak pola {name}")
+    return value
+
+
+def _int(row: Mapping[str, Any], name: str) -> Optional[int]:
+    value = row.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f"{name}: niepoprawna liczba {value!r}") from None
+
+
+def _date(row: Mapping[str, Any], name: str, required: bool = False) -> Optional[date]:
+    value = _text(row, name, required)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        raise RowError(f"{name}: niepoprawna data {value!r}") from None
+
+
+def _ref(keys: Mapping[str, Mapping[Any, Any]], kind: str, key: Any, required: bool = True) -> Any:
+    """``required`` = the key must be given; a given key that does not resolve is always an error
+    (except coaches/stadiums: Mongo embeds them, SQL leaves the FK empty)."""
+    if key is None or (isinstance(key, tuple) and None in key):
+        if required:
+            raise RowError(f"brak klucza {kind}")
+        return None
+    found = keys[kind].get(key)
+    if found is None and kind not in ("coaches", "stadiums"):
+        raise RowError(f"nie znaleziono {kind}: {key!r}")
+    return found
+
+
+def _season(row, keys) -> Any:
+    league_id = _ref(keys, "leagues", _text(row, "league", True))
+    return _ref(keys, "seasons", (league_id, _text(row, "season", True)))
+
+
+def _teams(row, keys) -> tuple[Any, Any]:
+    return (_ref(keys, "teams", _text(row, "home_team", True)),
+            _ref(keys, "teams", _text(row, "away_team", True)))
+
+
+def _resolve_match(row, keys) -> dict[str, Any]:
+    home, away = _teams(row, keys)
+    return {
+        "season_id": _season(row, keys),
+        "matchday": _int(row, "matchday"),
+        "utc_date": _date(row, "utc_date", True),
+        "home_team_id": home,
+        "away_team_id": away,
+        "winner": _text(row, "winner"),
+    }
+
+
+def _match(row, keys) -> Any:
+    season_id = _season(row, keys)
+    home, away = _teams(row, keys)
+    return _ref(keys, "matches", (season_id, home, away))
+
+
+def _resolve_score(row, keys) -> dict[str, Any]:
+    return {
+        "match_id": _match(row, keys),
+        **{c: _int(row, c) for c in ("full_time_home", "full_time_away", "half_time_home", "half_time_away")},
+    }
+
+
+def _resolve_standing(row, keys) -> dict[str, Any]:
+    out = {"season_id": _season(row, keys), "team_id": _ref(keys, "teams", _text(row, "team", True))}
+    for c in TABLES["standings"][1][2:]:
+        value = _int(row, c)
+        if value is None:
+            raise RowError(f"brak pola {c}")
+        out[c] = value
+    form = row.get("form") or ""
+    # "WDL" albo lista ["W", "D", "L"] (NDJSON)
+    out["form"] = [str(r).strip().upper() for r in form if str(r).strip()]
+    if any(r not in ("W", "D", "L") for r in out["form"]):
+        raise RowError(f"form: niepoprawne wyniki {form!r}")
+    return out
+
+
+def _resolve_scorer(row, keys) -> dict[str, Any]:
+    team_id = _ref(keys, "teams", _text(row, "team", True))
+    return {
+        "player_id": _ref(keys, "players", (_text(row, "player", True), team_id)),
+        "season_id": _season(row, keys),
+        "goals": _int(row, "goals"),
+        "assists": _int(row, "assists"),
+        "penalties": _int(row, "penalties"),
+        "team_id": team_id,
+    }
+
+
+# wiersz wejściowy (klucze naturalne) -> wiersz tabeli (id); pola spoza TABLES czyta tylko Mongo
+RESOLVERS: dict[str, Callable[[Mapping[str, Any], Mapping[str, Mapping[Any, Any]]], dict[str, Any]]] = {
+    "countries": lambda row, keys: {"name": _text(row, "name", True), "flag_url": _text(row, "flag_url")},
+    "leagues": lambda row, keys: {
+        "name": _text(row, "name", True),
+        "country_id": _ref(keys, "countries", _text(row, "country", True)),
+        "icon_url": _text(row, "icon_url"),
+        "cl_spot": _int(row, "cl_spot"),
+        "uel_spot": _int(row, "uel_spot"),
+        "relegation_spot": _int(row, "relegation_spot"),
+    },
+    "seasons": lambda row, keys: {
+        "league_id": _ref(keys, "leagues", _text(row, "league", True)),
+        "year": _text(row, "year", True),
+    },
+    "teams": lambda row, keys: {
+        "name": _text(row, "name", True),
+        "founded_year": _int(row, "founded_year"),
+        "stadium_id": _ref(keys, "stadiums", _text(row, "stadium"), required=False),
+        "coach_id": _ref(keys, "coaches", _text(row, "coach"), required=False),
+        "crest_url": _text(row, "crest_url"),
+        "country_id": _ref(keys, "countries", _text(row, "country"), required=False),
+        "stadium": _text(row, "stadium"),
+        "coach": _text(row, "coach"),
+    },
+    "players": lambda row, keys: {
+        "name": _text(row, "name", True),
+        "position": _text(row, "position"),
+        "date_of_birth": _date(row, "date_of_birth"),
+        "team_id": _ref(keys, "teams", _text(row, "team"), required=False),
+        "nationality_id": _ref(keys, "countries", _text(row, "nationality"), required=False),
+    },
+    "matches": _resolve_match,
+    "scores": _resolve_score,
+    "referees": lambda row, keys: {
+        "name": _text(row, "name", True),
+        "nationality_id": _ref(keys, "countries", _text(row, "nationality"), required=False),
+    },
+    "match_referees": lambda row, keys: {
+        "match_id": _match(row, keys),
+        "referee_id": _ref(keys, "referees", _text(row, "referee", True)),
+        "role": _text(row, "role") or "MAIN_REFEREE",
+    },
+    "standings": _resolve_standing,
+    "scorers": _resolve_scorer,
+}
+
+
+# ---- import ----
+@dataclass
+class Result:
+    entity: str
+    read: int = 0
+    inserted: int = 0
+    rejected: int = 0          # wiersze odrzucone przed zapisem (klucze, typy)
+    failed_chunks: int = 0     # paczki odrzucone przez bazę
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def error(self, message: str) -> None:
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+
+class Importer:
+    def __init__(self, repo: Any, *, chunk_size: int = CHUNK_SIZE, workers: int = WORKERS):
+        if chunk_size < 1 or workers < 1:
+            raise ValueError("chunk_size i workers muszą być >= 1")
+        # CachingRepo i inne opakowania przepuszczają wywołania, sygnały idą od adaptera
+        self.adapter = getattr(repo, "inner", repo)
+        self.chunk_size = chunk_size
+        self.workers = workers
+
+    def run(self, sources: Iterable[tuple[str, Iterable[Mapping[str, Any]]]]) -> list[Result]:
+        """``sources``: ``(entity, rows)`` pairs in any order; executed in ``ENTITIES`` order."""
+        ordered = sorted(sources, key=lambda s: ENTITIES.index(s[0]))
+        return [self.load(entity, rows) for entity, rows in ordered]
+
+    def load(self, entity: str, rows: Iterable[Mapping[str, Any]]) -> Result:
+        result = Result(entity)
+        started = time.perf_counter()
+        keys = {kind: self.adapter.natural_keys(kind) for kind in NEEDS[entity]}
+        resolve = RESOLVERS[entity]
+
+        def chunks() -> Iterator[list[dict[str, Any]]]:
+            chunk = []
+            for n, row in enumerate(rows, 1):
+                result.read += 1
+                try:
+                    chunk.append(resolve(row, keys))
+                except RowError as e:
+                    result.rejected += 1
+                    result.error(f"{entity} wiersz {n}: {e}")
+                    continue
+                if len(chunk) >= self.chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def collect(done: Iterable[Future]) -> None:
+            for future in done:
+                try:
+                    result.inserted += future.result()
+                except Exception as e:
+                    result.failed_chunks += 1
+                    result.error(f"{entity} paczka: {e}")
+                    logger.warning("import %s: chunk failed", entity, exc_info=True)
+
+        # co najwyżej 2 paczki na wątek w pamięci – plik czytany strumieniowo
+        workers = 1 if entity in SERIAL else self.workers
+        with ThreadPoolExecutor(workers, thread_name_prefix=f"import-{entity}") as pool:
+            pending: set[Future] = set()
+            for chunk in chunks():
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+                pending.add(pool.submit(self.adapter.bulk_insert, entity, chunk))
+            collect(wait(pending).done)
+
+        if result.inserted:
+            self._invalidate(entity)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def _invalidate(self, entity: str) -> None:
+        # jedno zdarzenie na encję zamiast jednego na wiersz; liczniki przeliczą się przy odczycie
+        entity = NOTIFIES.get(entity, entity)
+        counters = getattr(self.adapter, "counters", None)
+        if counters is not None:
+            counters.invalidate(entity)
+        notify(self.adapter, entity, "update")
+
+
+def report(results: Iterable[Result], stdout: Any, stderr: Any, style: Any, failed: str) -> bool:
+    """Per-entity summary for the import commands; writes ``failed`` (or OK) last, returns True on errors."""
+    had_errors = False
+    for r in results:
+        rate = r.inserted / r.seconds if r.seconds else 0
+        stdout.write(
+            f"{r.entity}: {r.inserted}/{r.read} zapisanych, odrzuconych wierszy {r.rejected}, "
+            f"nieudanych paczek {r.failed_chunks} ({r.seconds:.2f} s, {rate:.0f} wierszy/s)"
+        )
+        for message in r.errors:
+            stderr.write(f"  {message}")
+        had_errors = had_errors or bool(r.rejected or r.failed_chunks)
+    stdout.write(style.WARNING(failed) if had_errors else style.SUCCESS("OK"))
+    return had_errors
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import select
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Optional, Protocol
+
+import psycopg2
+from psycopg2 import sql
+from pymongo import MongoClient
+
+from .signals import repo_changed
+
+logger = logging.getLogger(__name__)
+
+ENTITIES = ("leagues", "teams", "players", "matches")
+
+Deliver = Callable[[str], None]
+
+
+class Transport(Protocol):
+    # False = transport sam widzi zapisy (change stream), bus nic nie publikuje
+    publishes_writes: bool
+
+    def send(self, message: str) -> None: ...
+    def listen(self, deliver: Deliver, stop: threading.Event) -> None: ...
+    def close(self) -> None: ...
+
+
+class PostgresTransport:
+    """``pg_notify`` on write, ``LISTEN`` on a dedicated connection."""
+
+    publishes_writes = True
+
+    def __init__(self, dsn: str, channel: str = "repo_changed", poll_interval: float = 1.0):
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"Niepoprawna nazwa kanału: {channel}")
+        self.dsn = dsn
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._send_lock = threading.Lock()
+        self._send_conn = None
+
+    def send(self, message: str) -> None:
+        with self._send_lock:
+            if self._send_conn is None or self._send_conn.closed:
+                self._send_conn = psycopg2.connect(self.dsn)
+                self._send_conn.autocommit = True
+            try:
+                with self._send_conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self.channel, message))
+            except psycopg2.Error:
+                self._send_conn.close()
+                raise
+
+    def listen(self, deliver: Deliver, stop: threading.Event) -> None:
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+            while not stop.is_set():
+                if not select.select([conn], [], [], self.poll_interval)[0]:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    deliver(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        with self._send_lock:
+            if self._send_conn is not None:
+                self._send_conn.close()
+
+
+class MongoChangeStreamTransport:
+    """
+    Every write to the entity collections is the event – no publishing needed.
+    Requires a replica set (change streams are not available on a standalone mongod).
+    """
+
+    publishes_writes = False
+
+    OPS = {"insert": "create", "update": "update", "replace": "update", "delete": "delete"}
+
+    def __init__(self, uri: str, db_name: str, collections: tuple[str, ...] = ENTITIES):
+        self.uri = uri
+        self.db_name = db_name
+        self.collections = collections
+
+    def send(self, message: str) -> None:
+        pass
+
+    def listen(self, deliver: Deliver, stop: threading.Event) -> None:
+        client = MongoClient(self.uri)
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": list(self.collections)},
+            "operationType": {"$in": list(self.OPS)},
+        }}]
+        try:
+            with client[self.db_name].watch(pipeline, max_await_time_ms=1000) as stream:
+                while not stop.is_set() and stream.alive:
+                    change = stream.try_next()
+                    if change is None:
+                        continue
+                    deliver(json.dumps({
+                        "entity": change["ns"]["coll"],
+                        "op": self.OPS[change["operationType"]],
+                        "id": str(change["documentKey"]["_id"]),
+                    }))
+        finally:
+            client.close()
+
+    def close(self) -> None:
+        pass
+
+
+class UnixSocketTransport:
+    """
+    Local stand-in for tests and single-host setups: every subscriber binds a
+    datagram socket in ``directory``; ``send`` writes to all the others.
+    """
+
+    publishes_writes = True
+
+    def __init__(self, directory: str, poll_interval: float = 0.2):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.path = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        # bind od razu – zdarzenia wysłane przed startem wątku czekają w kolejce gniazda
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(poll_interval)
+
+    def send(self, message: str) -> None:
+        data = message.encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as out:
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if not name.endswith(".sock") or path == self.path:
+                    continue
+                try:
+                    out.sendto(data, path)
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # nikt nie słucha – gniazdo po zakończonym procesie
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                except OSError as e:
+                    logger.warning("bus: send to %s failed: %s", path, e)
+
+    def listen(self, deliver: Deliver, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            deliver(data.decode())
+
+    def close(self) -> None:
+        self._sock.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class InvalidationBus:
+    """
+    Fans ``repo_changed`` out to other processes and back in.
+
+    Local writes of ``repo`` are published through ``transport``; events from
+    other processes are re-sent as ``repo_changed`` with ``sender=repo`` and
+    ``remote=True``, so every cache subscribed to the adapter (CachingRepo,
+    CounterStore) reacts exactly as for a local write. Remote events are never
+    published again. After the listener reconnects, events may have been
+    missed, so every entity is invalidated as a whole.
+    """
+
+    def __init__(self, transport: Transport, repo: Any, *, reconnect_delay: float = 1.0):
+        self.transport = transport
+        self.repo = repo
+        self.reconnect_delay = reconnect_delay
+        self.origin = uuid.uuid4().hex
+        self.stats = {"published": 0, "received": 0, "ignored": 0, "errors": 0, "reconnects": 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        repo_changed.connect(self._on_local, sender=repo)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="repo-bus", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        repo_changed.disconnect(self._on_local, sender=self.repo)
+        self.transport.close()
+
+    def _on_local(self, sender, entity: str, op: str, obj_id: Optional[str] = None,
+                  remote: bool = False, **kwargs) -> None:
+        if remote or not self.transport.publishes_writes:
+            return
+        message = json.dumps({"origin": self.origin, "entity": entity, "op": op, "id": obj_id})
+        try:
+            self.transport.send(message)
+            self.stats["published"] += 1
+        except Exception:
+            # nieudana publikacja nie może wywrócić zapisu – inne procesy dogoni TTL
+            self.stats["errors"] += 1
+            logger.warning("bus: publish failed", exc_info=True)
+
+    def _run(self) -> None:
+        first = True
+        while not self._stop.is_set():
+            if not first:
+                self.stats["reconnects"] += 1
+                self._flush_all()
+            first = False
+            try:
+                self.transport.listen(self._deliver, self._stop)
+            except Exception:
+                self.stats["errors"] += 1
+                logger.warning("bus: listener failed, reconnecting", exc_info=True)
+                self._stop.wait(self.reconnect_delay)
+
+    def _deliver(self, raw: str) -> None:
+        try:
+            event = json.loads(raw)
+            entity, op = event["entity"], event["op"]
+        except (ValueError, KeyError, TypeError):
+            self.stats["ignored"] += 1
+            return
+        if event.get("origin") == self.origin:
+            self.stats["ignored"] += 1
+            return
+        self.stats["received"] += 1
+        repo_changed.send(sender=self.repo, entity=entity, op=op, obj_id=event.get("id"), remote=True)
+
+    def _flush_all(self) -> None:
+        for entity in ENTITIES:
+            repo_changed.send(sender=self.repo, entity=entity, op="update", obj_id=None, remote=True)
+
+
+def build_transport(kind: str, **options: Any) -> Transport:
+    if kind == "postgres":
+        return PostgresTransport(options["dsn"], channel=options.get("channel") or "repo_changed")
+    if kind == "mongo":
+        return MongoChangeStreamTransport(options["uri"], options["db_name"])
+    if kind == "unix":
+        return UnixSocketTransport(options["path"])
+    raise ValueError(f"Nieznany transport REPO_BUS={kind}. Użyj: postgres|mongo|unix.")
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from .base import LeagueRepo
+from .signals import repo_changed
+
+# Usunięcie rekordu kasuje/zmienia inne encje (ON DELETE CASCADE / SET NULL w schematach SQL).
+CASCADES = {
+    "leagues": ("matches", "teams"),
+    "teams": ("players", "matches"),
+}
+
+DEFAULT_TTL = {
+    "leagues": 300.0,
+    "teams": 300.0,
+    "players": 120.0,
+    "matches": 60.0,
+    "reference": 3600.0,
+}
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded LRU with per-entry TTL and tag-based invalidation.
+
+    Every entry carries a set of tags; ``invalidate(tag)`` drops all entries
+    with that tag. ``generation`` grows on every invalidation so a read-through
+    caller can refuse to store a value computed before a concurrent write.
+    """
+
+    def __init__(self, max_entries: int = 2048, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries musi być >= 1")
+        self.max_entries = max_entries
+        self.clock = clock
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._data: OrderedDict[Any, tuple[Any, float, frozenset]] = OrderedDict()
+        self._tags: dict[str, set] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def get(self, key: Any) -> Any:
+        """The cached value or ``_MISSING``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return _MISSING
+            value, expires, _ = entry
+            if expires <= self.clock():
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Any, value: Any, ttl: float, tags: Iterable[str] = (), generation: Optional[int] = None) -> bool:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            if key in self._data:
+                self._drop(key)
+            tags = frozenset(tags)
+            self._data[key] = (value, self.clock() + ttl, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries:
+                self._drop(next(iter(self._data)))
+                self._stats["evictions"] += 1
+            return True
+
+    def invalidate(self, *tags: str) -> int:
+        with self._lock:
+            self.generation += 1
+            dropped = 0
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+                    dropped += 1
+            self._stats["invalidations"] += dropped
+            return dropped
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._data),
+                "max_entries": self.max_entries,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+            }
+
+    def _drop(self, key: Any) -> None:
+        _, _, tags = self._data.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# metoda odczytu -> (encja dla TTL, encje, których dowolna zmiana unieważnia wynik)
+LISTS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "list_leagues": ("leagues", ("leagues",)),
+    "list_teams": ("teams", ("teams",)),
+    "list_players": ("players", ("players",)),
+    "list_matches": ("matches", ("matches", "teams")),
+    "list_countries": ("reference", ("reference",)),
+    "list_stadiums": ("reference", ("reference", "teams")),
+    "list_coaches": ("reference", ("reference", "teams")),
+    "list_seasons": ("reference", ("reference", "leagues")),
+}
+
+# get_<single>(id) / get_<entity>_many(ids) – wpisy per id, wspólne dla obu metod
+ITEMS = {
+    "get_league": "leagues",
+    "get_team": "teams",
+    "get_player": "players",
+    "get_match": "matches",
+}
+
+
+class CachingRepo:
+    """
+    Read-through cache in front of a LeagueRepo adapter.
+
+    ``get_*``/``get_*_many`` results are cached per id, ``list_*``,
+    ``team_players`` and the option lists per call arguments. Entries are
+    dropped on the adapter's ``repo_changed`` signal: a write to a team
+    evicts that team's entry and everything listing teams (team lists,
+    matches with their labels, coach/stadium options), deletes also evict
+    cascaded entities. Anything not cached (writes, counts, pool stats)
+    goes straight to the wrapped adapter. Cached objects are shared between
+    callers – treat them as read-only.
+    """
+
+    def __init__(self, inner: LeagueRepo, *, max_entries: int = 2048,
+                 ttl: Optional[Mapping[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.inner = inner
+        self.ttl = {**DEFAULT_TTL, **(ttl or {})}
+        self.cache = LRUCache(max_entries, clock=clock)
+        repo_changed.connect(self._on_change, sender=inner)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.inner, name)
+        if name in LISTS:
+            wrapper = self._wrap_list(name, attr)
+        elif name in ITEMS:
+            wrapper = self._wrap_item(ITEMS[name])
+        elif name.startswith("get_") and name.endswith("_many") and name[4:-5] in self.ttl:
+            wrapper = self._wrap_many(name[4:-5], attr)
+        elif name == "team_players":
+            wrapper = self._wrap_team_players(attr)
+        else:
+            return attr
+        self.__dict__[name] = wrapper
+        return wrapper
+
+    def cache_stats(self) -> dict[str, Any]:
+        return self.cache.stats()
+
+    def _read(self, key: Any, ttl: float, tags: Iterable[str], load: Callable[[], Any]) -> Any:
+        value = self.cache.get(key)
+        if value is not _MISSING:
+            return value
+        generation = self.cache.generation
+        value = load()
+        if value is not None:
+            self.cache.set(key, value, ttl, tags, generation)
+        return value
+
+    def _wrap_list(self, name: str, method: Callable) -> Callable:
+        entity, depends = LISTS[name]
+
+        def cached(*args, **kwargs):
+            key = (name, _freeze(args), _freeze(kwargs))
+            return self._read(key, self.ttl[entity], depends, lambda: method(*args, **kwargs))
+        return cached
+
+    def _wrap_item(self, entity: str) -> Callable:
+        def cached(obj_id):
+            return self._many(entity, [obj_id]).get(str(obj_id))
+        return cached
+
+    def _wrap_many(self, entity: str, method: Callable) -> Callable:
+        def cached(ids):
+            return self._many(entity, ids, method)
+        return cached
+
+    def _many(self, entity: str, ids: Iterable[Any], method: Optional[Callable] = None) -> dict[str, Any]:
+        ids = [str(i) for i in ids]
+        out, missing = {}, []
+        for i in ids:
+            value = self.cache.get((entity, i))
+            if value is _MISSING:
+                missing.append(i)
+            else:
+                out[i] = value
+        if not missing:
+            return out
+        generation = self.cache.generation
+        if method is None:
+            method = getattr(self.inner, f"get_{entity}_many")
+        found = method(missing)
+        for i in missing:
+            value = found.get(i)
+            if value is not None:
+                out[i] = value
+                self.cache.set((entity, i), value, self.ttl[entity], (f"{entity}:{i}", f"{entity}:*"), generation)
+        return out
+
+    def _wrap_team_players(self, method: Callable) -> Callable:
+        def cached(team_id):
+            key = ("team_players", str(team_id))
+            return self._read(key, self.ttl["players"], ("players", f"teams:{team_id}"), lambda: method(team_id))
+        return cached
+
+    def _on_change(self, sender, entity: str, op: str, obj_id: Optional[str] = None, **kwargs) -> None:
+        tags = [entity, f"{entity}:{obj_id}" if obj_id is not None else f"{entity}:*"]
+        if op == "delete":
+            for dependent in CASCADES.get(entity, ()):
+                tags += [dependent, f"{dependent}:*"]
+        self.cache.invalidate(*tags)
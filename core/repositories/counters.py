@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .signals import repo_changed
+
+# Usunięcie rekordu kasuje kaskadowo inne encje (ON DELETE CASCADE w schematach SQL),
+# więc ich liczniki trzeba przeliczyć zamiast zmniejszać.
+CASCADES = {
+    "leagues": ("matches",),
+}
+
+
+class CounterStore:
+    """
+    Cached row counts for the dashboard.
+
+    A count is loaded once with ``load`` (``COUNT(*)`` / ``estimated_document_count``)
+    and then kept up to date from the owner's ``repo_changed`` signals: +1 on
+    create, -1 on delete. Counts are reloaded after ``ttl`` seconds anyway, to
+    pick up writes made by other processes. A count whose entity changed while
+    it was loading is returned but not cached.
+    """
+
+    def __init__(self, owner: Any, ttl: float = 300.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counts: dict[str, tuple[int, float]] = {}
+        # zmiana w trakcie load() -> wynik nieaktualny, nie trafia do cache
+        self._generations: dict[str, int] = {}
+        self._epoch = 0
+        repo_changed.connect(self._on_change, sender=owner)
+
+    def _generation(self, entity: str) -> tuple[int, int]:
+        return self._epoch, self._generations.get(entity, 0)
+
+    def _bump(self, entity: str) -> None:
+        self._generations[entity] = self._generations.get(entity, 0) + 1
+
+    def get(self, entity: str, load: Callable[[], int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(entity)
+            if cached is not None and now - cached[1] < self.ttl:
+                return cached[0]
+            generation = self._generation(entity)
+        value = int(load())
+        with self._lock:
+            if self._generation(entity) == generation:
+                self._counts[entity] = (value, now)
+        return value
+
+    def adjust(self, entity: str, delta: int) -> None:
+        with self._lock:
+            self._bump(entity)
+            cached = self._counts.get(entity)
+            if cached is not None:
+                self._counts[entity] = (max(0, cached[0] + delta), cached[1])
+
+    def invalidate(self, entity: Optional[str] = None) -> None:
+        with self._lock:
+            if entity is None:
+                self._epoch += 1
+                self._counts.clear()
+            else:
+                self._bump(entity)
+                self._counts.pop(entity, None)
+
+    def _on_change(self, sender, entity: str, op: str, remote: bool = False, **kwargs) -> None:
+        if remote:
+            # zdarzenie z innego procesu (bus) może dotrzeć podwójnie – przeliczamy zamiast liczyć delty
+            for name in (entity, *CASCADES.get(entity, ())):
+                self.invalidate(name)
+        elif op == "create":
+            self.adjust(entity, +1)
+        elif op == "delete":
+            self.adjust(entity, -1)
+            for dependent in CASCADES.get(entity, ()):
+                self.invalidate(dependent)
@@ -0,0 +1,346 @@
+"""
+Deterministic synthetic football data at a scale factor (``manage.py generate_league_data``).
+
+``Dataset(sf, seed)`` yields rows in the ``bulk`` input format (natural
+keys, see ``bulk.RESOLVERS``) for every import entity, so the same stream
+goes into Postgres (COPY), MySQL (multi-row INSERT), Mongo (insert_many)
+and the mock through ``bulk.Importer`` – or into CSV/NDJSON files.
+
+Scale (``Scale.of``): SF1 is 10 leagues in 5 countries, 20 teams per league,
+10 seasons, 25 players per squad – 38 000 matches; SF100 is 3.8 million
+matches, 500 000 players and 11 million referee appointments.
+
+Skew: team strength is Pareto-distributed inside a league (a few clubs
+dominate the table), goals are Poisson with home advantage and strength
+ratio, goals go to forwards before defenders with a long tail per squad,
+and a quarter of the referees officiate half of the matches.
+
+Nothing is held in memory beyond one season: every season has its own
+RNG (``seed``, league, season), so each entity pass recomputes the
+fixtures and results it needs and all passes agree.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import math
+import os
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Iterator, Optional, Sequence
+
+from . import bulk
+
+LAST_SEASON = 2025
+POSITIONS = (("Goalkeeper", 3), ("Defender", 8), ("Midfielder", 8), ("Forward", 6))
+# udział w golach: napastnik strzela ~6x częściej niż obrońca, bramkarz prawie nigdy
+GOAL_WEIGHT = {"Goalkeeper": 0.01, "Defender": 0.4, "Midfielder": 1.0, "Forward": 2.5}
+REFEREE_ROLES = ("MAIN_REFEREE", "ASSISTANT_REFEREE_1", "ASSISTANT_REFEREE_2")
+HOME_GOALS = 1.5
+AWAY_GOALS = 1.15
+
+COUNTRY_NAMES = (
+    "England", "Spain", "Germany", "Italy", "France", "Poland", "Portugal", "Netherlands", "Belgium", "Scotland",
+    "Turkey", "Austria", "Switzerland", "Denmark", "Sweden", "Norway", "Czechia", "Croatia", "Serbia", "Greece",
+    "Ukraine", "Romania", "Hungary", "Slovakia", "Slovenia", "Bulgaria", "Finland", "Ireland", "Wales", "Cyprus",
+    "Brazil", "Argentina", "Uruguay", "Chile", "Colombia", "Mexico", "United States", "Japan", "South Korea",
+    "Australia", "Morocco", "Egypt", "Nigeria", "Ghana", "Senegal", "Algeria", "Tunisia", "Saudi Arabia",
+)
+CITY_PARTS = ("Nor", "Wes", "Ast", "Bel", "Cor", "Dun", "Fal", "Gra", "Hal", "Kin", "Lor", "Mar", "Ost", "Pol",
+              "Ros", "Sal", "Tor", "Val", "Win", "Zar")
+CITY_ENDS = ("ton", "burg", "field", "ford", "haven", "mouth", "stad", "grad", "ville", "berg", "wick", "port")
+CLUB_SUFFIXES = ("FC", "United", "City", "Athletic", "Rovers", "Sporting", "Dynamo", "Olympic")
+FIRST_NAMES = ("Adam", "Bruno", "Carlos", "Dawid", "Erik", "Felix", "Gabriel", "Hugo", "Ivan", "Jakub", "Karim",
+               "Luca", "Marco", "Nico", "Oscar", "Pedro", "Rafael", "Sami", "Tomas", "Victor", "Wojciech", "Yusuf",
+               "Luis", "Andrea", "Mats", "Jan", "Leon", "Milan", "Kevin", "Diego")
+LAST_NAMES = ("Silva", "Novak", "Muller", "Rossi", "Garcia", "Kowalski", "Jansen", "Dubois", "Hansen", "Costa",
+              "Horvat", "Petrov", "Nielsen", "Fernandes", "Schmidt", "Moreau", "Lewis", "Kovac", "Berg", "Santos",
+              "Weber", "Bianchi", "Lopez", "Wojcik", "Eriksen", "Popescu", "Yilmaz", "Martin", "Ricci", "Meyer",
+              "Suarez", "Nagy", "Larsen", "Pereira", "Fischer", "Romano", "Andersen", "Nowak", "Blanc", "Varga")
+
+
+@dataclass(frozen=True)
+class Scale:
+    leagues: int
+    teams_per_league: int = 20
+    seasons: int = 10
+    squad: int = 25
+    referees_per_country: int = 20
+
+    @classmethod
+    def of(cls, sf: float) -> "Scale":
+        if sf <= 0:
+            raise ValueError("Współczynnik skali musi być > 0")
+        return cls(leagues=max(1, round(10 * sf)))
+
+    @property
+    def countries(self) -> int:
+        return math.ceil(self.leagues / 2)
+
+    @property
+    def matches(self) -> int:
+        # każda para dwa razy (mecz i rewanż)
+        return self.leagues * self.seasons * self.teams_per_league * (self.teams_per_league - 1)
+
+
+@dataclass
+class Match:
+    matchday: int
+    day: date
+    home: int
+    away: int
+    ft: tuple[int, int]
+    ht: tuple[int, int]
+
+
+def _poisson(rnd: random.Random, lam: float) -> int:
+    # Knuth – średnie rzędu 1-3 gole, wystarczy
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rnd.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def round_robin(teams: Sequence[int]) -> list[list[tuple[int, int]]]:
+    """Double round robin (circle method): matchdays of ``(home, away)``; second half mirrors the first."""
+    order = list(teams) + ([-1] if len(teams) % 2 else [])
+    n = len(order)
+    first: list[list[tuple[int, int]]] = []
+    for day in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            a, b = order[i], order[n - 1 - i]
+            if a != -1 and b != -1:
+                pairs.append((a, b) if (day + i) % 2 == 0 else (b, a))
+        first.append(pairs)
+        order = [order[0], order[-1], *order[1:-1]]
+    return first + [[(b, a) for a, b in day] for day in first]
+
+
+class Dataset:
+    def __init__(self, sf: float = 1.0, seed: int = 0, *, scale: Optional[Scale] = None):
+        self.sf = sf
+        self.seed = seed
+        self.scale = scale or Scale.of(sf)
+        self._strength: dict[int, list[float]] = {}
+
+    def _rng(self, *parts: Any) -> random.Random:
+        # ziarno jako napis: deterministyczne między uruchomieniami (w przeciwieństwie do hash())
+        return random.Random("/".join(map(str, (self.seed, *parts))))
+
+    # ---- nazwy (stałe dla indeksu, niezależne od kolejności generowania) ----
+    def country(self, i: int) -> str:
+        return COUNTRY_NAMES[i] if i < len(COUNTRY_NAMES) else f"Country {i + 1}"
+
+    def league(self, i: int) -> str:
+        tier = i % 2 + 1
+        return f"{self.country(i // 2)} Division {tier}"
+
+    def team(self, league: int, i: int) -> str:
+        # indeks globalny w nazwie – unikalność bez słownika zajętych nazw
+        n = league * self.scale.teams_per_league + i
+        city = CITY_PARTS[n % len(CITY_PARTS)] + CITY_ENDS[n // len(CITY_PARTS) % len(CITY_ENDS)]
+        return f"{city} {CLUB_SUFFIXES[n % len(CLUB_SUFFIXES)]} {n + 1}"
+
+    def player(self, team: int, i: int) -> str:
+        rnd = self._rng("player", team, i)
+        # numer na koszulce rozróżnia imienników w kadrze (klucz naturalny: nazwisko + drużyna)
+        return f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)} {i + 1}"
+
+    def referee(self, country: int, i: int) -> str:
+        return f"Ref {LAST_NAMES[i % len(LAST_NAMES)]} {country + 1}-{i + 1}"
+
+    def season_year(self, s: int) -> str:
+        start = LAST_SEASON - self.scale.seasons + s
+        return f"{start}/{start + 1}"
+
+    def _team_id(self, league: int, i: int) -> int:
+        return league * self.scale.teams_per_league + i
+
+    def _position(self, i: int) -> str:
+        for name, count in POSITIONS:
+            if i < count:
+                return name
+            i -= count
+        return "Midfielder"
+
+    def strength(self, league: int) -> list[float]:
+        """Pareto(1.5) per team of the league – stable across seasons."""
+        if league not in self._strength:
+            rnd = self._rng("strength", league)
+            self._strength[league] = [rnd.paretovariate(1.5) for _ in range(self.scale.teams_per_league)]
+        return self._strength[league]
+
+    # ---- sezon ----
+    def season(self, league: int, s: int) -> list[Match]:
+        rnd = self._rng("season", league, s)
+        teams = list(range(self.scale.teams_per_league))
+        rnd.shuffle(teams)
+        strength = self.strength(league)
+        start = date(LAST_SEASON - self.scale.seasons + s, 8, 8)
+        out = []
+        for md, pairs in enumerate(round_robin(teams), 1):
+            for home, away in pairs:
+                # Pareto ma długi ogon – przycinamy, żeby lider nie strzelał 130 goli w sezonie
+                ratio = min(1.8, max(1 / 1.8, (strength[home] / strength[away]) ** 0.35))
+                ft = (_poisson(rnd, HOME_GOALS * ratio), _poisson(rnd, AWAY_GOALS / ratio))
+                # gol do przerwy z prawdopodobieństwem 0.45
+                ht = (sum(rnd.random() < 0.45 for _ in range(ft[0])), sum(rnd.random() < 0.45 for _ in range(ft[1])))
+                out.append(Match(md, start + timedelta(days=7 * (md - 1) + rnd.randint(0, 3)), home, away, ft, ht))
+        return out
+
+    def _seasons(self) -> Iterator[tuple[int, int, list[Match]]]:
+        for league in range(self.scale.leagues):
+            for s in range(self.scale.seasons):
+                yield league, s, self.season(league, s)
+
+    def _keys(self, league: int, s: int, m: Match) -> dict[str, Any]:
+        return {"league": self.league(league), "season": self.season_year(s),
+                "home_team": self.team(league, m.home), "away_team": self.team(league, m.away)}
+
+    # ---- encje (format wejściowy bulk) ----
+    def countries(self) -> Iterator[dict]:
+        for c in range(self.scale.countries):
+            yield {"name": self.country(c), "flag_url": None}
+
+    def leagues(self) -> Iterator[dict]:
+        for league in range(self.scale.leagues):
+            yield {"name": self.league(league), "country": self.country(league // 2),
+                   "cl_spot": 4 if league % 2 == 0 else 0, "uel_spot": 2 if league % 2 == 0 else 0,
+                   "relegation_spot": 3}
+
+    def seasons(self) -> Iterator[dict]:
+        for league in range(self.scale.leagues):
+            for s in range(self.scale.seasons):
+                yield {"league": self.league(league), "year": self.season_year(s)}
+
+    def teams(self) -> Iterator[dict]:
+        for league in range(self.scale.leagues):
+            for i in range(self.scale.teams_per_league):
+                rnd = self._rng("team", league, i)
+                name = self.team(league, i)
+                yield {"name": name, "founded_year": rnd.randint(1870, 1990), "country": self.country(league // 2),
+                       "stadium": f"{name} Stadium", "coach": f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}"}
+
+    def players(self) -> Iterator[dict]:
+        countries = self.scale.countries
+        for league in range(self.scale.leagues):
+            for i in range(self.scale.teams_per_league):
+                team = self._team_id(league, i)
+                for p in range(self.scale.squad):
+                    rnd = self._rng("player-bio", team, p)
+                    # 70% zawodników z kraju ligi
+                    nationality = league // 2 if rnd.random() < 0.7 else rnd.randrange(countries)
+                    born = date(LAST_SEASON - rnd.randint(17, 37), rnd.randint(1, 12), rnd.randint(1, 28))
+                    yield {"name": self.player(team, p), "position": self._position(p),
+                           "date_of_birth": born.isoformat(), "team": self.team(league, i),
+                           "nationality": self.country(nationality)}
+
+    def referees(self) -> Iterator[dict]:
+        for c in range(self.scale.countries):
+            for i in range(self.scale.referees_per_country):
+                yield {"name": self.referee(c, i), "nationality": self.country(c)}
+
+    def matches(self) -> Iterator[dict]:
+        for league, s, matches in self._seasons():
+            for m in matches:
+                winner = "HOME_TEAM" if m.ft[0] > m.ft[1] else "AWAY_TEAM" if m.ft[0] < m.ft[1] else "DRAW"
+                yield {**self._keys(league, s, m), "matchday": m.matchday, "utc_date": m.day.isoformat(),
+                       "winner": winner}
+
+    def scores(self) -> Iterator[dict]:
+        for league, s, matches in self._seasons():
+            for m in matches:
+                yield {**self._keys(league, s, m), "full_time_home": m.ft[0], "full_time_away": m.ft[1],
+                       "half_time_home": m.ht[0], "half_time_away": m.ht[1]}
+
+    def match_referees(self) -> Iterator[dict]:
+        per_country = self.scale.referees_per_country
+        for league, s, matches in self._seasons():
+            rnd = self._rng("referees", league, s)
+            # kwadrat losowej -> małe indeksy częściej: czołówka sędziów prowadzi większość meczów
+            for m in matches:
+                picked = set()
+                while len(picked) < min(len(REFEREE_ROLES), per_country):
+                    picked.add(int(per_country * rnd.random() ** 2))
+                for role, i in zip(REFEREE_ROLES, sorted(picked)):
+                    yield {**self._keys(league, s, m), "referee": self.referee(league // 2, i), "role": role}
+
+    def standings(self) -> Iterator[dict]:
+        for league, s, matches in self._seasons():
+            table = {t: {"won": 0, "draw": 0, "lost": 0, "goals_for": 0, "goals_against": 0, "form": []}
+                     for t in range(self.scale.teams_per_league)}
+            for m in sorted(matches, key=lambda m: (m.matchday, m.day)):
+                for team, scored, conceded in ((m.home, *m.ft), (m.away, m.ft[1], m.ft[0])):
+                    row = table[team]
+                    result = "W" if scored > conceded else "L" if scored < conceded else "D"
+                    row[{"W": "won", "D": "draw", "L": "lost"}[result]] += 1
+                    row["goals_for"] += scored
+                    row["goals_against"] += conceded
+                    row["form"].append(result)
+            for row in table.values():
+                row["points"] = 3 * row["won"] + row["draw"]
+                row["goal_difference"] = row["goals_for"] - row["goals_against"]
+            ranked = sorted(table.items(), key=lambda kv: (-kv[1]["points"], -kv[1]["goal_difference"],
+                                                           -kv[1]["goals_for"], kv[0]))
+            for position, (team, row) in enumerate(ranked, 1):
+                yield {"league": self.league(league), "season": self.season_year(s), "team": self.team(league, team),
+                       "position": position, "played_games": row["won"] + row["draw"] + row["lost"],
+                       **{k: row[k] for k in ("won", "draw", "lost", "points", "goals_for", "goals_against",
+                                              "goal_difference")},
+                       "form": "".join(row["form"][-5:])}
+
+    def scorers(self) -> Iterator[dict]:
+        squad = self.scale.squad
+        weights = [GOAL_WEIGHT[self._position(p)] for p in range(squad)]
+        for league, s, matches in self._seasons():
+            rnd = self._rng("scorers", league, s)
+            goals: dict[tuple[int, int], list[int]] = {}
+            for m in matches:
+                for team, scored in ((m.home, m.ft[0]), (m.away, m.ft[1])):
+                    for _ in range(scored):
+                        scorer, assist = rnd.choices(range(squad), weights)[0], rnd.randrange(squad)
+                        penalty = rnd.random() < 0.1
+                        for player, i in ((scorer, 0), (assist, 1)):
+                            stats = goals.setdefault((team, player), [0, 0, 0])
+                            stats[i] += 1
+                        goals[(team, scorer)][2] += penalty
+            for (team, player), (g, a, p) in goals.items():
+                if g:
+                    yield {"league": self.league(league), "season": self.season_year(s),
+                           "team": self.team(league, team), "player": self.player(self._team_id(league, team), player),
+                           "goals": g, "assists": a, "penalties": p}
+
+    def rows(self, entity: str) -> Iterator[dict]:
+        if entity not in bulk.ENTITIES:
+            raise ValueError(f"Nieznana encja: {entity}")
+        return getattr(self, entity)()
+
+    def sources(self, entities: Sequence[str] = bulk.ENTITIES) -> list[tuple[str, Iterator[dict]]]:
+        """``(entity, rows)`` pairs for ``bulk.Importer.run``."""
+        return [(e, self.rows(e)) for e in entities]
+
+    def write(self, directory: str, fmt: str = "csv", entities: Sequence[str] = bulk.ENTITIES) -> dict[str, int]:
+        """One ``<entity>.<fmt>`` file per entity (``manage.py import_league_data <directory>``); returns row counts."""
+        if fmt not in ("csv", "ndjson"):
+            raise ValueError(f"Nieobsługiwany format: {fmt} (csv|ndjson)")
+        os.makedirs(directory, exist_ok=True)
+        counts = {}
+        for entity in entities:
+            n = 0
+            with open(os.path.join(directory, f"{entity}.{fmt}"), "w", newline="", encoding="utf-8") as f:
+                writer = None
+                for row in self.rows(entity):
+                    if fmt == "ndjson":
+                        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                    else:
+                        if writer is None:
+                            writer = csv.DictWriter(f, fieldnames=list(row))
+                            writer.writeheader()
+                        writer.writerow(row)
+                    n += 1
+            counts[entity] = n
+        return counts
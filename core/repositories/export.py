@@ -0,0 +1,130 @@
+"""
+Row streams for CSV/NDJSON exports (``LeagueRepo.stream``).
+
+Exports are flat: one row per entity with foreign keys as ids plus a few
+display names, the same columns on every backend (``COLUMNS``). Adapters
+read them in batches – Postgres through a named (server-side) cursor,
+MySQL through an unbuffered cursor, Mongo through a cursor with
+``batch_size`` – so memory stays flat regardless of table size. The SQL
+adapters stream on a dedicated connection: a long download must not hold
+a pool slot.
+"""
+from __future__ import annotations
+
+import csv
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from .filters import to_sql
+
+ENTITIES = ("leagues", "teams", "players", "matches")
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+BATCH_SIZE = 1000
+
+COLUMNS = {
+    "leagues": ("id", "name", "country_id", "country"),
+    "teams": ("id", "name", "founded_year", "league_id", "coach", "stadium"),
+    "players": ("id", "name", "position", "date_of_birth", "team_id", "nationality"),
+    "matches": ("id", "season_id", "matchday", "utc_date", "home_team_id", "away_team_id"),
+}
+
+# ---- SQL (Postgres / MySQL) ----
+# aliasy tabel jak w filters.FIELDS, żeby to_sql() działało bez zmian
+SQL = {
+    "leagues": """
+        SELECT l.league_id AS id, l.name, l.country_id, c.name AS country
+        FROM leagues l
+        LEFT JOIN countries c ON c.country_id = l.country_id
+    """,
+    "teams": """
+        SELECT t.team_id AS id, t.name, t.founded_year, tcl.league_id,
+               co.name AS coach, s.name AS stadium
+        FROM teams t
+        LEFT JOIN team_current_league tcl ON tcl.team_id = t.team_id
+        LEFT JOIN coaches co ON co.coach_id = t.coach_id
+        LEFT JOIN stadiums s ON s.stadium_id = t.stadium_id
+    """,
+    "players": """
+        SELECT p.player_id AS id, p.name, p.position, p.date_of_birth, p.team_id,
+               c.name AS nationality
+        FROM players p
+        LEFT JOIN countries c ON c.country_id = p.nationality_id
+    """,
+    "matches": """
+        SELECT m.match_id AS id, m.season_id, m.matchday, m.utc_date,
+               m.home_team_id, m.away_team_id
+        FROM matches m
+    """,
+}
+ORDER_BY = {"leagues": "l.league_id", "teams": "t.team_id", "players": "p.player_id", "matches": "m.match_id"}
+
+
+def sql(entity: str, filters: Optional[Mapping[str, Any]] = None) -> tuple[str, tuple]:
+    if entity not in SQL:
+        raise ValueError(f"Nieznana encja eksportu: {entity}")
+    where, params = to_sql(entity, filters)
+    query = SQL[entity]
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    return query + " ORDER BY " + ORDER_BY[entity], tuple(params)
+
+
+# ---- Mongo ----
+# (kolekcja, etapy po $match, mapowanie kolumna -> pole dokumentu)
+MONGO = {
+    "leagues": ("leagues", [
+        {"$lookup": {"from": "countries", "localField": "countryId", "foreignField": "_id", "as": "country"}},
+        {"$project": {"name": 1, "countryId": 1, "country": {"$arrayElemAt": ["$country.name", 0]}}},
+    ], {"name": "name", "country_id": "countryId", "country": "country"}),
+    "teams": ("teams", [
+        {"$project": {"name": 1, "foundedYear": 1, "leagueId": 1, "coach": "$coach.name", "stadium": "$stadium.name"}},
+    ], {"name": "name", "founded_year": "foundedYear", "league_id": "leagueId", "coach": "coach", "stadium": "stadium"}),
+    "players": ("players", [
+        {"$lookup": {"from": "countries", "localField": "nationalityId", "foreignField": "_id", "as": "nat"}},
+        {"$project": {"name": 1, "position": 1, "dateOfBirth": 1, "currentTeamId": 1,
+                      "nationality": {"$arrayElemAt": ["$nat.name", 0]}}},
+    ], {"name": "name", "position": "position", "date_of_birth": "dateOfBirth",
+        "team_id": "currentTeamId", "nationality": "nationality"}),
+    "matches": ("matches", [
+        {"$project": {"seasonId": 1, "matchday": 1, "utcDate": 1, "homeTeamId": 1, "awayTeamId": 1}},
+    ], {"season_id": "seasonId", "matchday": "matchday", "utc_date": "utcDate",
+        "home_team_id": "homeTeamId", "away_team_id": "awayTeamId"}),
+}
+
+
+def from_mongo(entity: str, doc: Mapping[str, Any]) -> dict[str, Any]:
+    fields = MONGO[entity][2]
+    return {"id": doc["_id"], **{col: doc.get(path) for col, path in fields.items()}}
+
+
+# ---- kodowanie ----
+def _cell(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, float, str, bool)):
+        return value
+    return str(value)    # ObjectId, Decimal
+
+
+class _Line:
+    """File-like sink for csv.writer: ``write`` returns the line instead of buffering it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def encode(fmt: str, entity: str, rows: Iterable[Mapping[str, Any]]) -> Iterator[str]:
+    columns = COLUMNS[entity]
+    if fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow(["" if (v := _cell(row.get(c))) is None else v for c in columns])
+    elif fmt == "ndjson":
+        for row in rows:
+            yield json.dumps({c: _cell(row.get(c)) for c in columns}, ensure_ascii=False) + "\n"
+    else:
+        raise ValueError(f"Nieznany format eksportu: {fmt}")
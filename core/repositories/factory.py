@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 
-from .base import LeagueRepo
+from .aio import ThreadedAsyncRepo
+from .base import AsyncLeagueRepo, LeagueRepo
 from .adapters.mock import MockAdapter
 from .adapters.postgres import PostgresAdapter
 from .adapters.mongo import MongoAdapter
 from .adapters.mysql import MysqlAdapter
+from .bus import InvalidationBus, build_transport
+from .cache import CachingRepo
+from .reference import ReferenceCache
+from .versions import DataVersions
 
 _repo_singleton: LeagueRepo | None = None
+_bus: InvalidationBus | None = None
+_reference: ReferenceCache | None = None
+_versions: DataVersions | None = None
+_async_repo: ThreadedAsyncRepo | None = None
+_async_executor: ThreadPoolExecutor | None = None
 
 
 def get_repo() -> LeagueRepo:
@@ -17,15 +28,85 @@ def get_repo() -> LeagueRepo:
     Jedno miejsce wyboru backendu danych.
     Widoki nie wiedzą, czy dane są z mocka, Postgresa czy Mongo.
     """
-    global _repo_singleton
+    global _repo_singleton, _reference, _versions
     if _repo_singleton is not None:
         return _repo_singleton
 
-    backend = getattr(settings, "DATA_BACKEND", "mock")
+    repo = _build_adapter(getattr(settings, "DATA_BACKEND", "mock"))
+    _start_bus(repo)
 
+    reference = getattr(settings, "REFERENCE_CACHE", None) or {}
+    _reference = ReferenceCache(repo, ttl=reference.get("ttl", 3600.0))
+    if reference.get("warmup"):
+        _reference.warm()
+    _versions = DataVersions(repo, ttl=getattr(settings, "API_ETAG_TTL", 300.0))
+
+    cache = getattr(settings, "REPO_CACHE", None) or {}
+    if cache.get("enabled"):
+        repo = CachingRepo(repo, max_entries=cache.get("max_entries", 2048), ttl=cache.get("ttl"))
+
+    _repo_singleton = repo
+    return _repo_singleton
+
+
+def get_reference() -> ReferenceCache:
+    """Listy opcji do formularzy (id, etykieta) dla bieżącego backendu."""
+    global _reference
+    repo = get_repo()
+    adapter = getattr(repo, "inner", repo)
+    if _reference is None or _reference.repo is not adapter:
+        # singleton repo podmieniony z zewnątrz (np. w testach)
+        _reference = ReferenceCache(adapter)
+    return _reference
+
+
+def get_async_repo() -> AsyncLeagueRepo:
+    """Async odczyty (widoki ASGI) – wywołania repo w puli wątków ASYNC_REPO_THREADS."""
+    global _async_repo, _async_executor
+    repo = get_repo()
+    if _async_repo is None or _async_repo.repo is not repo:
+        if _async_executor is None:
+            _async_executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "ASYNC_REPO_THREADS", 32), thread_name_prefix="repo-async"
+            )
+        _async_repo = ThreadedAsyncRepo(repo, _async_executor)
+    return _async_repo
+
+
+def get_versions() -> DataVersions:
+    """Wersje danych per encja (ETagi API) dla bieżącego backendu."""
+    global _versions
+    repo = get_repo()
+    adapter = getattr(repo, "inner", repo)
+    if _versions is None or _versions.repo is not adapter:
+        _versions = DataVersions(adapter, ttl=getattr(settings, "API_ETAG_TTL", 300.0))
+    return _versions
+
+
+def _start_bus(adapter: LeagueRepo) -> None:
+    """Unieważnianie cache między procesami (REPO_BUS) – zdarzenia zapisu innych workerów."""
+    global _bus
+    conf = getattr(settings, "REPO_BUS", None) or {}
+    kind = conf.get("transport")
+    if not kind:
+        return
+    if _bus is not None:
+        _bus.stop()
+    transport = build_transport(
+        kind,
+        dsn=getattr(settings, "POSTGRES_DSN", os.environ.get("POSTGRES_DSN", "")),
+        uri=getattr(settings, "MONGO_URI", ""),
+        db_name=getattr(settings, "MONGO_DB", ""),
+        channel=conf.get("channel"),
+        path=conf.get("path"),
+    )
+    _bus = InvalidationBus(transport, adapter)
+    _bus.start()
+
+
+def _build_adapter(backend: str) -> LeagueRepo:
     if backend == "mock":
-        _repo_singleton = MockAdapter()
-        return _repo_singleton
+        return MockAdapter()
 
     if backend == "postgres":
         dsn = getattr(settings, "POSTGRES_DSN", os.environ.get("POSTGRES_DSN", ""))
@@ -33,21 +114,25 @@ def get_repo() -> LeagueRepo:
         if not dsn:
             raise ValueError("Brak POSTGRES_DSN w ustawieniach lub zmiennych środowiskowych.")
 
-        _repo_singleton = PostgresAdapter(dsn=dsn)
-        return _repo_singleton
+        pool = getattr(settings, "POSTGRES_POOL", None)
+        if pool and not pool.get("max_size"):
+            pool = None
+
+        return PostgresAdapter(dsn=dsn, pool=pool)
 
     if backend == "mongo":
-        _repo_singleton = MongoAdapter(
+        return MongoAdapter(
             uri=getattr(settings, "MONGO_URI", ""),
             db_name=getattr(settings, "MONGO_DB", ""),
         )
-        return _repo_singleton
 
     if backend == "mysql":
         uri = getattr(settings, "MYSQL_URI", os.environ.get("MYSQL_URI", ""))
         if not uri:
             raise ValueError("Brak MYSQL_URI w ustawieniach lub zmiennych środowiskowych.")
-        _repo_singleton = MysqlAdapter(uri=uri)
-        return _repo_singleton
+        pool = getattr(settings, "MYSQL_POOL", None)
+        if pool and not pool.get("max_size"):
+            pool = None
+        return MysqlAdapter(uri=uri, pool=pool)
 
-    raise ValueError(f"Nieznany DATA_BACKEND={backend}. Użyj: mock|postgres|mongo|mysql.")
\ No newline at end of file
+    raise ValueError(f"Nieznany DATA_BACKEND={backend}. Użyj: mock|postgres|mongo|mysql.")
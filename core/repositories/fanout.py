@@ -0,0 +1,101 @@
+"""
+Parallel fan-out of independent repository calls for sync views.
+
+    item, teams, seasons = fan_out(
+        call(repo.get_match, match_id),
+        call(options.get, "teams"),
+        call(options.get, "seasons"),
+    )
+
+Calls run on one shared, bounded thread pool (``FANOUT_THREADS``), so a
+page costs roughly its slowest query instead of the sum of all of them.
+Results come back in call order. The first call to fail cancels the ones
+that have not started yet and its exception is re-raised in the view;
+a call running past its timeout raises ``FanOutTimeout``. Running calls
+cannot be interrupted – they finish in the background and their result
+is dropped.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+class FanOutTimeout(TimeoutError):
+    pass
+
+
+@dataclass(frozen=True)
+class Call:
+    fn: Callable[..., Any]
+    args: tuple = ()
+    kwargs: dict = field(default_factory=dict)
+    timeout: Optional[float] = None
+
+    def __str__(self) -> str:
+        return getattr(self.fn, "__qualname__", repr(self.fn))
+
+
+def call(fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Call:
+    """One fan-out call; ``timeout`` overrides the default of ``fan_out``."""
+    return Call(fn, args, kwargs, timeout)
+
+
+def executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "FANOUT_THREADS", 16), thread_name_prefix="repo-fanout"
+            )
+        return _executor
+
+
+def _run(ctx: contextvars.Context, c: Call) -> Any:
+    _local.worker = True
+    return ctx.run(c.fn, *c.args, **c.kwargs)
+
+
+def fan_out(*calls: Call | Callable[[], Any], timeout: Optional[float] = None) -> list[Any]:
+    calls = tuple(c if isinstance(c, Call) else Call(c) for c in calls)
+    if timeout is None:
+        timeout = getattr(settings, "FANOUT_TIMEOUT", None)
+    # jedno wywołanie albo fan-out z wątku puli (zagnieżdżony – groziłby zakleszczeniem puli): po kolei
+    if len(calls) < 2 or getattr(_local, "worker", False):
+        return [c.fn(*c.args, **c.kwargs) for c in calls]
+
+    start = time.monotonic()
+    pool = executor()
+    # kopia kontekstu na wywołanie: contextvars (np. instrumentacja żądania) widoczne w wątkach puli
+    futures: list[Future] = [pool.submit(_run, contextvars.copy_context(), c) for c in calls]
+    deadlines = {
+        f: start + t for f, c in zip(futures, calls) if (t := c.timeout if c.timeout is not None else timeout) is not None
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            wait_for = max(0.0, min(deadlines[f] for f in pending if f in deadlines) - time.monotonic()) \
+                if any(f in deadlines for f in pending) else None
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_EXCEPTION)
+            for f in done:
+                if f.exception() is not None:
+                    raise f.exception()
+            now = time.monotonic()
+            for f in pending:
+                if f in deadlines and deadlines[f] <= now:
+                    c = calls[futures.index(f)]
+                    raise FanOutTimeout(f"{c}: brak wyniku po {deadlines[f] - start:.1f} s")
+    finally:
+        for f in pending:
+            f.cancel()
+    return [f.result() for f in futures]
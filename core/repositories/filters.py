@@ -0,0 +1,189 @@
+"""
+Backend-neutral filters for ``list_*(filters=...)``.
+
+Filters are a mapping ``{"<field>[__<op>]": value}`` over a per-entity
+whitelist, e.g. ``{"league_id": "3"}``, ``{"position__in": ["GK", "DF"]}``,
+``{"founded_year__gte": 1900, "founded_year__lte": 1950}``,
+``{"name__prefix": "Leg"}``. They are parsed into ``Condition``s and
+compiled to parameterized SQL (Postgres/MySQL), a Mongo ``$match`` or a
+Python predicate (mock).
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+OPS = ("eq", "in", "gte", "lte", "prefix")
+
+
+class FilterError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Field:
+    kind: str           # "id" | "int" | "str" | "date"
+    sql: str            # kolumna/wyrażenie w zapytaniach SQL adapterów
+    mongo: str          # ścieżka w dokumencie Mongo
+    mock: str           # klucz w słownikach mock_repo
+
+
+@dataclass(frozen=True)
+class Condition:
+    field: str
+    op: str
+    value: Any
+
+
+FIELDS: dict[str, dict[str, Field]] = {
+    "leagues": {
+        "id": Field("id", "l.league_id", "_id", "id"),
+        "name": Field("str", "l.name", "name", "name"),
+        "country_id": Field("id", "l.country_id", "countryId", "country_id"),
+    },
+    "teams": {
+        "id": Field("id", "t.team_id", "_id", "id"),
+        "name": Field("str", "t.name", "name", "name"),
+        "founded_year": Field("int", "t.founded_year", "foundedYear", "founded_year"),
+        "league_id": Field("id", "tcl.league_id", "leagueId", "league_id"),
+    },
+    "players": {
+        "id": Field("id", "p.player_id", "_id", "id"),
+        "name": Field("str", "p.name", "name", "name"),
+        "position": Field("str", "p.position", "position", "position"),
+        "team_id": Field("id", "p.team_id", "currentTeamId", "team_id"),
+        "nationality_id": Field("id", "p.nationality_id", "nationalityId", "nationality_id"),
+    },
+    "matches": {
+        "id": Field("id", "m.match_id", "_id", "id"),
+        "season_id": Field("id", "m.season_id", "seasonId", "season_id"),
+        "matchday": Field("int", "m.matchday", "matchday", "matchday"),
+        "utc_date": Field("date", "m.utc_date", "utcDate", "utc_date"),
+        "home_team_id": Field("id", "m.home_team_id", "homeTeamId", "home_team_id"),
+        "away_team_id": Field("id", "m.away_team_id", "awayTeamId", "away_team_id"),
+    },
+}
+
+
+def parse(entity: str, filters: Optional[Mapping[str, Any]]) -> list[Condition]:
+    if not filters:
+        return []
+    allowed = FIELDS[entity]
+    out = []
+    for key, value in filters.items():
+        name, _, op = key.partition("__")
+        op = op or "eq"
+        if name not in allowed:
+            raise FilterError(f"Niedozwolone pole filtra dla {entity}: {name}")
+        if op not in OPS:
+            raise FilterError(f"Nieznany operator filtra: {op}")
+        if op == "in":
+            if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+                raise FilterError(f"{key}: oczekiwano listy wartości")
+            value = list(value)
+        elif op == "prefix" and allowed[name].kind != "str":
+            raise FilterError(f"{key}: prefix działa tylko dla pól tekstowych")
+        out.append(Condition(name, op, value))
+    return out
+
+
+def _coerce(kind: str, value: Any, id_cast: Callable[[Any], Any]) -> Any:
+    try:
+        if kind == "id":
+            return id_cast(value)
+        if kind == "int":
+            return int(value)
+        if kind == "date":
+            if isinstance(value, (date, datetime)):
+                return value
+            return date.fromisoformat(str(value)[:10])
+        return str(value)
+    except Exception as e:
+        raise FilterError(f"Niepoprawna wartość filtra ({kind}): {value!r}") from e
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# ---- SQL (Postgres / MySQL) ----
+def to_sql(entity: str, filters: Optional[Mapping[str, Any]]) -> tuple[list[str], list[Any]]:
+    """Returns (WHERE clauses joined with AND by the caller, params)."""
+    where: list[str] = []
+    params: list[Any] = []
+    for c in parse(entity, filters):
+        f = FIELDS[entity][c.field]
+        if c.op == "eq":
+            where.append(f"{f.sql} = %s")
+            params.append(_coerce(f.kind, c.value, int))
+        elif c.op == "in":
+            if not c.value:
+                where.append("1 = 0")
+                continue
+            where.append(f"{f.sql} IN ({', '.join(['%s'] * len(c.value))})")
+            params.extend(_coerce(f.kind, v, int) for v in c.value)
+        elif c.op == "gte":
+            where.append(f"{f.sql} >= %s")
+            params.append(_coerce(f.kind, c.value, int))
+        elif c.op == "lte":
+            where.append(f"{f.sql} <= %s")
+            params.append(_coerce(f.kind, c.value, int))
+        elif c.op == "prefix":
+            where.append(f"{f.sql} LIKE %s")
+            params.append(escape_like(str(c.value)) + "%")
+    return where, params
+
+
+# ---- Mongo ----
+def _mongo_value(kind: str, value: Any, id_cast: Callable[[Any], Any]) -> Any:
+    value = _coerce(kind, value, id_cast)
+    if kind == "date" and not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value
+
+
+def to_mongo(entity: str, filters: Optional[Mapping[str, Any]], id_cast: Callable[[Any], Any]) -> list[dict]:
+    """Returns a list of $match conditions (to be combined with $and)."""
+    out: list[dict] = []
+    for c in parse(entity, filters):
+        f = FIELDS[entity][c.field]
+        if c.op == "eq":
+            out.append({f.mongo: _mongo_value(f.kind, c.value, id_cast)})
+        elif c.op == "in":
+            out.append({f.mongo: {"$in": [_mongo_value(f.kind, v, id_cast) for v in c.value]}})
+        elif c.op == "gte":
+            out.append({f.mongo: {"$gte": _mongo_value(f.kind, c.value, id_cast)}})
+        elif c.op == "lte":
+            value = _mongo_value(f.kind, c.value, id_cast)
+            if f.kind == "date":
+                # data bez godziny – mecz o 20:00 danego dnia też ma się załapać
+                out.append({f.mongo: {"$lt": value.replace(hour=0, minute=0, second=0) + timedelta(days=1)}})
+            else:
+                out.append({f.mongo: {"$lte": value}})
+        elif c.op == "prefix":
+            # zakotwiczony regex bez flagi "i" może użyć indeksu
+            out.append({f.mongo: {"$regex": "^" + re.escape(str(c.value))}})
+    return out
+
+
+# ---- Python (mock) ----
+def matches(entity: str, filters: Optional[Mapping[str, Any]], item: Mapping[str, Any]) -> bool:
+    for c in parse(entity, filters):
+        f = FIELDS[entity][c.field]
+        raw = item.get(f.mock)
+        if raw is None:
+            return False
+        value = _coerce(f.kind, raw, str)
+        if c.op == "eq" and value != _coerce(f.kind, c.value, str):
+            return False
+        if c.op == "in" and value not in [_coerce(f.kind, v, str) for v in c.value]:
+            return False
+        if c.op == "gte" and value < _coerce(f.kind, c.value, str):
+            return False
+        if c.op == "lte" and value > _coerce(f.kind, c.value, str):
+            return False
+        if c.op == "prefix" and not value.startswith(str(c.value)):
+            return False
+    return True
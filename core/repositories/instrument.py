@@ -0,0 +1,188 @@
+"""
+Per-request record of ``LeagueRepo`` calls.
+
+Adapters are decorated with ``traced(backend)``: while a ``RequestTrace``
+is active (``tracing()``, opened by ``core.middleware.RepoTimingMiddleware``)
+every ``LeagueRepo`` method appends one ``RepoCall`` – method, argument
+shape, rows returned, wall time, backend and database round trips (counted
+by the adapters through ``round_trip()``). The trace lives in a context
+variable, so calls made from the async facade's and the fan-out pool's
+threads land in the request that issued them. Latency and errors of
+every call, in a request or not, also go to ``metrics``.
+
+The adapter itself is decorated (not wrapped in another object), so
+``get_repo()`` keeps returning the adapter that sends ``repo_changed``.
+Only calls that reach the adapter are recorded: ``CachingRepo`` hits are
+not queries.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from collections.abc import Mapping, Sized
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+from . import metrics
+from .base import LeagueRepo
+
+logger = logging.getLogger(__name__)
+
+# tylko metody protokołu – cache_stats(), pool_stats() itp. nie są zapytaniami
+METHODS = frozenset(n for n in dir(LeagueRepo) if not n.startswith("_"))
+
+_local = threading.local()
+_current: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("repo_trace", default=None)
+
+
+@dataclass
+class RepoCall:
+    method: str
+    shape: str
+    rows: Optional[int]
+    ms: float
+    backend: str
+    error: Optional[str] = None
+    round_trips: int = 0
+
+
+@dataclass
+class RequestTrace:
+    calls: list[RepoCall] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def count(self) -> int:
+        return len(self.calls)
+
+    @property
+    def round_trips(self) -> int:
+        return sum(c.round_trips for c in self.calls)
+
+    @property
+    def repo_ms(self) -> float:
+        return sum(c.ms for c in self.calls)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def by_method(self) -> dict[str, tuple[int, float]]:
+        """method -> (calls, ms), slowest first."""
+        out: dict[str, tuple[int, float]] = {}
+        for c in self.calls:
+            n, ms = out.get(c.method, (0, 0.0))
+            out[c.method] = (n + 1, ms + c.ms)
+        return dict(sorted(out.items(), key=lambda kv: -kv[1][1]))
+
+
+def current() -> Optional[RequestTrace]:
+    return _current.get()
+
+
+@contextmanager
+def tracing() -> Iterator[RequestTrace]:
+    trace = RequestTrace()
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+def shape(args: tuple, kwargs: Mapping[str, Any]) -> str:
+    """Argument shape without values: ``[3]`` for 3 ids, ``filters{league_id}``, ``q``."""
+    def one(value: Any) -> str:
+        if isinstance(value, Mapping):
+            return "{%s}" % ",".join(sorted(map(str, value)))
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return f"[{len(value)}]"
+        return "id" if isinstance(value, (str, int)) else type(value).__name__
+    parts = [one(a) for a in args]
+    parts += [k + (one(v) if isinstance(v, (Mapping, list, tuple, set)) else "") for k, v in kwargs.items() if v is not None]
+    return ", ".join(parts)
+
+
+def rows(result: Any) -> Optional[int]:
+    if result is None:
+        return 0
+    if isinstance(result, (bool, int, float, str)):
+        return None    # count_*, create_* (id)
+    if isinstance(result, Sized):
+        # pojedynczy rekord (get_team) to słownik z polami, nie z id
+        return 1 if isinstance(result, Mapping) and "id" in result else len(result)
+    return None    # generator (stream) – czas dotyczy tylko otwarcia
+
+
+def round_trip() -> None:
+    """One statement/command sent to the database by the current repo call (adapters' query helpers)."""
+    _local.round_trips = getattr(_local, "round_trips", 0) + 1
+
+
+def _timed(method: Callable, name: str, backend: str) -> Callable:
+    @wraps(method)
+    def timed(self, *args, **kwargs):
+        # wywołania wewnątrz adaptera (update_player -> get_player) liczą się do zewnętrznego
+        if getattr(_local, "depth", 0):
+            return method(self, *args, **kwargs)
+        _local.depth = 1
+        _local.round_trips = 0
+        start = time.perf_counter()
+        error = result = None
+        try:
+            result = method(self, *args, **kwargs)
+            return result
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            _local.depth = 0
+            seconds = time.perf_counter() - start
+            trips = _local.round_trips
+            metrics.repo_latency.observe(seconds, name, backend)
+            metrics.repo_round_trips.inc(name, backend, amount=trips)
+            if error:
+                metrics.repo_errors.inc(name, backend, error)
+            trace = _current.get()
+            if trace is not None:
+                trace.calls.append(RepoCall(
+                    name, shape(args, kwargs), None if error else rows(result), seconds * 1000, backend, error, trips,
+                ))
+    return timed
+
+
+def traced(backend: str) -> Callable[[type], type]:
+    """Class decorator for adapters: every ``LeagueRepo`` method records itself in metrics and the active trace."""
+    def decorate(cls: type) -> type:
+        for name in METHODS:
+            method = cls.__dict__.get(name)
+            if callable(method):
+                setattr(cls, name, _timed(method, name, backend))
+        return cls
+    return decorate
+
+
+def server_timing(trace: RequestTrace, limit: int = 8) -> str:
+    """``Server-Timing`` value: the repo total plus the ``limit`` slowest methods."""
+    entries = [f'repo;dur={trace.repo_ms:.1f};desc="{trace.count} calls"']
+    for method, (n, ms) in list(trace.by_method().items())[:limit]:
+        entries.append(f'repo-{method.replace("_", "-")};dur={ms:.1f};desc="{n}x"')
+    return ", ".join(entries)
+
+
+def check_budget(trace: RequestTrace, label: str, max_calls: Optional[int], max_ms: Optional[float]) -> bool:
+    """Logs (WARNING) a request over its query-count or repo-time budget; True if over."""
+    over_calls = max_calls is not None and trace.count > max_calls
+    over_ms = max_ms is not None and trace.repo_ms > max_ms
+    if not (over_calls or over_ms):
+        return False
+    top = ", ".join(f"{m} {n}x/{ms:.1f}ms" for m, (n, ms) in list(trace.by_method().items())[:5])
+    logger.warning(
+        "%s: %d wywołań repo, %.1f ms (budżet %s wywołań / %s ms): %s",
+        label, trace.count, trace.repo_ms, max_calls, max_ms, top,
+    )
+    return True
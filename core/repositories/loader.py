@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, Optional
+
+from .base import AsyncLeagueRepo, LeagueRepo
+
+ENTITIES = ("leagues", "teams", "players", "matches")
+
+
+class DataLoader:
+    """
+    Request-scoped batch loader with an identity map.
+
+    ``want()`` queues ids while a view works out what it needs; the first
+    ``load()``/``load_many()`` for an entity resolves everything queued for it
+    with a single ``get_<entity>_many`` call. Each id is fetched at most once
+    per loader – misses are remembered too.
+
+    ``aload()``/``aload_many()`` do the same for async views through ``arepo``
+    and share the identity map with the sync methods.
+    """
+
+    def __init__(self, repo: LeagueRepo, arepo: Optional[AsyncLeagueRepo] = None):
+        self.repo = repo
+        self.arepo = arepo
+        self._seen: dict[str, dict[str, Optional[Mapping[str, Any]]]] = {e: {} for e in ENTITIES}
+        self._queued: dict[str, set[str]] = {e: set() for e in ENTITIES}
+
+    def want(self, entity: str, *ids: Any) -> None:
+        seen = self._seen[entity]
+        self._queued[entity].update(str(i) for i in ids if i is not None and str(i) not in seen)
+
+    def load(self, entity: str, obj_id: Any) -> Optional[Mapping[str, Any]]:
+        if obj_id is None:
+            return None
+        return self.load_many(entity, [obj_id])[0]
+
+    def load_many(self, entity: str, ids: Iterable[Any]) -> list[Optional[Mapping[str, Any]]]:
+        ids = [None if i is None else str(i) for i in ids]
+        self.want(entity, *ids)
+        self._flush(entity)
+        seen = self._seen[entity]
+        return [None if i is None else seen.get(i) for i in ids]
+
+    async def aload(self, entity: str, obj_id: Any) -> Optional[Mapping[str, Any]]:
+        if obj_id is None:
+            return None
+        return (await self.aload_many(entity, [obj_id]))[0]
+
+    async def aload_many(self, entity: str, ids: Iterable[Any]) -> list[Optional[Mapping[str, Any]]]:
+        ids = [None if i is None else str(i) for i in ids]
+        self.want(entity, *ids)
+        queued = self._take(entity)
+        if queued:
+            self._store(entity, queued, await getattr(self.arepo, f"get_{entity}_many")(sorted(queued)))
+        seen = self._seen[entity]
+        return [None if i is None else seen.get(i) for i in ids]
+
+    def prime(self, entity: str, obj: Mapping[str, Any]) -> None:
+        self._seen[entity][str(obj["id"])] = obj
+
+    def clear(self, entity: Optional[str] = None) -> None:
+        for e in ([entity] if entity else ENTITIES):
+            self._seen[e].clear()
+            self._queued[e].clear()
+
+    def _flush(self, entity: str) -> None:
+        queued = self._take(entity)
+        if queued:
+            self._store(entity, queued, getattr(self.repo, f"get_{entity}_many")(sorted(queued)))
+
+    def _take(self, entity: str) -> set[str]:
+        queued, self._queued[entity] = self._queued[entity], set()
+        return queued
+
+    def _store(self, entity: str, queued: set[str], found: Mapping[str, Any]) -> None:
+        seen = self._seen[entity]
+        for i in queued:
+            seen[i] = found.get(i)
+
+
+def request_loader(request, repo: LeagueRepo, arepo: Optional[AsyncLeagueRepo] = None) -> DataLoader:
+    """The DataLoader bound to ``request`` (created on first use)."""
+    loader = getattr(request, "_repo_loader", None)
+    if loader is None or loader.repo is not repo or (arepo is not None and loader.arepo is not arepo):
+        loader = request._repo_loader = DataLoader(repo, arepo)
+    return loader
@@ -0,0 +1,278 @@
+"""
+In-process metrics in the Prometheus text format (``GET /metrics``).
+
+Counters and histograms are sharded per thread: a worker thread only ever
+writes its own dict, so recording takes no lock (the registry lock is taken
+once per thread, on its first sample). A scrape copies every shard and sums
+them; shards of finished threads are folded into one running total. Values
+are per process – with several workers, scrape each one or aggregate in
+Prometheus.
+
+Recorded automatically: HTTP requests by URL name (``MetricsMiddleware``)
+and every ``LeagueRepo`` call by method and backend (``instrument.traced``).
+Pool and cache gauges are read from the repo at scrape time
+(``repo_samples``).
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+# sekundy; od pojedynczego trafienia w indeks do zapytania, które trzeba naprawić
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = tuple[str, dict[str, Any], float]
+
+
+class _Holder:
+    """Per-thread owner of a shard; its finalizer retires the shard when the thread exits."""
+
+    __slots__ = ("shard", "__weakref__")
+
+    def __init__(self, shard: dict):
+        self.shard = shard
+
+
+class _Shards:
+    """Per-thread dicts; writers touch only their own, readers copy all of them.
+
+    When a thread exits its shard is folded into ``_retired`` with ``combine``,
+    so short-lived threads (executor pools, per-request threads) do not pile up.
+    """
+
+    def __init__(self, combine: Callable[[Any, Any], Any]):
+        self._combine = combine
+        self._local = threading.local()
+        self._all: dict[int, dict] = {}
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+
+    def mine(self) -> dict:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._local.holder = _Holder({})
+            with self._lock:
+                self._all[id(holder.shard)] = holder.shard
+            # threading.local zwalnia holder przy końcu wątku; finalizer nie może trzymać holdera
+            weakref.finalize(holder, self._retire, holder.shard)
+        return holder.shard
+
+    def _retire(self, shard: dict) -> None:
+        with self._lock:
+            self._all.pop(id(shard), None)
+            for key, value in shard.items():
+                # combine zwraca nową wartość – kopia _retired w copies() jest spójna
+                self._retired[key] = self._combine(self._retired[key], value) if key in self._retired else value
+
+    def copies(self) -> list[dict]:
+        with self._lock:
+            shards = list(self._all.values())
+            retired = self._retired.copy()
+        # dict.copy() w CPythonie jest atomowe względem zapisów innych wątków (GIL)
+        return [retired] + [s.copy() for s in shards]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._retired.clear()
+            for s in self._all.values():
+                s.clear()
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._shards = _Shards(self._combine)
+
+    @staticmethod
+    def _combine(total: Any, value: Any) -> Any:
+        raise NotImplementedError
+
+    def _key(self, values: tuple) -> tuple:
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name}: oczekiwane etykiety {self.labels}")
+        return tuple(str(v) for v in values)
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    @staticmethod
+    def _combine(total: float, value: float) -> float:
+        return total + value
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        shard = self._shards.mine()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def value(self, *labels: Any) -> float:
+        key = self._key(labels)
+        return sum(s.get(key, 0.0) for s in self._shards.copies())
+
+    def samples(self) -> Iterator[Sample]:
+        total: dict[tuple, float] = {}
+        for shard in self._shards.copies():
+            for key, v in shard.items():
+                total[key] = total.get(key, 0.0) + v
+        for key in sorted(total):
+            yield self.name + "_total", dict(zip(self.labels, key)), total[key]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    @staticmethod
+    def _combine(total: list, value: list) -> list:
+        return [a + b for a, b in zip(total, value)]
+
+    def observe(self, value: float, *labels: Any) -> None:
+        shard = self._shards.mine()
+        key = self._key(labels)
+        # [liczniki kubełków (nieskumulowane, ostatni = +Inf), suma, liczba]
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def count(self, *labels: Any) -> int:
+        key = self._key(labels)
+        return sum(s[key][-1] for s in self._shards.copies() if key in s)
+
+    def samples(self) -> Iterator[Sample]:
+        total: dict[tuple, list] = {}
+        for shard in self._shards.copies():
+            for key, state in shard.items():
+                acc = total.setdefault(key, [0] * len(state))
+                for i, v in enumerate(list(state)):
+                    acc[i] += v
+        for key in sorted(total):
+            state, labels = total[key], dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), state):
+                cumulative += n
+                yield self.name + "_bucket", {**labels, "le": _float(bound)}, cumulative
+            yield self.name + "_sum", labels, state[-2]
+            yield self.name + "_count", labels, state[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metryka {metric.name} już istnieje")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self, extra: Iterable[tuple[str, str, str, Iterable[Sample]]] = ()) -> str:
+        """Text exposition; ``extra``: ``(name, kind, help, samples)`` families computed at scrape time."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        families = [(m.name, m.kind, m.help, m.samples()) for m in metrics] + list(extra)
+        lines = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{sample}{_labels(labels)} {_float(value)}" for sample, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        with self._lock:
+            for m in self._metrics.values():
+                m._shards.clear()
+
+
+def _float(value: float) -> str:
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() and abs(value) < 1e15 else repr(value)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.counter(
+    "http_requests", "HTTP requests by URL name, method and status code.", ("view", "method", "status"))
+http_latency = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by URL name.", ("view",))
+http_exceptions = REGISTRY.counter(
+    "http_exceptions", "Unhandled view exceptions by URL name and type.", ("view", "exception"))
+repo_latency = REGISTRY.histogram(
+    "repo_call_duration_seconds", "LeagueRepo call latency by method and backend.", ("method", "backend"))
+repo_round_trips = REGISTRY.counter(
+    "repo_round_trips", "Database statements/commands issued by LeagueRepo calls, by method and backend.",
+    ("method", "backend"))
+repo_errors = REGISTRY.counter(
+    "repo_call_errors", "LeagueRepo calls that raised, by method, backend and exception type.",
+    ("method", "backend", "error"))
+
+
+def repo_samples(repo: Any) -> list[tuple[str, str, str, list[Sample]]]:
+    """Pool and cache gauges of ``repo`` (and the adapter behind a ``CachingRepo``) at scrape time."""
+    families: list[tuple[str, str, str, list[Sample]]] = []
+    pool: Optional[dict] = getattr(repo, "pool_stats", lambda: None)()
+    if pool:
+        labels = {"pool": pool["name"]}
+        in_use = [("repo_pool_connections", {**labels, "state": "in_use"}, pool["in_use"]),
+                  ("repo_pool_connections", {**labels, "state": "idle"}, pool["idle"])]
+        families += [
+            ("repo_pool_connections", "gauge", "Open pool connections by state.", in_use),
+            ("repo_pool_max_size", "gauge", "Pool size limit (without overflow).",
+             [("repo_pool_max_size", labels, pool["max_size"])]),
+            ("repo_pool_utilization", "gauge", "Borrowed connections / max_size.",
+             [("repo_pool_utilization", labels, pool["in_use"] / pool["max_size"] if pool["max_size"] else 0.0)]),
+            ("repo_pool_waiting", "gauge", "Threads waiting for a connection.",
+             [("repo_pool_waiting", labels, pool.get("waiting", 0))]),
+            ("repo_pool_timeouts", "counter", "Borrows that timed out.",
+             [("repo_pool_timeouts_total", labels, pool.get("timeouts", 0))]),
+        ]
+    cache_stats = getattr(repo, "cache_stats", None)
+    if callable(cache_stats):
+        stats = cache_stats()
+        families += [
+            ("repo_cache_hits", "counter", "CachingRepo lookups served from cache.",
+             [("repo_cache_hits_total", {}, stats["hits"])]),
+            ("repo_cache_misses", "counter", "CachingRepo lookups that went to the backend.",
+             [("repo_cache_misses_total", {}, stats["misses"])]),
+            ("repo_cache_hit_ratio", "gauge", "hits / (hits + misses) since start.",
+             [("repo_cache_hit_ratio", {}, stats["hit_ratio"])]),
+            ("repo_cache_entries", "gauge", "Entries in the CachingRepo LRU.",
+             [("repo_cache_entries", {}, stats["size"])]),
+        ]
+    return families
@@ -20,6 +20,7 @@ MATCHES = [
     "matchday": 12,
     "league_id": LEAGUES[0]["id"],
     "season": "2024/2025",
+    "season_id": "2",
     "home_team_id": TEAMS[0]["id"],
     "away_team_id": TEAMS[1]["id"],
     "score": {"half_time": {"home": 1, "away": 0}, "full_time": {"home": 2, "away": 1}},
@@ -28,6 +29,25 @@ MATCHES = [
   }
 ]
 
+COUNTRIES = [
+  {"id": 1, "name": "England"},
+  {"id": 2, "name": "Spain"},
+  {"id": 3, "name": "Poland"},
+  {"id": 4, "name": "Germany"},
+  {"id": 5, "name": "France"},
+  {"id": 6, "name": "Italy"},
+]
+
+SEASONS = [
+  {"id": 1, "year": "2023-2024", "league_name": "Premier League"},
+  {"id": 2, "year": "2024-2025", "league_name": "Premier League"},
+]
+
+# tylko z importu (bulk / dataset.py); mecze trzymają nazwiska sędziów w "referees"
+REFEREES = []
+STANDINGS = []
+SCORERS = []
+
 def _filter_q(items, q, fields):
   if not q:
     return items
@@ -43,7 +63,12 @@ def get_team(team_id: str): return next((t for t in TEAMS if t["id"] == team_id)
 def list_players(q=None): return _filter_q(PLAYERS, q, ["name", "position", "nationality"])
 def get_player(player_id: str): return next((p for p in PLAYERS if p["id"] == player_id), None)
 
-def list_matches(q=None): return MATCHES
+def list_matches(q=None):
+  if not q:
+    return MATCHES
+  ql = q.lower()
+  def teams(m): return " ".join((get_team(m[k]) or {}).get("name", "") for k in ("home_team_id", "away_team_id"))
+  return [m for m in MATCHES if ql in teams(m).lower()]
 def get_match(match_id: str): return next((m for m in MATCHES if m["id"] == match_id), None)
 
 def team_players(team_id: str): return [p for p in PLAYERS if p["team_id"] == team_id]
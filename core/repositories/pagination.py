@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class Page(list):
+    """
+    One page of a keyset-paginated ``list_*`` call.
+
+    It is a plain list (templates and callers iterate it as before) that also
+    carries ``next_cursor`` – an opaque token for the following page, or None
+    on the last page.
+    """
+
+    def __init__(self, items: Iterable[Mapping[str, Any]] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+def clamp_limit(limit: Any, default: int = DEFAULT_LIMIT) -> int:
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *types: Callable[[Any], Any]) -> Optional[tuple]:
+    """
+    Return the ORDER BY key stored in ``cursor`` or None.
+
+    ``types`` convert each stored value back to what the query expects
+    (e.g. ``str, int`` for ``(name, id)``); None values are passed through.
+    A missing or malformed cursor means "start from the first page" – it comes
+    straight from the query string, so we never fail the request because of it.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            return None
+        return tuple(v if v is None else t(v) for t, v in zip(types, values))
+    except Exception:
+        return None
+
+
+def make_page(
+    rows: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], Sequence[Any]],
+    convert: Callable[[Any], Mapping[str, Any]] = lambda row: row,
+) -> Page:
+    """
+    Build a Page from ``rows`` fetched with ``LIMIT limit + 1``.
+
+    The extra row only tells us whether a next page exists; the cursor is
+    taken from the last row that is actually returned. ``key`` reads the
+    ORDER BY values from a raw row, ``convert`` maps a raw row to the
+    adapter's output format.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(*key(rows[-1])) if has_more and rows else None
+    return Page((convert(r) for r in rows), next_cursor)
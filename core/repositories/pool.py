@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection could be borrowed within the pool timeout."""
+
+
+@dataclass
+class _Slot:
+    conn: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ConnectionPool:
+    """
+    Small, driver-agnostic, thread-safe connection pool.
+
+    Connections are opened lazily (nothing happens in the constructor), so
+    building an adapter never blocks on the database; ``warmup()`` can open
+    ``min_size`` connections in the background. The pool keeps ``max_size``
+    connections and allows up to ``max_overflow`` extra ones under load
+    (closed as soon as they are returned). Idle connections are checked
+    before being handed out, closed after ``max_idle`` seconds (down to
+    ``min_size``) and replaced once older than ``max_lifetime``.
+
+    Borrowing is reentrant per thread: a nested ``connection()`` block in the
+    same thread gets the connection already held by the outer block.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_overflow: int = 0,
+        timeout: float = 5.0,
+        max_idle: float = 300.0,
+        max_lifetime: float = 0.0,
+        check_interval: float = 30.0,
+        check: Optional[Callable[[Any], bool]] = None,
+        reset: Optional[Callable[[Any], None]] = None,
+        close: Optional[Callable[[Any], None]] = None,
+        name: str = "pool",
+    ):
+        if max_size < 1:
+            raise ValueError("max_size musi być >= 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size musi być w zakresie 0..max_size")
+        if max_overflow < 0:
+            raise ValueError("max_overflow musi być >= 0")
+
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_interval = check_interval
+
+        self._connect = connect
+        self._check = check
+        self._reset = reset
+        self._close_conn = close or (lambda conn: conn.close())
+
+        self._cond = threading.Condition()
+        self._idle: list[_Slot] = []
+        self._in_use: dict[int, _Slot] = {}
+        self._opening = 0
+        self._closed = False
+        self._local = threading.local()
+
+        self._counters = {
+            "created": 0,
+            "closed": 0,
+            "borrows": 0,
+            "timeouts": 0,
+            "failed_checks": 0,
+            "recycled_idle": 0,
+            "recycled_lifetime": 0,
+            "overflow_closed": 0,
+            "reset_failures": 0,
+            "waiting": 0,
+        }
+
+    # ---- public API ----
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for the duration of the ``with`` block."""
+        held = getattr(self._local, "slot", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held.conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        slot = self._acquire()
+        self._local.slot, self._local.depth = slot, 1
+        broken = False
+        try:
+            yield slot.conn
+        except BaseException:
+            broken = self._is_broken(slot.conn)
+            raise
+        finally:
+            self._local.slot = None
+            self._release(slot, broken=broken)
+
+    def warmup(self, *, background: bool = True) -> None:
+        """Open connections up to ``min_size`` (in a daemon thread by default)."""
+        if background:
+            threading.Thread(target=self._warmup, name=f"{self.name}-warmup", daemon=True).start()
+        else:
+            self._warmup()
+
+    def _warmup(self) -> None:
+        opened = []
+        try:
+            while True:
+                with self._cond:
+                    if self._closed or self._total() >= self.min_size:
+                        break
+                    self._opening += 1
+                opened.append(self._open_slot())
+        except Exception as e:
+            # pula i tak spróbuje otworzyć połączenie przy pierwszym użyciu
+            logger.warning("%s: warm-up failed: %s", self.name, e)
+        finally:
+            for slot in opened:
+                self._release(slot)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "name": self.name,
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "max_overflow": self.max_overflow,
+                "size": len(self._idle) + len(self._in_use) + self._opening,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                **self._counters,
+            }
+
+    def close(self) -> None:
+        """Close every idle connection; borrowed ones are closed on return."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for slot in idle:
+            self._discard(slot)
+
+    # ---- internals ----
+    def _acquire(self) -> _Slot:
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            if self._closed:
+                raise PoolTimeout(f"{self.name}: pula jest zamknięta")
+            self._counters["waiting"] += 1
+            try:
+                while True:
+                    if self._idle:
+                        slot = self._idle.pop()
+                        self._in_use[id(slot)] = slot
+                        break
+                    if self._total() < self.max_size + self.max_overflow:
+                        self._opening += 1
+                        slot = None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"{self.name}: brak wolnego połączenia po {self.timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+            finally:
+                self._counters["waiting"] -= 1
+
+        if slot is None:
+            return self._open_slot()
+
+        if self._expired(slot):
+            with self._cond:
+                self._in_use.pop(id(slot), None)
+                self._counters["recycled_lifetime"] += 1
+                self._opening += 1
+            self._discard(slot)
+            return self._open_slot()
+
+        if not self._healthy(slot):
+            with self._cond:
+                self._in_use.pop(id(slot), None)
+                self._counters["failed_checks"] += 1
+                self._opening += 1
+            self._discard(slot)
+            return self._open_slot()
+
+        with self._cond:
+            self._counters["borrows"] += 1
+        return slot
+
+    def _open_slot(self) -> _Slot:
+        """Open a new connection for a reserved (``_opening``) place."""
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._opening -= 1
+                self._cond.notify()
+            raise
+        slot = _Slot(conn)
+        with self._cond:
+            self._opening -= 1
+            self._in_use[id(slot)] = slot
+            self._counters["created"] += 1
+            self._counters["borrows"] += 1
+        return slot
+
+    def _release(self, slot: _Slot, *, broken: bool = False) -> None:
+        if not broken and self._reset is not None:
+            try:
+                self._reset(slot.conn)
+            except Exception:
+                broken = True
+                with self._cond:
+                    self._counters["reset_failures"] += 1
+
+        now = time.monotonic()
+        stale: list[_Slot] = []
+        with self._cond:
+            self._in_use.pop(id(slot), None)
+            if broken or self._closed:
+                stale.append(slot)
+            elif self._total() >= self.max_size:
+                # connection opened as overflow (or pool shrank) -> do not keep it
+                self._counters["overflow_closed"] += 1
+                stale.append(slot)
+            elif self._expired(slot):
+                self._counters["recycled_lifetime"] += 1
+                stale.append(slot)
+            else:
+                slot.last_used = now
+                self._idle.append(slot)
+                stale.extend(self._sweep_idle(now))
+            self._cond.notify()
+        for s in stale:
+            self._discard(s)
+
+    def _sweep_idle(self, now: float) -> list[_Slot]:
+        """Pick idle connections past ``max_idle`` while keeping ``min_size`` open."""
+        if not self.max_idle:
+            return []
+        stale = []
+        keep = []
+        # oldest first, so the most recently used connections stay warm
+        for slot in sorted(self._idle, key=lambda s: s.last_used):
+            total = self._total() - len(stale)
+            if now - slot.last_used > self.max_idle and total > self.min_size:
+                stale.append(slot)
+            else:
+                keep.append(slot)
+        self._idle = keep
+        self._counters["recycled_idle"] += len(stale)
+        return stale
+
+    def _expired(self, slot: _Slot) -> bool:
+        return bool(self.max_lifetime) and time.monotonic() - slot.created_at > self.max_lifetime
+
+    def _healthy(self, slot: _Slot) -> bool:
+        if self._check is None:
+            return True
+        if time.monotonic() - slot.last_used < self.check_interval:
+            return True
+        try:
+            return bool(self._check(slot.conn))
+        except Exception:
+            return False
+
+    def _is_broken(self, conn: Any) -> bool:
+        if self._check is None:
+            return False
+        try:
+            return not self._check(conn)
+        except Exception:
+            return True
+
+    def _discard(self, slot: _Slot) -> None:
+        try:
+            self._close_conn(slot.conn)
+        except Exception:
+            pass
+        with self._cond:
+            self._counters["closed"] += 1
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
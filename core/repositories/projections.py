@@ -0,0 +1,159 @@
+"""
+Trigger-maintained projections on the SQL backends.
+
+``team_current_league`` holds the league of each team's latest season with
+standings; the adapters LEFT JOIN it instead of running a correlated subquery
+per row. The schema files in ``infra/*/init`` create it on a fresh volume,
+``provision(repo)`` brings an existing database up to date
+(``manage.py ensure_team_current_league``): table, refresh routine and
+triggers are (re)created and the projection is backfilled from standings.
+Every statement is safe to run again.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+TEAM_CURRENT_LEAGUE = {
+    "postgres": [
+        "CREATE INDEX IF NOT EXISTS idx_standings_team ON public.standings (team_id)",
+        """CREATE TABLE IF NOT EXISTS public.team_current_league (
+    team_id integer PRIMARY KEY REFERENCES public.teams (team_id) ON DELETE CASCADE,
+    league_id integer NOT NULL,
+    season_id integer NOT NULL,
+    year character varying(9) NOT NULL
+)""",
+        "CREATE INDEX IF NOT EXISTS idx_team_current_league_league ON public.team_current_league (league_id)",
+        """CREATE OR REPLACE FUNCTION public.refresh_team_current_league(p_team_id integer) RETURNS void AS $$
+BEGIN
+    INSERT INTO public.team_current_league (team_id, league_id, season_id, year)
+    SELECT st.team_id, sn.league_id, sn.season_id, sn.year
+    FROM public.standings st
+             JOIN public.seasons sn ON st.season_id = sn.season_id
+    WHERE st.team_id = p_team_id
+    ORDER BY sn.year DESC, sn.season_id DESC
+    LIMIT 1
+    ON CONFLICT (team_id) DO UPDATE
+        SET league_id = EXCLUDED.league_id, season_id = EXCLUDED.season_id, year = EXCLUDED.year;
+    IF NOT FOUND THEN
+        DELETE FROM public.team_current_league WHERE team_id = p_team_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql""",
+        """CREATE OR REPLACE FUNCTION public.standings_team_current_league() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM public.refresh_team_current_league(OLD.team_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.team_id <> OLD.team_id) THEN
+        PERFORM public.refresh_team_current_league(NEW.team_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS trg_standings_team_current_league ON public.standings",
+        """CREATE TRIGGER trg_standings_team_current_league
+    AFTER INSERT OR DELETE OR UPDATE OF team_id, season_id ON public.standings
+    FOR EACH ROW EXECUTE FUNCTION public.standings_team_current_league()""",
+        """CREATE OR REPLACE FUNCTION public.seasons_team_current_league() RETURNS trigger AS $$
+BEGIN
+    PERFORM public.refresh_team_current_league(st.team_id)
+    FROM public.standings st
+    WHERE st.season_id = NEW.season_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS trg_seasons_team_current_league ON public.seasons",
+        """CREATE TRIGGER trg_seasons_team_current_league
+    AFTER UPDATE OF year, league_id ON public.seasons
+    FOR EACH ROW EXECUTE FUNCTION public.seasons_team_current_league()""",
+        # backfill: także drużyny bez tabeli – refresh usuwa ich nieaktualne wiersze
+        "SELECT count(public.refresh_team_current_league(team_id)) FROM public.teams",
+    ],
+    # MySQL 8.0 nie ma CREATE OR REPLACE dla procedur i triggerów – DROP IF EXISTS + CREATE
+    "mysql": [
+        """CREATE TABLE IF NOT EXISTS team_current_league (
+    team_id INT NOT NULL PRIMARY KEY,
+    league_id INT NOT NULL,
+    season_id INT NOT NULL,
+    `year` VARCHAR(9) NOT NULL,
+    INDEX idx_team_current_league_league (league_id),
+    CONSTRAINT fk_tcl_team FOREIGN KEY (team_id) REFERENCES teams (team_id) ON DELETE CASCADE
+)""",
+        "DROP PROCEDURE IF EXISTS refresh_team_current_league",
+        """CREATE PROCEDURE refresh_team_current_league(IN p_team_id INT)
+BEGIN
+    INSERT INTO team_current_league (team_id, league_id, season_id, `year`)
+    SELECT ranked.team_id, ranked.league_id, ranked.season_id, ranked.`year`
+    FROM (SELECT st.team_id, sn.league_id, sn.season_id, sn.`year`,
+                 ROW_NUMBER() OVER (PARTITION BY st.team_id ORDER BY sn.`year` DESC, sn.season_id DESC) AS rn
+          FROM standings st
+                   JOIN seasons sn ON st.season_id = sn.season_id
+          WHERE p_team_id IS NULL OR st.team_id = p_team_id) ranked
+    WHERE ranked.rn = 1
+    ON DUPLICATE KEY UPDATE league_id = ranked.league_id, season_id = ranked.season_id, `year` = ranked.`year`;
+    DELETE FROM team_current_league
+    WHERE (p_team_id IS NULL OR team_id = p_team_id)
+      AND NOT EXISTS (SELECT 1 FROM standings st WHERE st.team_id = team_current_league.team_id);
+END""",
+        "DROP TRIGGER IF EXISTS trg_standings_tcl_insert",
+        """CREATE TRIGGER trg_standings_tcl_insert AFTER INSERT ON standings
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NEW.team_id);
+END""",
+        "DROP TRIGGER IF EXISTS trg_standings_tcl_update",
+        """CREATE TRIGGER trg_standings_tcl_update AFTER UPDATE ON standings
+FOR EACH ROW
+BEGIN
+    IF NEW.team_id <> OLD.team_id OR NEW.season_id <> OLD.season_id THEN
+        CALL refresh_team_current_league(OLD.team_id);
+        CALL refresh_team_current_league(NEW.team_id);
+    END IF;
+END""",
+        "DROP TRIGGER IF EXISTS trg_standings_tcl_delete",
+        """CREATE TRIGGER trg_standings_tcl_delete AFTER DELETE ON standings
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(OLD.team_id);
+END""",
+        "DROP TRIGGER IF EXISTS trg_seasons_tcl_update",
+        """CREATE TRIGGER trg_seasons_tcl_update AFTER UPDATE ON seasons
+FOR EACH ROW
+BEGIN
+    IF NEW.`year` <> OLD.`year` OR NEW.league_id <> OLD.league_id THEN
+        CALL refresh_team_current_league(NULL);
+    END IF;
+END""",
+        "DROP TRIGGER IF EXISTS trg_seasons_tcl_delete",
+        """CREATE TRIGGER trg_seasons_tcl_delete AFTER DELETE ON seasons
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NULL);
+END""",
+        "DROP TRIGGER IF EXISTS trg_leagues_tcl_delete",
+        """CREATE TRIGGER trg_leagues_tcl_delete AFTER DELETE ON leagues
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NULL);
+END""",
+        "CALL refresh_team_current_league(NULL)",
+    ],
+}
+
+
+def provision(repo: Any) -> list[str]:
+    """Create or update ``team_current_league`` for ``repo``'s SQL backend and backfill it; returns what ran."""
+    from .adapters.mysql import MysqlAdapter
+    from .adapters.postgres import PostgresAdapter
+
+    repo = getattr(repo, "inner", repo)
+    if isinstance(repo, PostgresAdapter):
+        statements = TEAM_CURRENT_LEAGUE["postgres"]
+    elif isinstance(repo, MysqlAdapter):
+        statements = TEAM_CURRENT_LEAGUE["mysql"]
+    else:
+        # mock i Mongo nie mają tej projekcji
+        return []
+    for statement in statements:
+        repo._execute(statement)
+    return list(statements)
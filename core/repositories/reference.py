@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from .base import LeagueRepo, Option
+from .signals import repo_changed
+
+logger = logging.getLogger(__name__)
+
+# lista opcji -> metoda LeagueRepo
+KINDS = {
+    "teams": "team_options",
+    "countries": "country_options",
+    "coaches": "coach_options",
+    "stadiums": "stadium_options",
+    "seasons": "season_options",
+}
+
+# encja zapisu -> listy opcji, które trzeba przeładować
+# (w Mongo trener i stadion są osadzone w drużynie; usunięcie ligi kasuje jej sezony;
+# kraje i sezony zmienia tylko import masowy)
+INVALIDATES = {
+    "teams": ("teams", "coaches", "stadiums"),
+    "leagues": ("seasons",),
+    "countries": ("countries",),
+    "seasons": ("seasons",),
+}
+
+
+class ReferenceCache:
+    """
+    In-memory ``(id, label)`` option lists for admin form dropdowns.
+
+    Each list is loaded once through ``repo.<entity>_options()`` and kept until a
+    write to a related entity arrives on ``repo_changed`` (including remote
+    events from the invalidation bus) or ``ttl`` passes. ``version`` grows on
+    every invalidation; a load that raced with a write is not stored.
+    """
+
+    def __init__(self, repo: LeagueRepo, ttl: float = 3600.0):
+        self.repo = repo
+        self.ttl = ttl
+        self.version = 0
+        self._lock = threading.Lock()
+        self._data: dict[str, tuple[tuple[Option, ...], float]] = {}
+        repo_changed.connect(self._on_change, sender=repo)
+
+    def get(self, kind: str) -> tuple[Option, ...]:
+        if kind not in KINDS:
+            raise ValueError(f"Nieznana lista opcji: {kind}")
+        now = time.monotonic()
+        with self._lock:
+            cached = self._data.get(kind)
+            if cached is not None and now - cached[1] < self.ttl:
+                return cached[0]
+            version = self.version
+        options = tuple(tuple(o) for o in getattr(self.repo, KINDS[kind])())
+        with self._lock:
+            if version == self.version:
+                self._data[kind] = (options, now)
+        return options
+
+    def warm(self, background: bool = True) -> None:
+        """Load every list up front (in a daemon thread by default)."""
+        if background:
+            threading.Thread(target=self.warm, args=(False,), name="reference-warmup", daemon=True).start()
+            return
+        try:
+            for kind in KINDS:
+                self.get(kind)
+        except Exception:
+            # backend niedostępny – listy załadują się przy pierwszym formularzu
+            logger.warning("reference cache: warmup failed", exc_info=True)
+
+    def invalidate(self, *kinds: str) -> None:
+        with self._lock:
+            self.version += 1
+            for kind in kinds or KINDS:
+                self._data.pop(kind, None)
+
+    def _on_change(self, sender: Any, entity: str, op: str, obj_id: Optional[str] = None, **kwargs) -> None:
+        kinds = INVALIDATES.get(entity)
+        if kinds:
+            self.invalidate(*kinds)
@@ -0,0 +1,254 @@
+"""
+Indexed multi-field search for ``list_*(q=...)`` and ``LeagueRepo.search``.
+
+Every entity is searched over its own text columns and the names of related
+rows (country, coach, stadium). Related names are matched through
+``fk IN (SELECT pk FROM <table> WHERE <name matches>)`` so each branch of
+the OR is an index scan instead of a filter over a join.
+
+- Postgres: substring ``ILIKE '%q%'`` served by pg_trgm GIN indexes,
+  ranked with ``similarity()``.
+- MySQL: FULLTEXT ``MATCH ... AGAINST`` in boolean mode with word-prefix
+  terms; queries with words shorter than ``innodb_ft_min_token_size`` fall
+  back to ``LIKE``.
+- Mongo: case-insensitive ``$regex`` on word prefixes (``re.escape``d), so
+  partial names match as on the other backends; related names go through
+  an ``$in`` of ids looked up by name. Ranked in the pipeline on the same
+  scale as the mock (``mongo_rank``). ``$text`` was dropped: it matches whole
+  tokens only and ORs the words.
+
+``INDEXES`` is the DDL the schema files create (including the ``matches``
+indexes behind ``list_matches`` filters); ``provision(repo)`` applies
+whatever is missing to an existing database (``manage.py ensure_search_indexes``).
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+from .filters import escape_like
+
+ENTITIES = ("leagues", "teams", "players")
+
+MYSQL_MIN_TOKEN = 3
+DEFAULT_LIMIT = 20
+
+
+@dataclass(frozen=True)
+class SearchSpec:
+    table: str              # "players p"
+    id_col: str
+    label_col: Optional[str]    # None = encja nie występuje w search()
+    own: tuple[str, ...]    # kolumny tekstowe encji (w MySQL = kolumny indeksu FULLTEXT)
+    related: tuple[tuple[str, str, str], ...]   # (fk, tabela, pk) – dopasowanie po name
+
+
+SPECS = {
+    "leagues": SearchSpec("leagues l", "l.league_id", "l.name", ("l.name",),
+                          (("l.country_id", "countries", "country_id"),)),
+    "teams": SearchSpec("teams t", "t.team_id", "t.name", ("t.name",),
+                        (("t.coach_id", "coaches", "coach_id"), ("t.stadium_id", "stadiums", "stadium_id"))),
+    "players": SearchSpec("players p", "p.player_id", "p.name", ("p.name", "p.position"),
+                          (("p.nationality_id", "countries", "country_id"),)),
+    # mecze tylko po nazwie gospodarza/gościa – filtr list_matches(q=...)
+    "matches": SearchSpec("matches m", "m.match_id", None, (),
+                          (("m.home_team_id", "teams", "team_id"), ("m.away_team_id", "teams", "team_id"))),
+}
+
+
+
+@dataclass(frozen=True)
+class MongoSpec:
+    own: tuple[str, ...]    # pola dokumentu (trener/stadion są osadzone w drużynie)
+    related: tuple[tuple[str, str], ...]    # (pole klucza, kolekcja) – dopasowanie po name
+
+
+MONGO_SPECS = {
+    "leagues": MongoSpec(("name",), (("countryId", "countries"),)),
+    "teams": MongoSpec(("name", "coach.name", "stadium.name"), ()),
+    "players": MongoSpec(("name", "position"), (("nationalityId", "countries"),)),
+}
+
+INDEXES = {
+    "postgres": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS idx_leagues_name_trgm ON leagues USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_teams_name_trgm ON teams USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON players USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_players_position_trgm ON players USING gin (\"position\" gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_countries_name_trgm ON countries USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_coaches_name_trgm ON coaches USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_stadiums_name_trgm ON stadiums USING gin (name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS idx_leagues_country ON leagues (country_id)",
+        "CREATE INDEX IF NOT EXISTS idx_teams_coach ON teams (coach_id)",
+        "CREATE INDEX IF NOT EXISTS idx_teams_stadium ON teams (stadium_id)",
+        "CREATE INDEX IF NOT EXISTS idx_players_nationality ON players (nationality_id)",
+        # list_matches: filtry sezon/kolejka, mecze drużyny w kolejności dat, stronicowanie po dacie
+        "CREATE INDEX IF NOT EXISTS idx_matches_season_matchday ON matches (season_id, matchday)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_home_date ON matches (home_team_id, utc_date)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_away_date ON matches (away_team_id, utc_date)",
+        "CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (utc_date DESC NULLS LAST, match_id DESC)",
+    ],
+    # MySQL 8.0 nie ma CREATE INDEX IF NOT EXISTS – provision() sprawdza information_schema
+    "mysql": [
+        ("leagues", "ft_leagues_name", "ALTER TABLE leagues ADD FULLTEXT INDEX ft_leagues_name (name)"),
+        ("teams", "ft_teams_name", "ALTER TABLE teams ADD FULLTEXT INDEX ft_teams_name (name)"),
+        ("players", "ft_players_name_position", "ALTER TABLE players ADD FULLTEXT INDEX ft_players_name_position (name, `position`)"),
+        ("countries", "ft_countries_name", "ALTER TABLE countries ADD FULLTEXT INDEX ft_countries_name (name)"),
+        ("coaches", "ft_coaches_name", "ALTER TABLE coaches ADD FULLTEXT INDEX ft_coaches_name (name)"),
+        ("stadiums", "ft_stadiums_name", "ALTER TABLE stadiums ADD FULLTEXT INDEX ft_stadiums_name (name)"),
+        # InnoDB dokleja match_id (PK) do każdego indeksu – keyset po (utc_date, match_id) jest pokryty
+        ("matches", "idx_matches_season_matchday", "CREATE INDEX idx_matches_season_matchday ON matches (season_id, matchday)"),
+        ("matches", "idx_matches_home_date", "CREATE INDEX idx_matches_home_date ON matches (home_team_id, utc_date)"),
+        ("matches", "idx_matches_away_date", "CREATE INDEX idx_matches_away_date ON matches (away_team_id, utc_date)"),
+        ("matches", "idx_matches_date", "CREATE INDEX idx_matches_date ON matches (utc_date)"),
+    ],
+}
+
+
+def like_pattern(q: str) -> str:
+    return f"%{escape_like(q.strip())}%"
+
+
+# ---- Postgres ----
+def pg_match(entity: str, q: str) -> tuple[str, list[Any]]:
+    spec = SPECS[entity]
+    like = like_pattern(q)
+    parts = [f"{col} ILIKE %s" for col in spec.own]
+    parts += [f"{fk} IN (SELECT {pk} FROM {table} WHERE name ILIKE %s)" for fk, table, pk in spec.related]
+    return "(" + " OR ".join(parts) + ")", [like] * len(parts)
+
+
+def pg_search(entities: tuple[str, ...], q: str, limit: int) -> tuple[str, list[Any]]:
+    selects, params = [], []
+    for entity in entities:
+        spec = SPECS[entity]
+        where, where_params = pg_match(entity, q)
+        selects.append(
+            f"SELECT '{entity}' AS entity, {spec.id_col}::text AS id, {spec.label_col} AS label, "
+            f"similarity({spec.label_col}, %s) AS rank FROM {spec.table} WHERE {where}"
+        )
+        params += [q.strip(), *where_params]
+    sql = " UNION ALL ".join(selects) + " ORDER BY rank DESC, label LIMIT %s"
+    return sql, params + [limit]
+
+
+# ---- MySQL ----
+def boolean_query(q: str) -> Optional[str]:
+    """``+word*`` terms for MATCH ... AGAINST, or None when FULLTEXT can't answer it."""
+    words = re.findall(r"\w+", q)
+    if not words or any(len(w) < MYSQL_MIN_TOKEN for w in words):
+        return None
+    return " ".join(f"+{w}*" for w in words)
+
+
+def mysql_match(entity: str, q: str) -> tuple[str, list[Any]]:
+    spec = SPECS[entity]
+    terms = boolean_query(q)
+    if terms is None:
+        like = like_pattern(q)
+        parts = [f"{col} LIKE %s" for col in spec.own]
+        parts += [f"{fk} IN (SELECT {pk} FROM {table} WHERE name LIKE %s)" for fk, table, pk in spec.related]
+        return "(" + " OR ".join(parts) + ")", [like] * len(parts)
+    parts = [f"MATCH({', '.join(spec.own)}) AGAINST (%s IN BOOLEAN MODE)"] if spec.own else []
+    parts += [f"{fk} IN (SELECT {pk} FROM {table} WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE))"
+              for fk, table, pk in spec.related]
+    return "(" + " OR ".join(parts) + ")", [terms] * len(parts)
+
+
+def mysql_search(entities: tuple[str, ...], q: str, limit: int) -> tuple[str, list[Any]]:
+    terms = boolean_query(q)
+    selects, params = [], []
+    for entity in entities:
+        spec = SPECS[entity]
+        where, where_params = mysql_match(entity, q)
+        if terms is None:
+            rank, rank_params = f"CASE WHEN {spec.label_col} LIKE %s THEN 1 ELSE 0.5 END", [escape_like(q.strip()) + "%"]
+        else:
+            rank, rank_params = f"MATCH({', '.join(spec.own)}) AGAINST (%s IN BOOLEAN MODE)", [terms]
+        selects.append(
+            f"SELECT '{entity}' AS entity, CAST({spec.id_col} AS CHAR) AS id, {spec.label_col} AS label, "
+            f"{rank} AS `rank` FROM {spec.table} WHERE {where}"
+        )
+        params += [*rank_params, *where_params]
+    sql = " UNION ALL ".join(selects) + " ORDER BY `rank` DESC, label LIMIT %s"
+    return sql, params + [limit]
+
+
+# ---- Mongo ----
+def mongo_pattern(q: str) -> dict[str, Any]:
+    """Case-insensitive prefix of any word: ``Leg`` finds "Legia Warszawa", ``Kow`` "Jan Kowalski"."""
+    return {"$regex": r"(?:^|[\s-])" + re.escape(q.strip()), "$options": "i"}
+
+
+def mongo_match(entity: str, q: str, related_ids: Optional[Mapping[str, list]] = None) -> dict[str, Any]:
+    """``$or`` over the entity's own fields and ``related_ids`` (key field -> ids whose name matched)."""
+    pattern = mongo_pattern(q)
+    branches: list[dict[str, Any]] = [{f: pattern} for f in MONGO_SPECS[entity].own]
+    branches += [{f: {"$in": ids}} for f, ids in (related_ids or {}).items() if ids]
+    return {"$or": branches}
+
+
+def mongo_rank(q: str) -> dict[str, Any]:
+    """Aggregation expression with ``rank_text``'s scale: exact name > prefix > word in name > other fields."""
+    text = re.escape(q.strip())
+
+    def on_name(regex: str) -> dict[str, Any]:
+        return {"$regexMatch": {"input": {"$ifNull": ["$name", ""]}, "regex": regex, "options": "i"}}
+
+    return {"$switch": {
+        "branches": [
+            {"case": on_name(f"^{text}$"), "then": 1.0},
+            {"case": on_name(f"^{text}"), "then": 0.8},
+            {"case": on_name(r"(?:^|[\s-])" + text), "then": 0.5},
+        ],
+        "default": 0.3,
+    }}
+
+
+# ---- mock ----
+def rank_text(q: str, *values: Any) -> float:
+    """Python ranking for the mock: exact > prefix > substring, first field weighs most."""
+    ql = q.strip().lower()
+    best = 0.0
+    for weight, value in zip((1.0, 0.6, 0.6, 0.6), values):
+        text = str(value or "").lower()
+        if not ql or ql not in text:
+            continue
+        score = 1.0 if text == ql else 0.8 if text.startswith(ql) else 0.5
+        best = max(best, score * weight)
+    return best
+
+
+def provision(repo: Any) -> list[str]:
+    """Create missing search indexes for ``repo``'s backend; returns what was done."""
+    from .adapters.mongo import MongoAdapter
+    from .adapters.mysql import MysqlAdapter
+    from .adapters.postgres import PostgresAdapter
+
+    repo = getattr(repo, "inner", repo)
+    done: list[str] = []
+    if isinstance(repo, PostgresAdapter):
+        for statement in INDEXES["postgres"]:
+            repo._execute(statement)
+            done.append(statement)
+    elif isinstance(repo, MysqlAdapter):
+        existing = {
+            (r["table_name"], r["index_name"])
+            for r in repo._fetchall(
+                "SELECT DISTINCT TABLE_NAME AS table_name, INDEX_NAME AS index_name "
+                "FROM information_schema.statistics WHERE TABLE_SCHEMA = DATABASE()"
+            )
+        }
+        for table, name, statement in INDEXES["mysql"]:
+            if (table, name) not in existing:
+                repo._execute(statement)
+                done.append(statement)
+    elif isinstance(repo, MongoAdapter):
+        # indeksy name zakłada infra/mongo; dawne indeksy $text nic już nie obsługują, a spowalniają zapisy
+        for collection in MONGO_SPECS:
+            if f"text_{collection}" in repo.db[collection].index_information():
+                repo.db[collection].drop_index(f"text_{collection}")
+                done.append(f"{collection}.dropIndex(text_{collection})")
+    return done
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from django.dispatch import Signal
+
+# Wysyłany przez adaptery po każdym udanym zapisie.
+# kwargs: entity ("leagues"|"teams"|"players"|"matches"), op ("create"|"update"|"delete"), obj_id
+repo_changed = Signal()
+
+
+def notify(sender: Any, entity: str, op: str, obj_id: Optional[Any] = None) -> None:
+    repo_changed.send(sender=sender, entity=entity, op=op, obj_id=None if obj_id is None else str(obj_id))
@@ -0,0 +1,219 @@
+"""
+Slow-query log with execution plans.
+
+The SQL adapters time every statement (``timed``), the Mongo adapter every
+find/aggregate/count/distinct command (``MongoSlowCommands``, a pymongo
+command listener). Anything slower than ``SLOW_QUERY_LOG["threshold_ms"]``
+is written as one JSON line to a rotating file: backend, duration, the
+normalized query (literals and parameters replaced by ``?``) and its plan –
+Postgres ``EXPLAIN (ANALYZE, BUFFERS)``, MySQL ``EXPLAIN ANALYZE``, Mongo
+``explain`` with ``executionStats``.
+
+ANALYZE runs the query once more, so only reads are explained, at most
+once per normalized query per ``explain_interval`` seconds, and on a
+single background thread: a slow page does not get twice as slow.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Iterator, Mapping, Optional
+
+from django.conf import settings
+from pymongo import monitoring
+
+from . import instrument
+
+DEFAULTS = {
+    "threshold_ms": 200.0,
+    "explain": True,
+    "explain_interval": 60.0,
+    "path": None,
+    "max_bytes": 5 * 1024 * 1024,
+    "backups": 3,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_READ = re.compile(r"^\s*(\(\s*)*(SELECT|WITH)\b", re.IGNORECASE)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_explained: dict[tuple[str, str], float] = {}
+_handler: RotatingFileHandler | None = None
+
+
+def config() -> dict[str, Any]:
+    return {**DEFAULTS, **(getattr(settings, "SLOW_QUERY_LOG", None) or {})}
+
+
+def normalize_sql(query: str) -> str:
+    """``WHERE id IN (1, 2) AND name = 'x' AND t = %s`` -> ``WHERE id IN (?) AND name = ? AND t = ?``."""
+    text = _PARAM.sub("?", _NUMBER.sub("?", _STRING.sub("?", query)))
+    return _SPACE.sub(" ", _IN_LIST.sub("(?)", text)).strip()
+
+
+def _mask(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {k: _mask(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if all(not isinstance(v, (Mapping, list, tuple)) for v in value):
+            return ["?"] if value else []
+        return [_mask(v) for v in value]
+    return "?"
+
+
+def normalize_mongo(command: Mapping[str, Any]) -> str:
+    """Command shape: literals in filters and ``$match`` stages replaced, structure (lookups, sorts) kept."""
+    name = next(iter(command))
+    shape: dict[str, Any] = {name: command[name]}
+    for key in ("filter", "query"):
+        if key in command:
+            shape[key] = _mask(command[key])
+    if "pipeline" in command:
+        shape["pipeline"] = [
+            {op: (_mask(arg) if op == "$match" else arg) for op, arg in stage.items()} for stage in command["pipeline"]
+        ]
+    for key in ("sort", "projection", "key"):
+        if key in command:
+            shape[key] = command[key]
+    return json.dumps(shape, default=str, ensure_ascii=False)
+
+
+def _log() -> logging.Logger:
+    """Logger writing to the rotating file (handler created on first slow query)."""
+    global _handler
+    log = logging.getLogger(__name__ + ".entries")
+    conf = config()
+    with _lock:
+        if conf["path"] and _handler is None:
+            _handler = RotatingFileHandler(conf["path"], maxBytes=conf["max_bytes"], backupCount=conf["backups"],
+                                           encoding="utf-8", delay=True)
+            log.addHandler(_handler)
+            log.setLevel(logging.INFO)
+            log.propagate = False
+    return log
+
+
+def _worker() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slowlog")
+        return _executor
+
+
+def _should_explain(backend: str, normalized: str, interval: float) -> bool:
+    now = time.monotonic()
+    with _lock:
+        last = _explained.get((backend, normalized))
+        if last is not None and now - last < interval:
+            return False
+        _explained[(backend, normalized)] = now
+        return True
+
+
+def _write(backend: str, normalized: str, ms: float, explain: Optional[Callable[[], Any]]) -> None:
+    conf = config()
+    entry: dict[str, Any] = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "backend": backend,
+        "ms": round(ms, 2),
+        "query": normalized,
+    }
+    if explain is not None and conf["explain"] and _should_explain(backend, normalized, conf["explain_interval"]):
+        try:
+            entry["plan"] = explain()
+        except Exception as e:
+            entry["plan_error"] = f"{type(e).__name__}: {e}"
+    _log().info(json.dumps(entry, default=str, ensure_ascii=False))
+
+
+def report(backend: str, normalized: str, ms: float, explain: Optional[Callable[[], Any]] = None) -> None:
+    """Queues a slow query for the log (plan capture happens on the background thread)."""
+    try:
+        _worker().submit(_write, backend, normalized, ms, explain)
+    except RuntimeError:
+        pass    # interpreter zamykany – executor już nie przyjmuje zadań
+
+
+def flush() -> None:
+    """Waits until every queued entry is written."""
+    _worker().submit(lambda: None).result()
+
+
+def is_read(query: str) -> bool:
+    return bool(_READ.match(query))
+
+
+@contextmanager
+def timed(backend: str, query: str, explain: Optional[Callable[[], Any]] = None) -> Iterator[None]:
+    """
+    Times the block; over the threshold the statement is logged. ``explain``
+    (returns the plan) is called only for reads – ANALYZE executes the statement.
+    """
+    instrument.round_trip()
+    threshold = config()["threshold_ms"]
+    start = time.perf_counter()
+    yield
+    ms = (time.perf_counter() - start) * 1000
+    if threshold is not None and ms >= threshold:
+        report(backend, normalize_sql(query), ms, explain if is_read(query) else None)
+
+
+MONGO_COMMANDS = frozenset({"find", "aggregate", "count", "distinct"})
+# pola sterujące sesją/protokołem – nie wchodzą do explain
+_MONGO_META = frozenset({"lsid", "txnNumber", "autocommit", "startTransaction", "readConcern", "writeConcern"})
+
+
+class MongoSlowCommands(monitoring.CommandListener):
+    """pymongo command listener: slow reads go to the slow-query log with ``explain(executionStats)``."""
+
+    def __init__(self):
+        self.client = None    # ustawiany przez MongoAdapter po utworzeniu MongoClient
+        self._started: dict[tuple, tuple[str, dict]] = {}
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event) -> None:
+        instrument.round_trip()
+        if event.command_name in MONGO_COMMANDS:
+            command = {k: v for k, v in event.command.items() if not k.startswith("$") and k not in _MONGO_META}
+            self._started[self._key(event)] = (event.database_name, command)
+
+    def succeeded(self, event) -> None:
+        started = self._started.pop(self._key(event), None)
+        threshold = config()["threshold_ms"]
+        ms = event.duration_micros / 1000
+        if started is None or threshold is None or ms < threshold:
+            return
+        db_name, command = started
+        report("mongo", normalize_mongo(command), ms, lambda: self._explain(db_name, command))
+
+    def failed(self, event) -> None:
+        self._started.pop(self._key(event), None)
+
+    def _explain(self, db_name: str, command: dict) -> Any:
+        if self.client is None:
+            return None
+        plan = self.client[db_name].command({"explain": command, "verbosity": "executionStats"})
+        stats = plan.get("executionStats", {})
+        # pełny plan bywa ogromny – zostaje to, co mówi o skanach
+        return {
+            "queryPlanner": plan.get("queryPlanner", {}).get("winningPlan") or plan.get("stages"),
+            "executionStats": {k: stats.get(k) for k in (
+                "nReturned", "executionTimeMillis", "totalKeysExamined", "totalDocsExamined",
+            )} if stats else None,
+        }
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Callable, Optional, Sequence
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .signals import repo_changed
+
+# zasób API -> encje, z których składa się odpowiedź (nazwy drużyn w meczach, kraj ligi itd.)
+READS = {
+    "leagues": ("leagues", "countries"),
+    "teams": ("teams", "leagues"),
+    "players": ("players", "teams", "countries"),
+    "matches": ("matches", "teams", "seasons", "leagues"),
+}
+
+
+class DataVersions:
+    """
+    Per-entity data versions for HTTP validators.
+
+    Every ``repo_changed`` event of ``repo`` replaces the entity's version,
+    so an ETag built from the versions an API response ``READS`` changes
+    whenever the data behind it may have changed – and can be checked
+    without a query.
+
+    Versions live in a Django cache (``API_ETAG_CACHE``) shared by all
+    workers: a client gets its 304 whichever worker answers, and a write on
+    one worker changes the tag on all of them. A version is a random token,
+    not a counter, so concurrent writers never leave it at a value a client
+    has already seen, and a flushed cache cannot bring an old tag back. With
+    a per-process cache (``LocMemCache``) remote events from the invalidation
+    bus bump the local copy instead. Writes nobody announced (SQL console,
+    another app) are bounded by ``ttl``: tags also roll over every ``ttl``
+    seconds.
+    """
+
+    def __init__(self, repo: Any, ttl: float = 300.0, clock: Callable[[], float] = time.time,
+                 cache: Optional[BaseCache] = None):
+        self.repo = repo
+        self.ttl = ttl
+        self.clock = clock
+        self.cache = cache if cache is not None else caches[getattr(settings, "API_ETAG_CACHE", "default")]
+        # wspólny cache: zapisujący worker już podmienił wersję, zdarzenie z szyny nic nie wnosi
+        self.shared = not isinstance(self.cache, LocMemCache)
+        self.prefix = f"data-version:{type(repo).__name__}:"
+        repo_changed.connect(self._on_change, sender=repo)
+
+    def version(self, entity: str) -> str:
+        return self.versions([entity])[0]
+
+    def versions(self, entities: Sequence[str]) -> list[str]:
+        keys = [self.prefix + e for e in entities]
+        found = self.cache.get_many(keys)
+        for key in keys:
+            if key not in found:
+                # add() nie nadpisze wersji, którą w międzyczasie założył inny worker
+                self.cache.add(key, uuid.uuid4().hex, timeout=None)
+                found[key] = self.cache.get(key)
+        return [found[key] for key in keys]
+
+    def bump(self, entity: str) -> None:
+        self.cache.set(self.prefix + entity, uuid.uuid4().hex, timeout=None)
+
+    def etag(self, resource: str, *parts: Any) -> str:
+        """Strong ETag (quoted) for ``resource`` + request-specific ``parts`` (path, query)."""
+        window = int(self.clock() // self.ttl) if self.ttl else 0
+        versions = self.versions(READS.get(resource, (resource,)))
+        raw = json.dumps([window, resource, versions, parts], default=str)
+        return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()[:24]
+
+    def _on_change(self, sender: Any, entity: str, op: str, obj_id: Optional[str] = None,
+                   remote: bool = False, **kwargs) -> None:
+        if remote and self.shared:
+            return
+        self.bump(entity)
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.postgres import PostgresAdapter
+from core.repositories.aio import ThreadedAsyncRepo
+
+
+class BarrierRepo:
+    """Każde wywołanie czeka na drugie – przejdą tylko, jeśli biegną równolegle."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2, timeout=2)
+
+    def count_teams(self):
+        self.barrier.wait()
+        return 1
+
+    def count_players(self):
+        self.barrier.wait()
+        return 2
+
+
+class ThreadedAsyncRepoTests(SimpleTestCase):
+    def test_gathered_calls_run_concurrently(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        repo = ThreadedAsyncRepo(BarrierRepo(), executor)
+
+        async def both():
+            return await asyncio.gather(repo.count_teams(), repo.count_players())
+
+        self.assertEqual(asyncio.run(both()), [1, 2])
+
+    def test_non_callable_attributes_pass_through(self):
+        inner = BarrierRepo()
+        self.assertIs(ThreadedAsyncRepo(inner, None).barrier, inner.barrier)
+
+
+@override_settings(DATA_BACKEND="mock", SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+class AsyncViewTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_async_repo_follows_the_repo_singleton(self):
+        first = repo_factory.get_async_repo()
+        self.assertIs(first.repo, repo_factory.get_repo())
+        repo_factory._repo_singleton = None
+        self.assertIsNot(repo_factory.get_async_repo(), first)
+
+    def test_detail_views(self):
+        self.assertContains(self.client.get("/"), "Ligi")
+        self.assertContains(self.client.get("/teams/507f1f77bcf86cd799439101/"), "Legia Warszawa")
+        self.assertEqual(self.client.get("/teams/999/").status_code, 404)
+
+    def test_league_detail_with_non_numeric_id_is_404_on_sql_backend(self):
+        pg = PostgresAdapter(dsn="postgresql://example")
+        pg._fetchall = Mock(side_effect=AssertionError("bez zapytań dla nienumerycznego id"))
+        repo_factory._repo_singleton = pg
+        self.assertEqual(self.client.get("/leagues/abc/").status_code, 404)
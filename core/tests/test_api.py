@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.signals import notify, repo_changed
+from core.repositories.versions import DataVersions
+
+
+class DataVersionsTests(SimpleTestCase):
+    def test_etag_changes_with_entities_the_resource_reads(self):
+        repo = MockAdapter()
+        versions = DataVersions(repo)
+        tag = versions.etag("matches", "/api/matches/")
+        self.assertEqual(versions.etag("matches", "/api/matches/"), tag)
+        notify(repo, "players", "update", "1")
+        self.assertEqual(versions.etag("matches", "/api/matches/"), tag)
+        notify(repo, "teams", "update", "1")
+        self.assertNotEqual(versions.etag("matches", "/api/matches/"), tag)
+
+    def test_etag_rolls_over_after_ttl(self):
+        now = [1000.0]
+        versions = DataVersions(MockAdapter(), ttl=60, clock=lambda: now[0])
+        tag = versions.etag("leagues")
+        now[0] += 60
+        self.assertNotEqual(versions.etag("leagues"), tag)
+
+    def test_workers_share_versions_through_the_cache(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, True)
+        cache = FileBasedCache(location, {"TIMEOUT": None})
+        first, second = MockAdapter(), MockAdapter()
+        a, b = DataVersions(first, cache=cache), DataVersions(second, cache=cache)
+        tag = a.etag("teams", "/api/teams/")
+        self.assertEqual(b.etag("teams", "/api/teams/"), tag)
+
+        # zdarzenie z szyny o zapisie, który worker "first" już zapisał w cache – bez ponownej zmiany
+        repo_changed.send(sender=second, entity="teams", op="update", obj_id="1", remote=True)
+        self.assertEqual(b.etag("teams", "/api/teams/"), tag)
+
+        notify(first, "teams", "update", "1")
+        self.assertNotEqual(b.etag("teams", "/api/teams/"), tag)
+        self.assertEqual(b.etag("teams", "/api/teams/"), a.etag("teams", "/api/teams/"))
+
+
+@override_settings(DATA_BACKEND="mock")
+class ApiTests(SimpleTestCase):
+    T1 = "507f1f77bcf86cd799439101"
+
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_list_detail_batch(self):
+        r = self.client.get("/api/players/", {"limit": 1})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(r.json()["items"]), 1)
+        self.assertTrue(r.json()["next_cursor"])
+        self.assertEqual(self.client.get(f"/api/teams/{self.T1}/").json()["name"], "Legia Warszawa")
+        items = self.client.get("/api/teams/batch/", {"ids": f"{self.T1},nie-ma"}).json()["items"]
+        self.assertEqual((items[self.T1]["name"], items["nie-ma"]), ("Legia Warszawa", None))
+        self.assertEqual(self.client.get("/api/teams/nie-ma/").status_code, 404)
+        self.assertEqual(self.client.get("/api/users/").status_code, 404)
+        self.assertEqual(self.client.get("/api/teams/", {"password": "x"}).status_code, 400)
+
+    def test_if_none_match_is_304_without_repo_call_until_a_write(self):
+        r = self.client.get("/api/teams/")
+        etag = r["ETag"]
+        self.assertTrue(etag.startswith('"'))
+
+        with patch.object(MockAdapter, "list_teams") as list_teams:
+            r = self.client.get("/api/teams/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r["ETag"], etag)
+        list_teams.assert_not_called()
+
+        notify(repo_factory.get_repo(), "teams", "update", self.T1)
+        r = self.client.get("/api/teams/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r["ETag"], etag)
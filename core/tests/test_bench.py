@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase
+
+from benchmarks.harness import Config, Driver, Sample, percentile, run, summarize, write_json
+
+
+class CountingDriver(Driver):
+    name = "fake"
+    scenarios = ("a", "b")
+
+    def __init__(self):
+        self.calls = 0
+
+    def round(self, n):
+        def op():
+            self.calls += 1
+        return (("op", op), ("other", lambda: None))
+
+
+class HarnessTests(SimpleTestCase):
+    def test_percentile_interpolates(self):
+        data = list(range(1, 101))
+        self.assertEqual(percentile(data, 50), 50.5)
+        self.assertAlmostEqual(percentile(data, 99), 99.01)
+        self.assertEqual(percentile([7.0], 95), 7.0)
+
+    def test_warmup_is_run_but_not_recorded(self):
+        driver = CountingDriver()
+        samples = run(driver, Config(sizes=[1, 2], repeats=3, warmup=2, scenarios=["b"], ops=["op"]))
+        self.assertEqual(driver.calls, 2 * (3 + 2))
+        self.assertEqual({(s.scenario, s.op) for s in samples}, {("b", "op")})
+        self.assertEqual(sorted({s.repeat for s in samples}), [1, 2, 3])
+
+    def test_probes_add_columns_and_profile_dump(self):
+        out_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, out_dir, True)
+        config = Config(sizes=[1], repeats=2, warmup=1, scenarios=["a"], cpu=True, rss=True, tracemalloc=True,
+                        profile_dir=out_dir)
+        [row, _] = summarize(run(CountingDriver(), config))
+        self.assertEqual(set(row.extra), {"cpu_ms", "rss_peak_mb", "alloc_peak_kb", "alloc_retained_kb"})
+        self.assertGreater(row.extra["rss_peak_mb"], 0)
+        self.assertTrue(os.path.exists(os.path.join(out_dir, "fake-a.prof")))
+
+    def test_summary_stats_and_json(self):
+        samples = [Sample("pg", "s", 10, i, "get", ms) for i, ms in enumerate([1.0, 2.0, 3.0, 4.0, 100.0], 1)]
+        [row] = summarize(samples)
+        self.assertEqual((row.avg_ms, row.p50_ms, row.max_ms, row.samples), (22.0, 3.0, 100.0, 5))
+        self.assertGreater(row.ci95_ms, row.stdev_ms)    # t(4) = 2.776 > sqrt(5)
+        out = io.StringIO()
+        write_json([row], out, meta={"repeats": 5})
+        self.assertEqual(json.loads(out.getvalue())["results"][0]["p95_ms"], 80.8)
+
+
+class RepoBenchmarkTests(SimpleTestCase):
+    def test_mock_backend_runs_every_op_and_reports_round_trips(self):
+        from benchmarks.repo import RepoDriver
+
+        rows = summarize(run(RepoDriver("mock"), Config(sizes=[3], repeats=1, warmup=0)))
+        ops = {r.op for r in rows}
+        self.assertTrue({"list_matches_q", "get_teams_many", "search", "season_options", "delete_league"} <= ops)
+        self.assertTrue(all(r.extra["calls"] == 1 and r.extra["round_trips"] == 0 for r in rows))
+
+
+class LoadBenchmarkTests(SimpleTestCase):
+    def test_saturation_is_first_count_without_throughput_gain(self):
+        from benchmarks.load import LoadResult, mark_saturation
+
+        nan = float("nan")
+        series = [LoadResult("t", "read", "thread", c, 0, 0, rps, nan, nan, nan, nan, nan)
+                  for c, rps in ((1, 100.0), (4, 350.0), (16, 370.0), (64, 300.0))]
+        point = mark_saturation(series, gain=0.1)
+        self.assertEqual(point.clients, 16)
+        self.assertEqual([r.saturated for r in series], [False, False, True, True])
+
+    def test_thread_sweep_counts_requests_and_errors(self):
+        from contextlib import contextmanager
+
+        from benchmarks.load import LoadConfig, Workload, sweep
+
+        class Flaky(Workload):
+            name = "fake"
+            scenarios = ("read",)
+
+            @contextmanager
+            def client(self, scenario, index):
+                calls = iter(range(10 ** 9))
+
+                def request():
+                    if next(calls) % 2:
+                        raise ConnectionError
+                yield request
+
+        rows = sweep(Flaky(), LoadConfig(clients=[1, 2], duration=0.05, warmup=0.01))
+        self.assertEqual([r.clients for r in rows], [1, 2])
+        self.assertTrue(all(r.requests > 0 and r.errors > 0 and r.top_error == "ConnectionError" for r in rows))
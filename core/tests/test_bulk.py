@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import bulk, mock_repo
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.mock import MockAdapter
+
+
+class KeyMapTests(SimpleTestCase):
+    def test_single_and_composite_keys(self):
+        self.assertEqual(bulk.key_map([{"name": "Polska", "country_id": 1}]), {"Polska": 1})
+        self.assertEqual(bulk.key_map([(3, "2024-2025", 7)]), {(3, "2024-2025"): 7})
+
+    def test_entity_from_file_name(self):
+        self.assertEqual(bulk.entity_of("/tmp/matches-2024.ndjson"), "matches")
+        with self.assertRaises(ValueError):
+            bulk.entity_of("/tmp/wyniki.csv")
+
+    def test_invalid_standings_form_is_rejected(self):
+        keys = {"leagues": {"L": 1}, "seasons": {(1, "2024/2025"): 5}, "teams": {"T": 9}}
+        row = {"league": "L", "season": "2024/2025", "team": "T", **{c: 1 for c in bulk.TABLES["standings"][1][2:]}}
+        self.assertEqual(bulk.RESOLVERS["standings"]({**row, "form": "wdl"}, keys)["form"], ["W", "D", "L"])
+        with self.assertRaises(bulk.RowError):
+            bulk.RESOLVERS["standings"]({**row, "form": "WX"}, keys)
+
+
+class ConcurrencyAdapter:
+    KEYS = {"leagues": {"Liga": 1}, "seasons": {(1, "2024-2025"): 10}, "teams": {"A": 5, "B": 6}}
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def natural_keys(self, kind):
+        return self.KEYS.get(kind, {})
+
+    def bulk_insert(self, entity, rows):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return len(rows)
+
+
+class ImporterTests(SimpleTestCase):
+    def test_standings_chunks_run_one_at_a_time(self):
+        adapter = ConcurrencyAdapter()
+        stats = dict.fromkeys(bulk.TABLES["standings"][1][2:], 0)
+        rows = [{"league": "Liga", "season": "2024-2025", "team": team, **stats} for team in "ABAB"]
+
+        result = bulk.Importer(adapter, chunk_size=1, workers=4).load("standings", rows)
+
+        self.assertEqual((result.inserted, result.failed_chunks), (4, 0))
+        self.assertEqual(adapter.peak, 1)
+
+
+@override_settings(DATA_BACKEND="mock")
+class ImportCommandTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+        # mock_repo to stan modułu – przywracamy listy po teście
+        for name in ("TEAMS", "PLAYERS", "MATCHES"):
+            items = getattr(mock_repo, name)
+            self.addCleanup(items.__setitem__, slice(None), [dict(x) for x in items])
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+
+    def write(self, name, content):
+        with open(os.path.join(self.dir, name), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_imports_in_dependency_order_with_natural_keys(self):
+        self.write("players.ndjson",
+                   '{"name": "Nowy Zawodnik", "position": "GK", "team": "Nowa Drużyna", "nationality": "Polska"}\n'
+                   '{"name": "Bez Drużyny", "team": "Nie Ma Takiej"}\n')
+        self.write("teams.csv", "name,founded_year,coach,stadium\nNowa Drużyna,1999,Trener C,Stadion C\n")
+        self.write("matches.csv",
+                   "league,season,matchday,utc_date,home_team,away_team\n"
+                   "Premier League,2024-2025,1,2025-08-16,Nowa Drużyna,Legia Warszawa\n"
+                   "Premier League,2024-2025,2,2025-08-23,Legia Warszawa,Nowa Drużyna\n")
+        self.write("scores.csv",
+                   "league,season,home_team,away_team,full_time_home,full_time_away\n"
+                   "Premier League,2024-2025,Nowa Drużyna,Legia Warszawa,3,1\n")
+        out, err = StringIO(), StringIO()
+
+        call_command("import_league_data", self.dir, "--chunk-size", "1", "--workers", "3", stdout=out, stderr=err)
+
+        repo = MockAdapter()
+        team = repo.list_teams(filters={"name__prefix": "Nowa"})[0]
+        self.assertEqual([p["name"] for p in repo.team_players(team["id"])], ["Nowy Zawodnik"])
+        self.assertEqual(len(repo.list_matches(q="Nowa")), 2)
+        scored = [m for m in mock_repo.MATCHES if m["score"]["full_time"]["home"] == 3]
+        self.assertEqual(len(scored), 1)
+        self.assertIn("players: 1/2 zapisanych, odrzuconych wierszy 1", out.getvalue())
+        self.assertIn("nie znaleziono teams: 'Nie Ma Takiej'", err.getvalue())
+        self.assertIn("Import zakończony z błędami", out.getvalue())
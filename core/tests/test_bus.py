@@ -0,0 +1,69 @@
+import shutil
+import tempfile
+import threading
+
+from django.test import SimpleTestCase
+
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.bus import InvalidationBus, UnixSocketTransport
+from core.repositories.cache import CachingRepo
+from core.repositories.signals import notify, repo_changed
+
+
+class InvalidationBusTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+
+    def make_worker(self):
+        """Adapter + bus jak w osobnym workerze (każdy ma własne gniazdo)."""
+        adapter = MockAdapter()
+        bus = InvalidationBus(UnixSocketTransport(self.dir), adapter)
+        bus.start()
+        self.addCleanup(bus.stop)
+        return adapter, bus
+
+    def wait_for_remote(self, adapter):
+        got = threading.Event()
+
+        def receiver(sender, remote=False, **kwargs):
+            if remote:
+                got.set()
+
+        repo_changed.connect(receiver, sender=adapter, weak=False)
+        self.addCleanup(repo_changed.disconnect, receiver, sender=adapter)
+        return got
+
+    def test_write_in_one_worker_evicts_cache_in_another(self):
+        writer, _ = self.make_worker()
+        reader, reader_bus = self.make_worker()
+        cached = CachingRepo(reader)
+        team = cached.list_teams()[0]
+        cached.get_team(team["id"])
+        got = self.wait_for_remote(reader)
+
+        notify(writer, "teams", "update", team["id"])
+
+        self.assertTrue(got.wait(5))
+        self.assertEqual(cached.cache_stats()["size"], 0)
+        self.assertEqual(reader_bus.stats["received"], 1)
+
+    def test_remote_events_are_not_republished(self):
+        a, bus_a = self.make_worker()
+        b, bus_b = self.make_worker()
+        got = self.wait_for_remote(b)
+        notify(a, "players", "create", "1")
+        self.assertTrue(got.wait(5))
+        self.assertEqual(bus_a.stats["published"], 1)
+        self.assertEqual(bus_b.stats["published"], 0)
+
+    def test_remote_create_makes_counter_reload(self):
+        adapter = MockAdapter()
+        bus = InvalidationBus(UnixSocketTransport(self.dir), adapter)
+        self.addCleanup(bus.transport.close)
+        adapter.counters.get("teams", lambda: 5)
+        bus._deliver('{"origin": "inny", "entity": "teams", "op": "create", "id": "9"}')
+        bus._deliver('{"origin": "%s", "entity": "teams", "op": "create", "id": "9"}' % bus.origin)
+        bus._deliver("śmieci")
+        self.assertEqual(adapter.counters.get("teams", lambda: 6), 6)
+        self.assertEqual((bus.stats["received"], bus.stats["ignored"]), (1, 2))
@@ -0,0 +1,95 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.cache import CachingRepo, LRUCache, _MISSING
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_lru_eviction_and_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=2, clock=clock)
+        cache.set("a", 1, ttl=10)
+        cache.set("b", 2, ttl=10)
+        cache.get("a")              # "a" świeżo użyte -> wypada "b"
+        cache.set("c", 3, ttl=10)
+        self.assertIs(cache.get("b"), _MISSING)
+        self.assertEqual(cache.get("a"), 1)
+
+        clock.now = 11
+        self.assertIs(cache.get("a"), _MISSING)
+        stats = cache.stats()
+        self.assertEqual((stats["evictions"], stats["expired"], stats["hits"]), (1, 1, 2))
+
+    def test_tags_and_stale_generation(self):
+        cache = LRUCache()
+        cache.set("x", 1, ttl=10, tags=["teams"])
+        cache.set("y", 2, ttl=10, tags=["players"])
+        generation = cache.generation
+        self.assertEqual(cache.invalidate("teams"), 1)
+        self.assertIs(cache.get("x"), _MISSING)
+        self.assertEqual(cache.get("y"), 2)
+        # wartość policzona przed zapisem nie może trafić do cache
+        self.assertFalse(cache.set("x", 1, ttl=10, generation=generation))
+
+
+class CountingMock(MockAdapter):
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def list_teams(self, **kwargs):
+        self.calls.append("list_teams")
+        return super().list_teams(**kwargs)
+
+    def get_teams_many(self, ids):
+        self.calls.append(("get_teams_many", tuple(ids)))
+        return super().get_teams_many(ids)
+
+
+class CachingRepoTests(SimpleTestCase):
+    def test_reads_are_cached_and_writes_evict(self):
+        inner = CountingMock()
+        repo = CachingRepo(inner)
+        team = repo.list_teams()[0]
+        repo.list_teams()
+        repo.get_team(team["id"])
+        repo.get_teams_many([team["id"]])
+        self.assertEqual(inner.calls, ["list_teams", ("get_teams_many", (team["id"],))])
+
+        original = team["name"]
+        repo.update_team(team["id"], {"name": "Zmieniona"})
+        try:
+            self.assertEqual(repo.get_team(team["id"])["name"], "Zmieniona")
+            self.assertIn("Zmieniona", [t["name"] for t in repo.list_teams()])
+        finally:
+            repo.update_team(team["id"], {"name": original})
+        self.assertEqual(repo.cache_stats()["hits"], 2)
+
+    def test_other_entities_stay_cached(self):
+        inner = CountingMock()
+        repo = CachingRepo(inner)
+        repo.list_teams()
+        created = repo.create_player({"name": "Test Cache"})
+        repo.delete_player(created["id"])
+        repo.list_teams()
+        self.assertEqual(inner.calls, ["list_teams"])
+
+    @override_settings(DATA_BACKEND="mock", REPO_CACHE={"enabled": True, "max_entries": 10})
+    def test_factory_wraps_adapter_when_enabled(self):
+        repo_factory._repo_singleton = None
+        try:
+            repo = repo_factory.get_repo()
+            self.assertIsInstance(repo, CachingRepo)
+            self.assertIsInstance(repo.inner, MockAdapter)
+            self.assertEqual(repo.cache_stats()["max_entries"], 10)
+        finally:
+            repo_factory._repo_singleton = None
@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase
+
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.counters import CounterStore
+from core.repositories.signals import notify
+
+
+class CounterStoreTests(SimpleTestCase):
+    def test_count_is_loaded_once_and_follows_create_delete(self):
+        owner = object()
+        store = CounterStore(owner)
+        loads = []
+
+        def load():
+            loads.append(1)
+            return 10
+
+        self.assertEqual(store.get("teams", load), 10)
+        notify(owner, "teams", "create", "1")
+        notify(owner, "teams", "create", "2")
+        notify(owner, "teams", "delete", "1")
+        notify(owner, "teams", "update", "2")
+        self.assertEqual(store.get("teams", load), 11)
+        self.assertEqual(len(loads), 1)
+
+    def test_other_senders_are_ignored_and_cascades_invalidate(self):
+        owner = object()
+        store = CounterStore(owner)
+        store.get("matches", lambda: 5)
+
+        notify(object(), "matches", "create", "1")
+        self.assertEqual(store.get("matches", lambda: 0), 5)
+
+        # usunięcie ligi kasuje kaskadowo mecze -> licznik przeliczany od nowa
+        notify(owner, "leagues", "delete", "1")
+        self.assertEqual(store.get("matches", lambda: 3), 3)
+
+    def test_write_during_load_is_not_lost(self):
+        owner = object()
+        store = CounterStore(owner)
+
+        def load():
+            # zapis po policzeniu wierszy, przed zapamiętaniem wyniku
+            notify(owner, "teams", "create", "9")
+            return 10
+
+        self.assertEqual(store.get("teams", load), 10)
+        self.assertEqual(store.get("teams", lambda: 11), 11)
+        self.assertEqual(store.get("teams", lambda: 0), 11)
+
+    def test_mock_adapter_counts_track_writes(self):
+        repo = MockAdapter()
+        before = repo.count_players()
+        created = repo.create_player({"name": "Test Licznik"})
+        try:
+            self.assertEqual(repo.count_players(), before + 1)
+        finally:
+            repo.delete_player(created["id"])
+        self.assertEqual(repo.count_players(), before)
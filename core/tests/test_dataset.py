@@ -0,0 +1,63 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import mock_repo
+from core.repositories import factory as repo_factory
+from core.repositories.dataset import Dataset, Scale, round_robin
+
+SMALL = Scale(leagues=2, teams_per_league=6, seasons=2, squad=5, referees_per_country=4)
+
+
+class DatasetTests(SimpleTestCase):
+    def test_same_seed_same_data(self):
+        a, b, c = Dataset(seed=1, scale=SMALL), Dataset(seed=1, scale=SMALL), Dataset(seed=2, scale=SMALL)
+        self.assertEqual(list(a.rows("scores")), list(b.rows("scores")))
+        self.assertNotEqual(list(a.rows("scores")), list(c.rows("scores")))
+
+    def test_scale_factor_sizes(self):
+        self.assertEqual(Scale.of(1).matches, 38_000)
+        self.assertEqual(Scale.of(100).matches, 3_800_000)
+        with self.assertRaises(ValueError):
+            Scale.of(0)
+
+    def test_round_robin_plays_every_pair_home_and_away(self):
+        days = round_robin(range(5))
+        pairs = [p for day in days for p in day]
+        self.assertEqual(len(days), 10)
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertEqual(len(set(pairs)), 5 * 4)
+
+    def test_standings_agree_with_scores(self):
+        d = Dataset(seed=3, scale=SMALL)
+        scores = list(d.rows("scores"))
+        standings = list(d.rows("standings"))
+        self.assertEqual(len(scores), SMALL.matches)
+        self.assertEqual(len(standings), SMALL.leagues * SMALL.seasons * SMALL.teams_per_league)
+        self.assertTrue(all(r["played_games"] == 2 * (SMALL.teams_per_league - 1) for r in standings))
+        self.assertEqual(sum(r["goals_for"] for r in standings),
+                         sum(r["full_time_home"] + r["full_time_away"] for r in scores))
+        scorer_goals = sum(r["goals"] for r in d.rows("scorers"))
+        self.assertEqual(scorer_goals, sum(r["goals_for"] for r in standings))
+
+
+@override_settings(DATA_BACKEND="mock")
+class GenerateCommandTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+        for name in ("LEAGUES", "TEAMS", "PLAYERS", "MATCHES", "COUNTRIES", "SEASONS", "REFEREES", "STANDINGS",
+                     "SCORERS"):
+            items = getattr(mock_repo, name)
+            self.addCleanup(items.__setitem__, slice(None), [dict(x) for x in items])
+
+    def test_loads_every_entity_into_mock_through_bulk(self):
+        before = len(mock_repo.MATCHES)
+        out = StringIO()
+        call_command("generate_league_data", "--sf", "0.1", "--seed", "5", stdout=out, stderr=StringIO())
+        self.assertIn("OK", out.getvalue())
+        self.assertEqual(len(mock_repo.MATCHES) - before, Scale.of(0.1).matches)
+        self.assertEqual(len(mock_repo.STANDINGS), 10 * 20)
+        self.assertEqual(len(mock_repo.MATCHES[-1]["referees"]), 3)
+        self.assertIsNotNone(mock_repo.MATCHES[-1]["score"]["full_time"]["home"])
@@ -0,0 +1,45 @@
+import json
+from datetime import date, datetime
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import export
+from core.repositories import factory as repo_factory
+
+
+class ExportEncodingTests(SimpleTestCase):
+    def test_csv_and_ndjson_use_fixed_columns(self):
+        rows = [{"id": 1, "season_id": 2, "matchday": None, "utc_date": date(2025, 1, 10), "extra": "x"}]
+        lines = list(export.encode("csv", "matches", rows))
+        self.assertEqual(lines, [
+            "id,season_id,matchday,utc_date,home_team_id,away_team_id\r\n",
+            "1,2,,2025-01-10,,\r\n",
+        ])
+        rows = [{"id": 1, "utc_date": datetime(2025, 1, 10)}]
+        line = next(export.encode("ndjson", "matches", rows))
+        self.assertEqual(json.loads(line)["utc_date"], "2025-01-10")
+
+    def test_sql_reuses_filter_dsl(self):
+        query, params = export.sql("teams", {"league_id": "3"})
+        self.assertIn("WHERE tcl.league_id = %s ORDER BY t.team_id", query)
+        self.assertEqual(params, (3,))
+
+
+@override_settings(DATA_BACKEND="mock")
+class ExportViewTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_streams_csv(self):
+        r = self.client.get("/export/players.csv", {"position__in": "FW,GK"})
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(r.streaming)
+        self.assertEqual(r["Content-Disposition"], 'attachment; filename="players.csv"')
+        body = b"".join(r.streaming_content).decode()
+        self.assertIn("Jan Kowalski", body)
+        self.assertNotIn("Piotr Nowak", body)
+
+    def test_bad_filter_is_400_and_unknown_entity_404(self):
+        self.assertEqual(self.client.get("/export/players.ndjson", {"password": "x"}).status_code, 400)
+        self.assertEqual(self.client.get("/export/users.csv").status_code, 404)
@@ -0,0 +1,45 @@
+import threading
+import time
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.fanout import FanOutTimeout, call, fan_out
+
+
+class FanOutTests(SimpleTestCase):
+    def test_calls_run_in_parallel_and_keep_order(self):
+        barrier = threading.Barrier(3, timeout=2)
+
+        def wait(value):
+            barrier.wait()
+            return value
+
+        self.assertEqual(fan_out(call(wait, 1), call(wait, 2), call(wait, 3)), [1, 2, 3])
+
+    def test_first_error_is_raised(self):
+        def boom():
+            raise ValueError("zły filtr")
+
+        with self.assertRaisesMessage(ValueError, "zły filtr"):
+            fan_out(call(time.sleep, 1), boom)
+
+    def test_per_call_timeout(self):
+        with self.assertRaises(FanOutTimeout):
+            fan_out(call(time.sleep, 0.5, timeout=0.05), lambda: 1, timeout=5)
+
+    def test_nested_fan_out_runs_inline(self):
+        self.assertEqual(fan_out(lambda: fan_out(lambda: 1, lambda: 2), lambda: 3), [[1, 2], 3])
+
+
+@override_settings(DATA_BACKEND="mock", SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+class AdminFormFanOutTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+        self.client.post("/login/", {"username": "admin"})
+
+    def test_edit_form_renders_item_and_options(self):
+        team = repo_factory.get_repo().list_teams()[0]
+        r = self.client.get(f"/manage/teams/{team['id']}/edit/")
+        self.assertContains(r, team["name"])
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from bson import ObjectId
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.filters import FilterError, to_mongo, to_sql
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies",
+    DATA_BACKEND="mock",
+)
+class FilterDslTests(SimpleTestCase):
+    def test_sql_is_parameterized(self):
+        where, params = to_sql("players", {
+            "team_id": "7",
+            "position__in": ["GK", "DF"],
+            "name__prefix": "50%_",
+        })
+        self.assertEqual(where, ["p.team_id = %s", "p.position IN (%s, %s)", "p.name LIKE %s"])
+        # wartości nigdy nie trafiają do SQL, a znaki LIKE są escapowane
+        self.assertEqual(params, [7, "GK", "DF", "50\\%\\_%"])
+
+    def test_range_and_empty_in(self):
+        where, params = to_sql("teams", {"founded_year__gte": "1900", "founded_year__lte": 1950, "id__in": []})
+        self.assertEqual(where, ["t.founded_year >= %s", "t.founded_year <= %s", "1 = 0"])
+        self.assertEqual(params, [1900, 1950])
+
+    def test_mongo_match(self):
+        lid = "507f1f77bcf86cd799439011"
+        conds = to_mongo("matches", {"season_id": lid, "utc_date__gte": "2024-08-01"}, ObjectId)
+        self.assertEqual(conds, [
+            {"seasonId": ObjectId(lid)},
+            {"utcDate": {"$gte": datetime(2024, 8, 1)}},
+        ])
+        conds = to_mongo("teams", {"name__prefix": "L.+"}, ObjectId)
+        self.assertEqual(conds, [{"name": {"$regex": "^L\\.\\+"}}])
+
+    def test_unknown_field_operator_or_value_is_rejected(self):
+        with self.assertRaises(FilterError):
+            to_sql("teams", {"password": "x"})
+        with self.assertRaises(FilterError):
+            to_sql("teams", {"name__regex": ".*"})
+        with self.assertRaises(FilterError):
+            to_sql("teams", {"founded_year": "dawno"})
+        with self.assertRaises(FilterError):
+            to_sql("teams", {"founded_year__prefix": "19"})
+
+    def test_mock_adapter_applies_filters(self):
+        repo = MockAdapter()
+        league_id = repo.list_leagues()[0]["id"]
+        teams = repo.list_teams(filters={"league_id": league_id})
+        self.assertTrue(teams)
+        self.assertEqual(repo.list_teams(filters={"league_id": "0" * 24}), [])
+        self.assertEqual(
+            [t["name"] for t in repo.list_teams(filters={"name__prefix": "Leg"})],
+            ["Legia Warszawa"],
+        )
+
+    def test_league_detail_lists_league_teams(self):
+        league_id = MockAdapter().list_leagues()[0]["id"]
+        r = self.client.get(f"/leagues/{league_id}/")
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Legia Warszawa")
+
+    def test_mock_matches_by_team_season_matchday_and_dates(self):
+        repo = MockAdapter()
+        self.assertEqual(len(repo.list_matches(q="lech")), 1)
+        self.assertEqual(repo.list_matches(q="Chelsea"), [])
+        self.assertEqual(len(repo.list_matches(filters={"season_id": "2", "matchday": 12})), 1)
+        self.assertEqual(repo.list_matches(filters={"utc_date__gte": "2025-01-11"}), [])
+        self.assertEqual(len(repo.list_matches(filters={"utc_date__gte": "2025-01-01", "utc_date__lte": "2025-01-10"})), 1)
+
+    def test_matches_list_view_filters(self):
+        r = self.client.get("/matches/", {"q": "Legia", "season": "2", "date_from": "2025-01-01"})
+        self.assertContains(r, "Legia Warszawa vs Lech Poznań")
+        r = self.client.get("/matches/", {"matchday": "11"})
+        self.assertContains(r, "Brak meczów.")
+        r = self.client.get("/matches/", {"matchday": "dwunasta"})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Niepoprawna wartość filtra")
@@ -0,0 +1,62 @@
+import logging
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories import instrument, slowlog
+from core.repositories.adapters.mock import MockAdapter
+
+
+class TraceTests(SimpleTestCase):
+    def test_records_outer_calls_only_inside_a_trace(self):
+        repo = MockAdapter()
+        repo.list_teams()
+        with instrument.tracing() as trace:
+            repo.list_teams(filters={"league_id": "1"}, limit=5)
+            repo.get_teams_many(["a", "b"])
+            created = repo.create_player({"name": "Test"})
+            repo.delete_player(created["id"])
+        self.assertEqual([c.method for c in trace.calls], ["list_teams", "get_teams_many", "create_player", "delete_player"])
+        self.assertEqual(trace.calls[0].shape, "filters{league_id}, limit")
+        self.assertEqual((trace.calls[1].shape, trace.calls[1].rows), ("[2]", 0))
+        self.assertEqual(trace.calls[0].backend, "mock")
+        self.assertIsNone(instrument.current())
+
+    def test_round_trips_are_counted_per_outer_call(self):
+        @instrument.traced("mock")
+        class Repo(MockAdapter):
+            def count_teams(self):
+                for _ in range(3):
+                    with slowlog.timed("mock", "SELECT 1"):
+                        pass
+                return super().count_teams()
+
+        with instrument.tracing() as trace:
+            Repo().count_teams()
+        self.assertEqual((trace.calls[0].round_trips, trace.round_trips), (3, 3))
+
+    def test_server_timing_and_budget(self):
+        with instrument.tracing() as trace:
+            MockAdapter().count_teams()
+        self.assertTrue(instrument.server_timing(trace).startswith('repo;dur='))
+        self.assertIn("repo-count-teams;", instrument.server_timing(trace))
+        self.assertFalse(instrument.check_budget(trace, "GET /", 5, None))
+        with self.assertLogs("core.repositories.instrument", logging.WARNING):
+            self.assertTrue(instrument.check_budget(trace, "GET /", 0, None))
+
+
+@override_settings(DATA_BACKEND="mock", SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+class MiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_header_and_admin_panel(self):
+        r = self.client.get("/teams/")
+        self.assertIn('desc="1 calls"', r["Server-Timing"])
+        self.assertNotContains(r, "Zapytania repo")
+        self.client.post("/login/", {"username": "admin"})
+        # widok async: wywołania z wątków puli też trafiają do śladu żądania
+        r = self.client.get("/")
+        self.assertIn('desc="4 calls"', r["Server-Timing"])
+        self.assertContains(r, "Zapytania repo: 4")
@@ -0,0 +1,81 @@
+import asyncio
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.loader import DataLoader
+
+
+class CountingRepo:
+    def __init__(self, teams):
+        self.teams = teams
+        self.calls = []
+
+    def get_teams_many(self, ids):
+        self.calls.append(list(ids))
+        return {i: self.teams[i] for i in ids if i in self.teams}
+
+
+class AsyncCountingRepo:
+    def __init__(self, repo):
+        self.repo = repo
+
+    async def get_teams_many(self, ids):
+        return self.repo.get_teams_many(ids)
+
+
+class DataLoaderTests(SimpleTestCase):
+    def test_queued_ids_resolve_in_one_call(self):
+        repo = CountingRepo({"1": {"id": "1"}, "2": {"id": "2"}})
+        loader = DataLoader(repo)
+        loader.want("teams", 1, "2", "9")
+        self.assertEqual(loader.load("teams", "1"), {"id": "1"})
+        self.assertEqual(repo.calls, [["1", "2", "9"]])
+
+        # mapa tożsamości: kolejne odczyty (także brakującego id) bez zapytań
+        self.assertIs(loader.load("teams", 2), loader.load("teams", "2"))
+        self.assertEqual(loader.load_many("teams", ["9", None]), [None, None])
+        self.assertEqual(len(repo.calls), 1)
+
+    def test_async_loads_share_the_identity_map(self):
+        repo = CountingRepo({"1": {"id": "1"}, "2": {"id": "2"}})
+        loader = DataLoader(repo, AsyncCountingRepo(repo))
+
+        async def both():
+            return await loader.aload_many("teams", ["1", "2", "1"]), await loader.aload("teams", 2)
+
+        (one, two, again), cached = asyncio.run(both())
+        self.assertIs(one, again)
+        self.assertIs(cached, two)
+        self.assertIs(loader.load("teams", "1"), one)
+        self.assertEqual(repo.calls, [["1", "2"]])
+
+    def test_mock_adapter_many_skips_missing(self):
+        repo = MockAdapter()
+        ids = [t["id"] for t in repo.list_teams()]
+        found = repo.get_teams_many(ids + ["0" * 24])
+        self.assertEqual(sorted(found), sorted(ids))
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies",
+    DATA_BACKEND="mock",
+)
+class MatchDetailBatchingTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+
+    def tearDown(self):
+        repo_factory._repo_singleton = None
+
+    def test_match_detail_loads_both_teams_at_once(self):
+        match = MockAdapter().list_matches()[0]
+        original = MockAdapter.get_teams_many
+        with mock.patch.object(MockAdapter, "get_team") as get_team, \
+                mock.patch.object(MockAdapter, "get_teams_many", autospec=True, side_effect=original) as many:
+            r = self.client.get(f"/matches/{match['id']}/")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(many.call_count, 1)
+        get_team.assert_not_called()
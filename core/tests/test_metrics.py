@@ -0,0 +1,83 @@
+import gc
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories import metrics
+
+
+class RegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.registry = metrics.Registry()
+
+    def test_counter_sums_thread_shards(self):
+        counter = self.registry.counter("jobs", "Jobs.", ("kind",))
+
+        def work():
+            for _ in range(1000):
+                counter.inc("a")
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(counter.value("a"), 4000)
+        self.assertIn('jobs_total{kind="a"} 4000', self.registry.render())
+
+    def test_finished_threads_fold_into_one_total(self):
+        counter = self.registry.counter("short", "Short-lived threads.")
+        hist = self.registry.histogram("short_lat", "Latency.", buckets=(1.0,))
+
+        def work():
+            counter.inc()
+            hist.observe(0.5)
+
+        for _ in range(50):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+        gc.collect()
+        self.assertEqual(counter._shards._all, {})
+        self.assertEqual(hist._shards._all, {})
+        self.assertEqual(counter.value(), 50)
+        self.assertEqual(hist.count(), 50)
+        self.assertIn('short_lat_bucket{le="1"} 50', self.registry.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        hist = self.registry.histogram("lat", "Latency.", ("m",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3):
+            hist.observe(v, "x")
+        text = self.registry.render()
+        self.assertIn('lat_bucket{m="x",le="0.1"} 2', text)
+        self.assertIn('lat_bucket{m="x",le="1"} 3', text)
+        self.assertIn('lat_bucket{m="x",le="+Inf"} 4', text)
+        self.assertIn('lat_sum{m="x"} 3.65', text)
+        self.assertIn('lat_count{m="x"} 4', text)
+
+    def test_label_escaping_and_arity(self):
+        counter = self.registry.counter("c", "C.", ("v",))
+        counter.inc('a"b\\')
+        self.assertIn('c_total{v="a\\"b\\\\"} 1', self.registry.render())
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+
+@override_settings(DATA_BACKEND="mock", REPO_CACHE={"enabled": True})
+class MetricsEndpointTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_requests_repo_calls_and_cache(self):
+        before = metrics.repo_latency.count("list_teams", "mock")
+        self.client.get("/teams/")
+        self.assertEqual(metrics.repo_latency.count("list_teams", "mock"), before + 1)
+        r = self.client.get("/metrics")
+        self.assertEqual(r["Content-Type"], metrics.CONTENT_TYPE)
+        text = r.content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="teams_list"}', text)
+        self.assertIn('http_requests_total{view="teams_list",method="GET",status="200"}', text)
+        self.assertIn('repo_call_duration_seconds_bucket{method="list_teams",backend="mock",le="+Inf"}', text)
+        self.assertIn("repo_cache_hit_ratio ", text)
@@ -0,0 +1,46 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.pagination import Page, decode_cursor, encode_cursor
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies",
+    DATA_BACKEND="mock",
+)
+class KeysetPaginationTests(SimpleTestCase):
+    def test_cursor_roundtrip_and_garbage(self):
+        c = encode_cursor("Ekstraklasa", 7)
+        self.assertEqual(decode_cursor(c, str, int), ("Ekstraklasa", 7))
+        # śmieci z query stringa = pierwsza strona, a nie błąd 500
+        self.assertIsNone(decode_cursor("!!!", str, int))
+        self.assertIsNone(decode_cursor(encode_cursor("x"), str, int))
+        self.assertIsNone(decode_cursor(encode_cursor("x", "nie-int"), str, int))
+
+    def test_mock_adapter_walks_all_pages_in_order(self):
+        repo = MockAdapter()
+        seen, cursor = [], None
+        while True:
+            page = repo.list_players(limit=1, cursor=cursor)
+            self.assertIsInstance(page, Page)
+            self.assertLessEqual(len(page), 1)
+            seen.extend(p["name"] for p in page)
+            cursor = page.next_cursor
+            if not cursor:
+                break
+        self.assertEqual(seen, sorted(p["name"] for p in repo.list_players()))
+
+    def test_without_limit_list_is_unchanged(self):
+        items = MockAdapter().list_leagues()
+        self.assertNotIsInstance(items, Page)
+
+    def test_list_view_renders_next_page_link(self):
+        r = self.client.get("/leagues/", {"limit": 1})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Następna strona")
+        cursor = r.context["next_cursor"]
+
+        r = self.client.get("/leagues/", {"limit": 1, "cursor": cursor})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Pierwsza strona")
+        self.assertNotContains(r, "Następna strona")
@@ -0,0 +1,138 @@
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from core.repositories.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **kwargs):
+        self.opened = []
+
+        def connect():
+            c = FakeConn()
+            self.opened.append(c)
+            return c
+
+        kwargs.setdefault("check", lambda c: c.healthy)
+        return ConnectionPool(connect, **kwargs)
+
+    def test_constructor_does_not_connect_and_reuses_connections(self):
+        pool = self.make_pool(min_size=1, max_size=2)
+        self.assertEqual(self.opened, [])
+
+        for _ in range(5):
+            with pool.connection() as conn:
+                self.assertIs(conn, self.opened[0])
+
+        stats = pool.stats()
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(stats["borrows"], 5)
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["in_use"], 0)
+
+    def hold_in_threads(self, pool, n, seconds=0.05):
+        """Trzyma n połączeń jednocześnie (każde w osobnym wątku)."""
+        errors = []
+
+        def hold():
+            try:
+                with pool.connection():
+                    time.sleep(seconds)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=hold) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(2)
+        return errors
+
+    def test_checkout_is_bounded_by_max_size(self):
+        pool = self.make_pool(min_size=0, max_size=1, timeout=0.01)
+        errors = self.hold_in_threads(pool, 2, seconds=0.1)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], PoolTimeout)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_waiting_thread_gets_released_connection(self):
+        pool = self.make_pool(min_size=0, max_size=1, timeout=2)
+        got = []
+
+        def wait_for_connection():
+            with pool.connection() as conn:
+                got.append(conn)
+
+        with pool.connection() as first:
+            t = threading.Thread(target=wait_for_connection)
+            t.start()
+            time.sleep(0.05)
+        t.join(1)
+        self.assertEqual(got, [first])
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_unhealthy_idle_connection_is_replaced_on_borrow(self):
+        pool = self.make_pool(max_size=2, check_interval=0)
+        with pool.connection() as conn:
+            pass
+        conn.healthy = False
+
+        with pool.connection() as conn2:
+            self.assertIsNot(conn2, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(pool.stats()["failed_checks"], 1)
+
+    def test_idle_connections_are_recycled_down_to_min_size(self):
+        pool = self.make_pool(min_size=1, max_size=3, max_idle=0.01)
+        self.assertEqual(self.hold_in_threads(pool, 3), [])
+        self.assertEqual(pool.stats()["size"], 3)
+        time.sleep(0.02)
+        with pool.connection():
+            pass
+
+        stats = pool.stats()
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["recycled_idle"], 2)
+
+    def test_overflow_connections_are_closed_on_return(self):
+        pool = self.make_pool(min_size=0, max_size=1, max_overflow=1, timeout=0.01)
+        self.assertEqual(self.hold_in_threads(pool, 2), [])
+        stats = pool.stats()
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(stats["overflow_closed"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_nested_borrow_in_same_thread_reuses_connection(self):
+        pool = self.make_pool(min_size=0, max_size=1, timeout=0.05)
+        with pool.connection() as outer:
+            with pool.connection() as inner:
+                self.assertIs(inner, outer)
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_reset_on_return_and_max_lifetime(self):
+        resets = []
+        pool = self.make_pool(max_size=1, max_lifetime=0.01, reset=resets.append)
+        with pool.connection() as first:
+            pass
+        self.assertEqual(resets, [first])
+
+        time.sleep(0.02)
+        with pool.connection() as second:
+            self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+
+    def test_warmup_opens_min_size_connections(self):
+        pool = self.make_pool(min_size=2, max_size=3)
+        pool.warmup(background=False)
+        self.assertEqual(pool.stats()["idle"], 2)
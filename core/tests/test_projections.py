@@ -0,0 +1,44 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from core.repositories import projections
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.adapters.mysql import MysqlAdapter
+from core.repositories.adapters.postgres import PostgresAdapter
+
+
+def schema(backend):
+    return (Path(settings.BASE_DIR) / "infra" / backend / "init" / "01-schema.sql").read_text(encoding="utf-8")
+
+
+class TeamCurrentLeagueProvisionTests(SimpleTestCase):
+    def adapters(self):
+        return {
+            "postgres": PostgresAdapter(dsn="postgresql://example"),
+            "mysql": MysqlAdapter(uri="mysql://user:x@example/db"),
+        }
+
+    def test_runs_every_statement_and_backfills_last(self):
+        for backend, adapter in self.adapters().items():
+            with self.subTest(backend):
+                adapter._execute = Mock()
+                done = projections.provision(adapter)
+                self.assertEqual([c.args[0] for c in adapter._execute.call_args_list], done)
+                self.assertIn("refresh_team_current_league", done[-1])
+        self.assertEqual(projections.provision(MockAdapter()), [])
+
+    def test_statements_are_rerunnable_and_match_the_schema_files(self):
+        for backend, statements in projections.TEAM_CURRENT_LEAGUE.items():
+            text = schema(backend)
+            for n, statement in enumerate(statements):
+                if not statement.startswith("CREATE"):
+                    continue
+                with self.subTest(backend, statement=statement.splitlines()[0]):
+                    rerunnable = "IF NOT EXISTS" in statement or "OR REPLACE" in statement or (
+                        statements[n - 1].startswith("DROP ") and "IF EXISTS" in statements[n - 1])
+                    self.assertTrue(rerunnable)
+                    plain = statement.replace("OR REPLACE ", "").replace("IF NOT EXISTS ", "")
+                    self.assertIn(plain, text)
@@ -0,0 +1,59 @@
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.reference import ReferenceCache
+
+
+class CountingMock(MockAdapter):
+    def __init__(self):
+        super().__init__()
+        self.loads = 0
+
+    def team_options(self):
+        self.loads += 1
+        return super().team_options()
+
+
+class ReferenceCacheTests(SimpleTestCase):
+    def test_options_are_id_label_pairs_loaded_once(self):
+        repo = CountingMock()
+        cache = ReferenceCache(repo)
+        teams = cache.get("teams")
+        self.assertIs(cache.get("teams"), teams)
+        self.assertEqual(repo.loads, 1)
+        self.assertTrue(all(isinstance(v, str) and isinstance(l, str) for v, l in teams))
+        self.assertIn(("1", "Pep Guardiola (Spain)"), cache.get("coaches"))
+
+    def test_team_write_invalidates_team_options_only(self):
+        repo = CountingMock()
+        cache = ReferenceCache(repo)
+        cache.get("teams")
+        countries = cache.get("countries")
+        version = cache.version
+
+        created = repo.create_team({"name": "Nowa Drużyna"})
+        try:
+            self.assertIn((created["id"], "Nowa Drużyna"), cache.get("teams"))
+        finally:
+            repo.delete_team(created["id"])
+        self.assertEqual(repo.loads, 2)
+        self.assertGreater(cache.version, version)
+        self.assertIs(cache.get("countries"), countries)
+
+
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies",
+    DATA_BACKEND="mock",
+)
+class AdminFormOptionsTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+        self.client.post("/login/", {"username": "admin", "password": "x"})
+
+    def test_player_form_renders_cached_options(self):
+        r = self.client.get("/manage/players/new/")
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, '<option value="507f1f77bcf86cd799439101" >Legia Warszawa</option>', html=False)
+        self.assertContains(r, "Poland")
@@ -0,0 +1,89 @@
+import re
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import factory as repo_factory
+from core.repositories import search
+from core.repositories.adapters.mock import MockAdapter
+from core.repositories.adapters.mongo import MongoAdapter
+
+
+class SearchSqlTests(SimpleTestCase):
+    def test_pg_match_escapes_like_and_uses_subqueries_for_related_names(self):
+        clause, params = search.pg_match("teams", "50%_a")
+        self.assertIn("t.name ILIKE %s", clause)
+        self.assertIn("t.coach_id IN (SELECT coach_id FROM coaches WHERE name ILIKE %s)", clause)
+        self.assertEqual(params, [r"%50\%\_a%"] * 3)
+
+    def test_mysql_uses_fulltext_unless_a_word_is_too_short(self):
+        clause, params = search.mysql_match("players", "Jan Kowal")
+        self.assertIn("MATCH(p.name, p.position) AGAINST (%s IN BOOLEAN MODE)", clause)
+        self.assertEqual(params[0], "+Jan* +Kowal*")
+        # "FW" jest krótsze niż innodb_ft_min_token_size – indeks FULLTEXT go nie zna
+        clause, params = search.mysql_match("players", "FW")
+        self.assertNotIn("MATCH", clause)
+        self.assertEqual(params[0], "%FW%")
+
+    def test_boolean_query_drops_operators(self):
+        self.assertEqual(search.boolean_query('legia") -wisła*'), "+legia* +wisła*")
+
+
+def regex_hit(pattern, value):
+    """Python stand-in for Mongo's ``$regex`` (PCRE) on the patterns search builds."""
+    flags = re.IGNORECASE if "i" in pattern.get("$options", "") else 0
+    return re.search(pattern["$regex"], value, flags) is not None
+
+
+class SearchMongoTests(SimpleTestCase):
+    def test_pattern_matches_word_prefixes_and_escapes_input(self):
+        pattern = search.mongo_pattern(" Leg ")
+        self.assertTrue(regex_hit(pattern, "Legia Warszawa"))
+        self.assertTrue(regex_hit(search.mongo_pattern("kow"), "Jan Kowalski"))
+        self.assertTrue(regex_hit(search.mongo_pattern("Legia War"), "Legia Warszawa"))
+        self.assertFalse(regex_hit(search.mongo_pattern("egia"), "Legia Warszawa"))
+        self.assertFalse(regex_hit(search.mongo_pattern("a.b"), "axb"))
+
+    def test_related_names_become_id_branches(self):
+        with patch("core.repositories.adapters.mongo.MongoClient", return_value=MagicMock()):
+            repo = MongoAdapter(uri="mongodb://example", db_name="db")
+        countries = repo.db["countries"]
+        countries.find.return_value = [{"_id": "pl"}]
+        match = repo._search("players", "Pol")
+        countries.find.assert_called_once_with({"name": search.mongo_pattern("Pol")}, {"_id": 1})
+        self.assertEqual(match["$or"][-1], {"nationalityId": {"$in": ["pl"]}})
+        self.assertEqual([next(iter(b)) for b in match["$or"]], ["name", "position", "nationalityId"])
+
+
+    def test_match_filter_finds_teams_by_partial_name(self):
+        with patch("core.repositories.adapters.mongo.MongoClient", return_value=MagicMock()):
+            repo = MongoAdapter(uri="mongodb://example", db_name="db")
+        repo.db.teams.find.return_value = [{"_id": "t1"}]
+        repo.list_matches(q="Leg")
+        (query, _), _ = repo.db.teams.find.call_args
+        self.assertEqual(list(query), ["name"])
+        self.assertTrue(regex_hit(query["name"], "Legia Warszawa"))
+        self.assertFalse(regex_hit(query["name"], "Wisła Kraków"))
+
+
+class MockSearchTests(SimpleTestCase):
+    def test_ranks_name_matches_above_related_ones(self):
+        hits = MockAdapter().search("Legia")
+        self.assertEqual((hits[0]["entity"], hits[0]["label"]), ("teams", "Legia Warszawa"))
+
+    def test_matches_related_fields(self):
+        labels = {h["label"] for h in MockAdapter().search("Polska", entities=("players",))}
+        self.assertEqual(labels, {"Jan Kowalski", "Piotr Nowak"})
+
+
+@override_settings(DATA_BACKEND="mock")
+class SearchViewTests(SimpleTestCase):
+    def setUp(self):
+        repo_factory._repo_singleton = None
+        self.addCleanup(setattr, repo_factory, "_repo_singleton", None)
+
+    def test_results_page(self):
+        r = self.client.get("/search/", {"q": "Kow"})
+        self.assertEqual(r.status_code, 200)
+        self.assertContains(r, "Jan Kowalski")
+        self.assertContains(r, "Zawodnik")
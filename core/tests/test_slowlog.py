@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase, override_settings
+
+from core.repositories import slowlog
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_sql_literals_and_params(self):
+        self.assertEqual(
+            slowlog.normalize_sql("SELECT *  FROM t1\n WHERE id IN (1, 2, 3) AND name ILIKE %s AND x = 'a''b' LIMIT 51"),
+            "SELECT * FROM t1 WHERE id IN (?) AND name ILIKE ? AND x = ? LIMIT ?",
+        )
+
+    def test_mongo_masks_match_but_keeps_structure(self):
+        shape = json.loads(slowlog.normalize_mongo({
+            "aggregate": "matches",
+            "pipeline": [
+                {"$match": {"seasonId": "abc", "_id": {"$in": [1, 2]}}},
+                {"$lookup": {"from": "teams", "localField": "homeTeamId", "foreignField": "_id", "as": "home"}},
+            ],
+        }))
+        self.assertEqual(shape["pipeline"][0]["$match"], {"seasonId": "?", "_id": {"$in": ["?"]}})
+        self.assertEqual(shape["pipeline"][1]["$lookup"]["from"], "teams")
+
+    def test_only_reads_are_explained(self):
+        self.assertTrue(slowlog.is_read("  WITH x AS (SELECT 1) SELECT * FROM x"))
+        self.assertFalse(slowlog.is_read("UPDATE teams SET name = %s"))
+
+
+class SlowLogTests(SimpleTestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        self.addCleanup(self._reset_handler)
+        self._reset_handler()
+        slowlog._explained.clear()
+
+    def _reset_handler(self):
+        slowlog.flush()
+        if slowlog._handler is not None:
+            slowlog._handler.close()
+            slowlog._log().removeHandler(slowlog._handler)
+            slowlog._handler = None
+
+    def entries(self):
+        slowlog.flush()
+        with open(self.path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_slow_read_is_logged_with_plan_once_per_interval(self):
+        explains = []
+        with override_settings(SLOW_QUERY_LOG={"threshold_ms": 0, "path": self.path}):
+            for _ in range(2):
+                with slowlog.timed("postgres", "SELECT * FROM teams WHERE team_id = 7", lambda: explains.append(1) or "Seq Scan"):
+                    pass
+            with slowlog.timed("postgres", "DELETE FROM teams WHERE team_id = 7", lambda: explains.append(1)):
+                pass
+            entries = self.entries()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[0]["query"], "SELECT * FROM teams WHERE team_id = ?")
+        self.assertEqual(entries[0]["plan"], "Seq Scan")
+        self.assertNotIn("plan", entries[1])
+        self.assertEqual(len(explains), 1)
+
+    def test_fast_query_is_not_logged(self):
+        with override_settings(SLOW_QUERY_LOG={"threshold_ms": 10_000, "path": self.path}):
+            with slowlog.timed("mysql", "SELECT 1"):
+                pass
+            self.assertEqual(self.entries(), [])
+
+    def test_mongo_listener(self):
+        listener = slowlog.MongoSlowCommands()
+        event = SimpleNamespace(command_name="find", connection_id=("h", 1), request_id=5, database_name="db",
+                                command={"find": "teams", "filter": {"name": "Legia"}, "lsid": {}, "$db": "db"},
+                                duration_micros=1500)
+        with override_settings(SLOW_QUERY_LOG={"threshold_ms": 1, "path": self.path, "explain": False}):
+            listener.started(event)
+            listener.succeeded(event)
+            [entry] = self.entries()
+        self.assertEqual((entry["backend"], entry["ms"]), ("mongo", 1.5))
+        self.assertEqual(json.loads(entry["query"]), {"find": "teams", "filter": {"name": "?"}})
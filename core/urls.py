@@ -1,6 +1,6 @@
 from django.urls import path, register_converter
 from .converters import ObjectIdConverter
-from . import views
+from . import api, views
 
 # register_converter(ObjectIdConverter, "oid")
 
@@ -22,6 +22,15 @@ urlpatterns = [
     path("matches/", views.matches_list, name="matches_list"),
     path("matches/<str:match_id>/", views.match_detail, name="match_detail"),
 
+    path("search/", views.search, name="search"),
+    path("export/<str:entity>.<str:fmt>", views.export_rows, name="export"),
+
+    path("metrics", views.metrics_view, name="metrics"),
+
+    path("api/<str:entity>/", api.list_items, name="api_list"),
+    path("api/<str:entity>/batch/", api.batch, name="api_batch"),
+    path("api/<str:entity>/<str:obj_id>/", api.detail, name="api_detail"),
+
     path("manage/", views.admin_index, name="admin_index"),
 
     path("manage/leagues/", views.admin_leagues_list, name="admin_leagues_list"),
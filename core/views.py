@@ -1,24 +1,49 @@
+import asyncio
+from itertools import chain
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import render, redirect
-from .repositories.factory import get_repo
+from .repositories import export, metrics
+from .repositories.fanout import call, fan_out
+from .repositories.factory import get_async_repo, get_reference, get_repo
+from .repositories.filters import FilterError
+from .repositories.loader import request_loader
+from .repositories.pagination import DEFAULT_LIMIT, clamp_limit
 
 def get_role(request): return request.session.get("role", "guest")
 def require_admin(request): return get_role(request) == "admin"
+async def aget_role(request): return await request.session.aget("role", "guest")
+
+def page_args(request):
+    default = getattr(settings, "LIST_PAGE_SIZE", DEFAULT_LIMIT)
+    return {"limit": clamp_limit(request.GET.get("limit"), default), "cursor": request.GET.get("cursor")}
+
+def paged(request, items):
+    """Kontekst listy stronicowanej kursorem (partials/_pager.html)."""
+    query = request.GET.copy()
+    query.pop("cursor", None)
+    return {
+        "items": items,
+        "cursor": request.GET.get("cursor"),
+        "next_cursor": getattr(items, "next_cursor", None),
+        "base_query": query.urlencode(),
+    }
 
 def error_403(request, exception=None): return render(request, "errors/403.html", status=403)
 def error_404(request, exception=None): return render(request, "errors/404.html", status=404)
 def error_500(request): return render(request, "errors/500.html", status=500)
 
-def home(request):
-    repo = get_repo()
-    role = get_role(request)
+# Widoki async: niezależne zapytania idą równolegle (asyncio.gather), każde w wątku get_async_repo()
+async def home(request):
+    repo = get_async_repo()
+    role = await aget_role(request)
+    leagues, teams, players, matches = await asyncio.gather(
+        repo.count_leagues(), repo.count_teams(), repo.count_players(), repo.count_matches()
+    )
     return render(request, "dashboard/home.html", {
         "role": role,
-        "counts": {
-            "leagues": len(repo.list_leagues()),
-            "teams": len(repo.list_teams()),
-            "players": len(repo.list_players()),
-            "matches": len(repo.list_matches()),
-        }
+        "counts": {"leagues": leagues, "teams": teams, "players": players, "matches": matches},
     })
 
 def login_view(request):
@@ -35,51 +60,97 @@ def logout_view(request):
 def leagues_list(request):
     repo = get_repo()
     q = request.GET.get("q")
-    return render(request, "leagues/list.html", {"role": get_role(request), "items": repo.list_leagues(q=q), "q": q})
+    items = repo.list_leagues(q=q, **page_args(request))
+    return render(request, "leagues/list.html", {"role": get_role(request), "q": q, **paged(request, items)})
 
-def league_detail(request, league_id: str):
-    repo = get_repo()
-    league = repo.get_league(league_id)
+async def league_detail(request, league_id: str):
+    repo = get_async_repo()
+    league, role = await asyncio.gather(repo.get_league(league_id), aget_role(request))
     if not league: return error_404(request)
-    teams = [t for t in repo.list_teams() if str(t.get("league_id")) == str(league_id)]
-    return render(request, "leagues/detail.html", {"role": get_role(request), "league": league, "teams": teams})
+    # filtr dopiero po get_league: adaptery SQL odrzucają nienumeryczne id (FilterError)
+    teams = await repo.list_teams(filters={"league_id": league_id})
+    return render(request, "leagues/detail.html", {"role": role, "league": league, "teams": teams})
 
 def teams_list(request):
     repo = get_repo()
     q = request.GET.get("q")
-    return render(request, "teams/list.html", {"role": get_role(request), "items": repo.list_teams(q=q), "q": q})
+    items = repo.list_teams(q=q, **page_args(request))
+    return render(request, "teams/list.html", {"role": get_role(request), "q": q, **paged(request, items)})
 
-def team_detail(request, team_id: str):
-    repo = get_repo()
-    team = repo.get_team(team_id)
+async def team_detail(request, team_id: str):
+    repo = get_async_repo()
+    team, players = await asyncio.gather(repo.get_team(team_id), repo.team_players(team_id))
     if not team: return error_404(request)
-    players = repo.team_players(team_id)
-    return render(request, "teams/detail.html", {"role": get_role(request), "team": team, "players": players})
+    return render(request, "teams/detail.html", {"role": await aget_role(request), "team": team, "players": players})
 
 def players_list(request):
     repo = get_repo()
     q = request.GET.get("q")
-    return render(request, "players/list.html", {"role": get_role(request), "items": repo.list_players(q=q), "q": q})
+    items = repo.list_players(q=q, **page_args(request))
+    return render(request, "players/list.html", {"role": get_role(request), "q": q, **paged(request, items)})
 
-def player_detail(request, player_id: str):
-    repo = get_repo()
-    player = repo.get_player(player_id)
+async def player_detail(request, player_id: str):
+    loader = request_loader(request, get_repo(), get_async_repo())
+    # id drużyny jest dopiero w rekordzie zawodnika – tu nie ma czego zrównoleglić, ale wątek żądania nie czeka
+    player, role = await asyncio.gather(loader.aload("players", player_id), aget_role(request))
     if not player: return error_404(request)
-    team = repo.get_team(str(player.get("currentTeamId") or player.get("team_id") or ""))
-    return render(request, "players/detail.html", {"role": get_role(request), "player": player, "team": team})
+    team = await loader.aload("teams", player.get("currentTeamId") or player.get("team_id"))
+    return render(request, "players/detail.html", {"role": role, "player": player, "team": team})
+
+# parametr GET -> filtr list_matches
+MATCH_FILTERS = {
+    "season": "season_id",
+    "matchday": "matchday",
+    "date_from": "utc_date__gte",
+    "date_to": "utc_date__lte",
+}
 
 def matches_list(request):
     repo = get_repo()
     q = request.GET.get("q")
-    return render(request, "matches/list.html", {"role": get_role(request), "items": repo.list_matches(q=q), "q": q})
+    filters = {key: request.GET[param] for param, key in MATCH_FILTERS.items() if request.GET.get(param)}
+    try:
+        items, error = repo.list_matches(q=q, filters=filters, **page_args(request)), None
+    except FilterError as e:
+        items, error = [], str(e)
+    return render(request, "matches/list.html", {
+        "role": get_role(request), "q": q, "error": error,
+        "f": {param: request.GET.get(param, "") for param in MATCH_FILTERS},
+        "seasons": get_reference().get("seasons"),
+        **paged(request, items),
+    })
 
-def match_detail(request, match_id: str):
-    repo = get_repo()
-    match = repo.get_match(match_id)
+async def match_detail(request, match_id: str):
+    loader = request_loader(request, get_repo(), get_async_repo())
+    match, role = await asyncio.gather(loader.aload("matches", match_id), aget_role(request))
     if not match: return error_404(request)
-    home = repo.get_team(match["home_team_id"])
-    away = repo.get_team(match["away_team_id"])
-    return render(request, "matches/detail.html", {"role": get_role(request), "match": match, "home": home, "away": away})
+    # obie drużyny jednym get_teams_many – jedno zapytanie zamiast dwóch równoległych
+    home, away = await loader.aload_many("teams", [match["home_team_id"], match["away_team_id"]])
+    return render(request, "matches/detail.html", {"role": role, "match": match, "home": home, "away": away})
+
+def export_rows(request, entity: str, fmt: str):
+    if entity not in export.ENTITIES or fmt not in export.FORMATS: return error_404(request)
+    filters = {k: (v.split(",") if k.endswith("__in") else v) for k, v in request.GET.items()}
+    rows = get_repo().stream(entity, filters=filters)
+    # pierwszy wiersz przed nagłówkami odpowiedzi – błędny filtr to 400, a nie ucięty plik
+    try:
+        first = next(rows, None)
+    except FilterError as e:
+        return HttpResponseBadRequest(str(e))
+    if first is not None:
+        rows = chain([first], rows)
+    response = StreamingHttpResponse(export.encode(fmt, entity, rows), content_type=export.FORMATS[fmt])
+    response["Content-Disposition"] = f'attachment; filename="{entity}.{fmt}"'
+    return response
+
+def search(request):
+    q = (request.GET.get("q") or "").strip()
+    hits = get_repo().search(q) if q else []
+    return render(request, "search/results.html", {"role": get_role(request), "q": q, "hits": hits})
+
+def metrics_view(request):
+    text = metrics.REGISTRY.render(metrics.repo_samples(get_repo()))
+    return HttpResponse(text, content_type=metrics.CONTENT_TYPE)
 
 # Admin jak było – tylko typy id zmienione na str
 def admin_index(request):
@@ -89,17 +160,21 @@ def admin_index(request):
 def admin_leagues_list(request):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    return render(request, "adminpanel/leagues_list.html", {"role": get_role(request), "items": repo.list_leagues()})
+    items = repo.list_leagues(**page_args(request))
+    return render(request, "adminpanel/leagues_list.html", {"role": get_role(request), **paged(request, items)})
 
 def admin_leagues_form(request, league_id=None):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    item = repo.get_league(league_id) if league_id else None
-    countries = repo.list_countries()
     if request.method == "POST":
         if league_id: repo.update_league(league_id, request.POST)
         else: repo.create_league(request.POST)
         return redirect("admin_leagues_list")
+    options = get_reference()
+    item, countries = fan_out(
+        call(repo.get_league, league_id) if league_id else (lambda: None),
+        call(options.get, "countries"),
+    )
     return render(request, "adminpanel/leagues_form.html", {
         "role": get_role(request), 
         "item": item,
@@ -118,18 +193,22 @@ def admin_leagues_delete(request, league_id: str):
 def admin_teams_list(request):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    return render(request, "adminpanel/teams_list.html", {"role": get_role(request), "items": repo.list_teams()})
+    items = repo.list_teams(**page_args(request))
+    return render(request, "adminpanel/teams_list.html", {"role": get_role(request), **paged(request, items)})
 
 def admin_teams_form(request, team_id=None):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    item = repo.get_team(team_id) if team_id else None
-    coaches = repo.list_coaches()
-    stadiums = repo.list_stadiums()
     if request.method == "POST":
         if team_id: repo.update_team(team_id, request.POST)
         else: repo.create_team(request.POST)
         return redirect("admin_teams_list")
+    options = get_reference()
+    item, coaches, stadiums = fan_out(
+        call(repo.get_team, team_id) if team_id else (lambda: None),
+        call(options.get, "coaches"),
+        call(options.get, "stadiums"),
+    )
     return render(request, "adminpanel/teams_form.html", {
         "role": get_role(request), 
         "item": item,
@@ -149,18 +228,22 @@ def admin_teams_delete(request, team_id: str):
 def admin_players_list(request):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    return render(request, "adminpanel/players_list.html", {"role": get_role(request), "items": repo.list_players()})
+    items = repo.list_players(**page_args(request))
+    return render(request, "adminpanel/players_list.html", {"role": get_role(request), **paged(request, items)})
 
 def admin_players_form(request, player_id=None):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    item = repo.get_player(player_id) if player_id else None
-    teams = repo.list_teams()
-    countries = repo.list_countries()
     if request.method == "POST":
         if player_id: repo.update_player(player_id, request.POST)
         else: repo.create_player(request.POST)
         return redirect("admin_players_list")
+    options = get_reference()
+    item, teams, countries = fan_out(
+        call(repo.get_player, player_id) if player_id else (lambda: None),
+        call(options.get, "teams"),
+        call(options.get, "countries"),
+    )
     return render(request, "adminpanel/players_form.html", {
         "role": get_role(request), 
         "item": item,
@@ -180,18 +263,22 @@ def admin_players_delete(request, player_id: str):
 def admin_matches_list(request):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    return render(request, "adminpanel/matches_list.html", {"role": get_role(request), "items": repo.list_matches()})
+    items = repo.list_matches(**page_args(request))
+    return render(request, "adminpanel/matches_list.html", {"role": get_role(request), **paged(request, items)})
 
 def admin_matches_form(request, match_id=None):
     repo = get_repo()
     if not require_admin(request): return error_403(request)
-    item = repo.get_match(match_id) if match_id else None
-    teams = repo.list_teams()
-    seasons = repo.list_seasons()
     if request.method == "POST":
         if match_id: repo.update_match(match_id, request.POST)
         else: repo.create_match(request.POST)
         return redirect("admin_matches_list")
+    options = get_reference()
+    item, teams, seasons = fan_out(
+        call(repo.get_match, match_id) if match_id else (lambda: None),
+        call(options.get, "teams"),
+        call(options.get, "seasons"),
+    )
     return render(request, "adminpanel/matches_form.html", {
         "role": get_role(request), 
         "item": item,
@@ -153,4 +153,96 @@ CREATE TABLE scorers (
     UNIQUE (player_id, season_id),
     CONSTRAINT fk_scorer_player FOREIGN KEY (player_id) REFERENCES players (player_id) ON DELETE CASCADE,
     CONSTRAINT fk_scorer_season FOREIGN KEY (season_id) REFERENCES seasons (season_id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+-- Aktualna liga drużyny (liga z najnowszego sezonu, w którym drużyna ma wpis w tabeli).
+-- Utrzymywana triggerami, żeby adaptery nie liczyły podzapytania per wiersz.
+-- standings.team_id ma już indeks (InnoDB indeksuje kolumny kluczy obcych).
+CREATE TABLE team_current_league (
+    team_id INT NOT NULL PRIMARY KEY,
+    league_id INT NOT NULL,
+    season_id INT NOT NULL,
+    `year` VARCHAR(9) NOT NULL,
+    INDEX idx_team_current_league_league (league_id),
+    CONSTRAINT fk_tcl_team FOREIGN KEY (team_id) REFERENCES teams (team_id) ON DELETE CASCADE
+);
+
+DELIMITER //
+
+-- p_team_id NULL = przelicz wszystkie drużyny.
+-- Upsert zamiast DELETE + INSERT: dwie transakcje odświeżające tę samą drużynę
+-- (np. równoległe zapisy do standings) czekają na blokadę wiersza zamiast wpaść na duplikat klucza.
+CREATE PROCEDURE refresh_team_current_league(IN p_team_id INT)
+BEGIN
+    INSERT INTO team_current_league (team_id, league_id, season_id, `year`)
+    SELECT ranked.team_id, ranked.league_id, ranked.season_id, ranked.`year`
+    FROM (SELECT st.team_id, sn.league_id, sn.season_id, sn.`year`,
+                 ROW_NUMBER() OVER (PARTITION BY st.team_id ORDER BY sn.`year` DESC, sn.season_id DESC) AS rn
+          FROM standings st
+                   JOIN seasons sn ON st.season_id = sn.season_id
+          WHERE p_team_id IS NULL OR st.team_id = p_team_id) ranked
+    WHERE ranked.rn = 1
+    ON DUPLICATE KEY UPDATE league_id = ranked.league_id, season_id = ranked.season_id, `year` = ranked.`year`;
+    DELETE FROM team_current_league
+    WHERE (p_team_id IS NULL OR team_id = p_team_id)
+      AND NOT EXISTS (SELECT 1 FROM standings st WHERE st.team_id = team_current_league.team_id);
+END //
+
+CREATE TRIGGER trg_standings_tcl_insert AFTER INSERT ON standings
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NEW.team_id);
+END //
+
+CREATE TRIGGER trg_standings_tcl_update AFTER UPDATE ON standings
+FOR EACH ROW
+BEGIN
+    IF NEW.team_id <> OLD.team_id OR NEW.season_id <> OLD.season_id THEN
+        CALL refresh_team_current_league(OLD.team_id);
+        CALL refresh_team_current_league(NEW.team_id);
+    END IF;
+END //
+
+CREATE TRIGGER trg_standings_tcl_delete AFTER DELETE ON standings
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(OLD.team_id);
+END //
+
+-- Kaskadowe usunięcia (liga -> sezony -> standings) nie odpalają triggerów w MySQL,
+-- więc zmiany lig/sezonów przeliczają całą projekcję (rzadkie operacje administracyjne).
+CREATE TRIGGER trg_seasons_tcl_update AFTER UPDATE ON seasons
+FOR EACH ROW
+BEGIN
+    IF NEW.`year` <> OLD.`year` OR NEW.league_id <> OLD.league_id THEN
+        CALL refresh_team_current_league(NULL);
+    END IF;
+END //
+
+CREATE TRIGGER trg_seasons_tcl_delete AFTER DELETE ON seasons
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NULL);
+END //
+
+CREATE TRIGGER trg_leagues_tcl_delete AFTER DELETE ON leagues
+FOR EACH ROW
+BEGIN
+    CALL refresh_team_current_league(NULL);
+END //
+
+DELIMITER ;
+
+-- Wyszukiwanie (core/repositories/search.py): indeksy FULLTEXT dla MATCH ... AGAINST.
+ALTER TABLE leagues ADD FULLTEXT INDEX ft_leagues_name (name);
+ALTER TABLE teams ADD FULLTEXT INDEX ft_teams_name (name);
+ALTER TABLE players ADD FULLTEXT INDEX ft_players_name_position (name, `position`);
+ALTER TABLE countries ADD FULLTEXT INDEX ft_countries_name (name);
+ALTER TABLE coaches ADD FULLTEXT INDEX ft_coaches_name (name);
+ALTER TABLE stadiums ADD FULLTEXT INDEX ft_stadiums_name (name);
+
+-- list_matches: filtry sezonu/kolejki, mecze drużyny (gospodarz lub gość) wg daty.
+-- InnoDB dokleja match_id (PK) do każdego indeksu, więc keyset po (utc_date, match_id) jest pokryty.
+CREATE INDEX idx_matches_season_matchday ON matches (season_id, matchday);
+CREATE INDEX idx_matches_home_date ON matches (home_team_id, utc_date);
+CREATE INDEX idx_matches_away_date ON matches (away_team_id, utc_date);
+CREATE INDEX idx_matches_date ON matches (utc_date);
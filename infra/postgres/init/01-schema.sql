@@ -125,4 +125,88 @@ CREATE TABLE public.scorers (
     assists integer,
     penalties integer,
     UNIQUE (player_id, season_id)
-);
\ No newline at end of file
+);
+CREATE INDEX idx_standings_team ON public.standings (team_id);
+
+-- Aktualna liga drużyny (liga z najnowszego sezonu, w którym drużyna ma wpis w tabeli).
+-- Utrzymywana triggerami na standings/seasons, żeby adaptery nie liczyły podzapytania per wiersz.
+CREATE TABLE public.team_current_league (
+    team_id integer PRIMARY KEY REFERENCES public.teams (team_id) ON DELETE CASCADE,
+    league_id integer NOT NULL,
+    season_id integer NOT NULL,
+    year character varying(9) NOT NULL
+);
+
+CREATE INDEX idx_team_current_league_league ON public.team_current_league (league_id);
+
+-- Upsert zamiast DELETE + INSERT: dwie transakcje odświeżające tę samą drużynę
+-- (np. równoległe zapisy do standings) czekają na blokadę wiersza zamiast wpaść na duplikat klucza.
+CREATE FUNCTION public.refresh_team_current_league(p_team_id integer) RETURNS void AS $$
+BEGIN
+    INSERT INTO public.team_current_league (team_id, league_id, season_id, year)
+    SELECT st.team_id, sn.league_id, sn.season_id, sn.year
+    FROM public.standings st
+             JOIN public.seasons sn ON st.season_id = sn.season_id
+    WHERE st.team_id = p_team_id
+    ORDER BY sn.year DESC, sn.season_id DESC
+    LIMIT 1
+    ON CONFLICT (team_id) DO UPDATE
+        SET league_id = EXCLUDED.league_id, season_id = EXCLUDED.season_id, year = EXCLUDED.year;
+    IF NOT FOUND THEN
+        DELETE FROM public.team_current_league WHERE team_id = p_team_id;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION public.standings_team_current_league() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        PERFORM public.refresh_team_current_league(OLD.team_id);
+    END IF;
+    IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.team_id <> OLD.team_id) THEN
+        PERFORM public.refresh_team_current_league(NEW.team_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_standings_team_current_league
+    AFTER INSERT OR DELETE OR UPDATE OF team_id, season_id ON public.standings
+    FOR EACH ROW EXECUTE FUNCTION public.standings_team_current_league();
+
+-- Zmiana roku/ligi sezonu przelicza drużyny z tego sezonu
+-- (usunięcie sezonu kasuje standings, więc obsługuje je trigger powyżej).
+CREATE FUNCTION public.seasons_team_current_league() RETURNS trigger AS $$
+BEGIN
+    PERFORM public.refresh_team_current_league(st.team_id)
+    FROM public.standings st
+    WHERE st.season_id = NEW.season_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_seasons_team_current_league
+    AFTER UPDATE OF year, league_id ON public.seasons
+    FOR EACH ROW EXECUTE FUNCTION public.seasons_team_current_league();
+
+-- Wyszukiwanie (core/repositories/search.py): trigramy dla ILIKE '%q%' + indeksy kluczy obcych
+-- używane przez dopasowanie po nazwach powiązanych rekordów.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_leagues_name_trgm ON public.leagues USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_teams_name_trgm ON public.teams USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_players_name_trgm ON public.players USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_players_position_trgm ON public.players USING gin ("position" gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_countries_name_trgm ON public.countries USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_coaches_name_trgm ON public.coaches USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_stadiums_name_trgm ON public.stadiums USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_leagues_country ON public.leagues (country_id);
+CREATE INDEX IF NOT EXISTS idx_teams_coach ON public.teams (coach_id);
+CREATE INDEX IF NOT EXISTS idx_teams_stadium ON public.teams (stadium_id);
+CREATE INDEX IF NOT EXISTS idx_players_nationality ON public.players (nationality_id);
+
+-- list_matches: filtry sezonu/kolejki, mecze drużyny (gospodarz lub gość) wg daty,
+-- stronicowanie keyset po (utc_date, match_id).
+CREATE INDEX IF NOT EXISTS idx_matches_season_matchday ON public.matches (season_id, matchday);
+CREATE INDEX IF NOT EXISTS idx_matches_home_date ON public.matches (home_team_id, utc_date);
+CREATE INDEX IF NOT EXISTS idx_matches_away_date ON public.matches (away_team_id, utc_date);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON public.matches (utc_date DESC NULLS LAST, match_id DESC);
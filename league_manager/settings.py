@@ -17,6 +17,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.RepoTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -50,6 +52,98 @@ DATA_BACKEND = os.getenv("DATA_BACKEND", "mock").lower()
 MONGO_URI = os.getenv("MONGO_URI", "")
 MONGO_DB = os.getenv("MONGO_DB", "")
 
+# Pula połączeń Postgresa; POSTGRES_POOL_MAX=0 wyłącza pulę (połączenie per zapytanie).
+POSTGRES_POOL = {
+    "min_size": int(os.getenv("POSTGRES_POOL_MIN", "1")),
+    "max_size": int(os.getenv("POSTGRES_POOL_MAX", "10")),
+    "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "5")),
+    "max_idle": float(os.getenv("POSTGRES_POOL_MAX_IDLE", "300")),
+    "check_interval": float(os.getenv("POSTGRES_POOL_CHECK_INTERVAL", "30")),
+}
+
+# Pula połączeń MySQL; MYSQL_POOL_SIZE=0 wyłącza pulę.
+MYSQL_POOL = {
+    "min_size": int(os.getenv("MYSQL_POOL_MIN", "1")),
+    "max_size": int(os.getenv("MYSQL_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("MYSQL_POOL_OVERFLOW", "5")),
+    "timeout": float(os.getenv("MYSQL_POOL_TIMEOUT", "5")),
+    "max_idle": float(os.getenv("MYSQL_POOL_MAX_IDLE", "300")),
+    # poniżej wait_timeout serwera (domyślnie 8h), żeby nie dostawać zerwanych połączeń
+    "max_lifetime": float(os.getenv("MYSQL_POOL_MAX_LIFETIME", "3600")),
+    "check_interval": float(os.getenv("MYSQL_POOL_CHECK_INTERVAL", "30")),
+    "warmup": os.getenv("MYSQL_POOL_WARMUP", "1") == "1",
+}
+
+# Liczba wierszy na stronę list (stronicowanie kursorem).
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "50"))
+
+# Cache odczytów repozytorium (CachingRepo) – REPO_CACHE=1 włącza. TTL w sekundach per encja.
+REPO_CACHE = {
+    "enabled": os.getenv("REPO_CACHE", "0") == "1",
+    "max_entries": int(os.getenv("REPO_CACHE_MAX_ENTRIES", "2048")),
+    "ttl": {
+        "leagues": float(os.getenv("REPO_CACHE_TTL_LEAGUES", "300")),
+        "teams": float(os.getenv("REPO_CACHE_TTL_TEAMS", "300")),
+        "players": float(os.getenv("REPO_CACHE_TTL_PLAYERS", "120")),
+        "matches": float(os.getenv("REPO_CACHE_TTL_MATCHES", "60")),
+        "reference": float(os.getenv("REPO_CACHE_TTL_REFERENCE", "3600")),
+    },
+}
+
+# Listy opcji formularzy admina (ReferenceCache), ładowane w tle przy starcie.
+REFERENCE_CACHE = {
+    "ttl": float(os.getenv("REFERENCE_CACHE_TTL", "3600")),
+    "warmup": os.getenv("REFERENCE_CACHE_WARMUP", "1") == "1",
+}
+
+# Szyna unieważniania cache między workerami: "" (wył.) | postgres | mongo | unix
+REPO_BUS = {
+    "transport": os.getenv("REPO_BUS", "").lower(),
+    "channel": os.getenv("REPO_BUS_CHANNEL", "repo_changed"),
+    "path": os.getenv("REPO_BUS_PATH", "/tmp/league_manager_bus"),
+}
+
+# Widoki async: wątki wykonujące blokujące wywołania repo (górna granica zapytań w locie na proces;
+# pula połączeń POSTGRES_POOL/MYSQL_POOL powinna mieć co najmniej tyle połączeń)
+ASYNC_REPO_THREADS = int(os.getenv("ASYNC_REPO_THREADS", "32"))
+
+# Widoki sync: wspólna pula fan-outu niezależnych wywołań repo i domyślny limit czasu jednego wywołania (s)
+FANOUT_THREADS = int(os.getenv("FANOUT_THREADS", "16"))
+FANOUT_TIMEOUT = float(os.getenv("FANOUT_TIMEOUT", "10"))
+
+# Żądania ponad budżet (liczba wywołań repo / łączny czas w ms) logowane jako WARNING (core.repositories.instrument)
+REPO_BUDGET = {
+    "calls": int(os.getenv("REPO_BUDGET_CALLS", "20")),
+    "ms": float(os.getenv("REPO_BUDGET_MS", "250")),
+}
+
+# Slow-query log: zapytania/komendy wolniejsze niż threshold_ms (None wyłącza) z planem wykonania,
+# jedna linia JSON na wpis w rotowanym pliku
+SLOW_QUERY_LOG = {
+    "threshold_ms": float(os.getenv("SLOW_QUERY_MS", "200")),
+    "explain": os.getenv("SLOW_QUERY_EXPLAIN", "1") == "1",
+    "explain_interval": 60.0,    # s – ten sam (znormalizowany) plan najwyżej raz na tyle
+    "path": os.getenv("SLOW_QUERY_LOG", str(BASE_DIR / "slow_queries.log")),
+    "max_bytes": 5 * 1024 * 1024,
+    "backups": 3,
+}
+
+# JSON API: ETagi z wersji danych; niezależnie od zdarzeń zapisu zmieniają się co tyle sekund
+API_ETAG_TTL = float(os.getenv("API_ETAG_TTL", "300"))
+
+# Wersje danych dla ETagów muszą być wspólne dla workerów (304 niezależnie od workera, brak nieaktualnych
+# 304 po zapisie na innym). FileBasedCache wystarcza na jednym hoście; przy kilku hostach ustaw tu
+# Redis/Memcached/DatabaseCache. LocMemCache jest per proces – wtedy potrzebny REPO_BUS.
+API_ETAG_CACHE = "api_versions"
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "api_versions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("API_ETAG_CACHE_PATH", "/tmp/league_manager_versions"),
+        "TIMEOUT": None,
+    },
+}
+
 # żeby Docker nie wymagał sqlite na sesje:
 SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
 